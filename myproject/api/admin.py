@@ -8,6 +8,8 @@ from .models import (
     Student, Teacher, Counselor, StudentReport, TeacherReport, ViolationType, 
     ViolationHistory, Notification, SystemSettings, ArchivedStudent, ArchivedTeacher, ArchivedStudentReport, ArchivedTeacherReport
 )
+from . import violation_registry
+from . import tokens
 
 # Customize admin site
 admin.site.site_header = "Guidance Tracker Administration"
@@ -117,6 +119,7 @@ class StudentAdmin(admin.ModelAdmin):
             student.user.save()
             student.save()
             count += 1
+        tokens.revoke_user_tokens(queryset.values_list('user_id', flat=True))
         self.message_user(request, f'{count} student(s) archived and login disabled.')
     archive_students.short_description = "Archive selected students"
 
@@ -273,6 +276,7 @@ class TeacherAdmin(admin.ModelAdmin):
 
     def archive_teachers(self, request, queryset):
         updated = queryset.update(is_archived=True)
+        tokens.revoke_user_tokens(queryset.values_list('user_id', flat=True))
         self.message_user(request, f'{updated} teacher(s) archived.')
     archive_teachers.short_description = "Archive selected teachers"
 
@@ -573,11 +577,13 @@ class ViolationTypeAdmin(admin.ModelAdmin):
     
     def activate_violations(self, request, queryset):
         updated = queryset.update(is_active=True)
+        violation_registry.bump('violation_type')  # update() skips post_save signals
         self.message_user(request, f'{updated} violation type(s) activated.')
     activate_violations.short_description = "Activate selected"
     
     def deactivate_violations(self, request, queryset):
         updated = queryset.update(is_active=False)
+        violation_registry.bump('violation_type')  # update() skips post_save signals
         self.message_user(request, f'{updated} violation type(s) deactivated.')
     deactivate_violations.short_description = "Deactivate selected"
 
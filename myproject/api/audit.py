@@ -0,0 +1,86 @@
+"""
+Asynchronous, batched login audit log.
+
+``login_audit.record()`` only appends to an in-memory buffer, so a login
+never waits on an INSERT into ``login_attempts``. A daemon thread per
+process writes the buffer with one ``bulk_create`` every
+``LOGIN_AUDIT_FLUSH_INTERVAL`` seconds, or sooner once
+``LOGIN_AUDIT_BATCH_SIZE`` entries are waiting, and once more at exit.
+Lockout decisions no longer read this table (see api/ratelimit.py); it is
+kept for auditing and trimmed by ``manage.py purge_login_attempts``.
+"""
+
+import atexit
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL = 5
+DEFAULT_BATCH_SIZE = 100
+MAX_BUFFERED = 10000
+
+
+class LoginAuditLog:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._buffer = []
+        self._pid = None
+        self._thread = None
+
+    def _ensure_worker(self):
+        # gunicorn forks after import: each worker needs its own thread
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._buffer = []
+            self._thread = threading.Thread(target=self._run, name='login-audit', daemon=True)
+            self._thread.start()
+
+    def record(self, username, ip_address, success):
+        with self._lock:
+            self._ensure_worker()
+            if len(self._buffer) >= MAX_BUFFERED:
+                # The database is unreachable; drop the oldest rather than grow without bound
+                self._buffer.pop(0)
+            self._buffer.append((username, ip_address, success, timezone.now()))
+            full = len(self._buffer) >= getattr(settings, 'LOGIN_AUDIT_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+        if full:
+            self._wakeup.set()
+
+    def _run(self):
+        interval = getattr(settings, 'LOGIN_AUDIT_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL)
+        while True:
+            self._wakeup.wait(interval)
+            self._wakeup.clear()
+            self.flush()
+            connection.close()
+
+    def flush(self):
+        from .models import LoginAttempt
+
+        with self._lock:
+            pending, self._buffer = self._buffer, []
+        if not pending:
+            return 0
+
+        try:
+            LoginAttempt.objects.bulk_create([
+                LoginAttempt(username=username, ip_address=ip_address, success=success, attempt_time=attempt_time)
+                for username, ip_address, success, attempt_time in pending
+            ])
+            return len(pending)
+        except Exception as e:
+            logger.error(f"❌ Error writing {len(pending)} login audit entries: {e}")
+            with self._lock:
+                self._buffer[:0] = pending
+            return 0
+
+
+login_audit = LoginAuditLog()
+atexit.register(login_audit.flush)
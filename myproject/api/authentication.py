@@ -0,0 +1,44 @@
+"""
+Token authentication with expiry and cached validation (see api/tokens.py).
+"""
+
+from django.core.cache import cache
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+from . import metrics, tokens
+
+
+class ExpiringTokenAuthentication(TokenAuthentication):
+    """``Authorization: Token <key>``; rejects expired and revoked tokens"""
+
+    def authenticate_credentials(self, key):
+        token_digest = tokens.digest(key)
+        cache_key = tokens.entry_key(token_digest)
+        revoked_key = tokens.revoked_key(token_digest)
+
+        # A per-process cache can't see revocations made by other workers; use the row
+        values = cache.get_many([cache_key, revoked_key]) if tokens.cache_is_shared() else {}
+        if values.get(revoked_key):
+            raise AuthenticationFailed('Invalid token.')
+
+        token = values.get(cache_key)
+        cached = token is not None
+        metrics.record_cache('auth_token', cached)
+        if not cached:
+            try:
+                token = Token.objects.select_related('user').get(key=key)
+            except Token.DoesNotExist:
+                raise AuthenticationFailed('Invalid token.')
+
+        if tokens.is_expired(token):
+            tokens.revoke_user_tokens([token.user_id])
+            raise AuthenticationFailed('Token has expired.')
+        if not cached:
+            tokens.cache_token(token)
+
+        if not token.user.is_active:
+            raise AuthenticationFailed('User inactive or deleted.')
+
+        return (token.user, token)
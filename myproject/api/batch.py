@@ -0,0 +1,168 @@
+"""
+Execute several API calls in one HTTP round trip.
+
+Each operation is dispatched in-process to the view its path resolves to,
+with the caller's authentication forced onto the sub-request, so the
+existing endpoints are reused unchanged. ``run_batch`` wraps the whole batch
+in one transaction:
+
+* ``atomic`` (all-or-nothing): stop at the first failing operation and roll
+  everything back;
+* ``best_effort``: each operation runs in its own savepoint, so a failure
+  only undoes that operation and the rest are committed.
+
+Only database work is transactional; side effects outside the database
+(e.g. Firebase calls) are not undone by a rollback. Async views (the live
+endpoints) can't be called from here and are rejected.
+"""
+
+import io
+import logging
+from urllib.parse import urlsplit
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+
+from . import renderers
+
+logger = logging.getLogger(__name__)
+
+MODES = ('atomic', 'best_effort')
+ALLOWED_METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE')
+DEFAULT_MAX_OPERATIONS = 20
+
+# Headers copied from the batch request onto every sub-request
+FORWARDED_META = (
+    'HTTP_AUTHORIZATION', 'HTTP_ACCEPT_LANGUAGE', 'HTTP_USER_AGENT',
+    'REMOTE_ADDR', 'HTTP_X_FORWARDED_FOR', 'SERVER_NAME', 'SERVER_PORT', 'wsgi.url_scheme',
+)
+
+
+class BatchError(ValueError):
+    """The batch request itself is malformed"""
+
+
+def max_operations():
+    return getattr(settings, 'BATCH_MAX_OPERATIONS', DEFAULT_MAX_OPERATIONS)
+
+
+def validate_operations(operations):
+    if not isinstance(operations, list) or not operations:
+        raise BatchError('operations must be a non-empty list')
+    if len(operations) > max_operations():
+        raise BatchError(f'A batch can contain at most {max_operations()} operations')
+
+    validated = []
+    for index, op in enumerate(operations):
+        if not isinstance(op, dict):
+            raise BatchError(f'Operation {index} must be an object')
+        method = str(op.get('method', 'GET')).upper()
+        path = op.get('path') or ''
+        if method not in ALLOWED_METHODS:
+            raise BatchError(f'Operation {index}: unsupported method {method}')
+        parts = urlsplit(path)
+        if not parts.path.startswith('/api/'):
+            raise BatchError(f'Operation {index}: path must be an /api/ route')
+        try:
+            match = resolve(parts.path)
+        except Resolver404:
+            raise BatchError(f'Operation {index}: no route matches {parts.path}')
+        if match.url_name == 'batch':
+            raise BatchError(f'Operation {index}: batches cannot be nested')
+        if iscoroutinefunction(match.func):
+            # Calling it here would only return an unawaited coroutine
+            raise BatchError(f'Operation {index}: {parts.path} is an async route and cannot be batched')
+        validated.append({
+            'method': method,
+            'path': parts.path,
+            'query': parts.query,
+            'body': op.get('body'),
+            'match': match,
+        })
+    return validated
+
+
+def _build_request(parent, op):
+    body = b'' if op['body'] is None else renderers.dumps(op['body'])
+
+    request = HttpRequest()
+    request.method = op['method']
+    request.path = request.path_info = op['path']
+    request.META = {key: parent.META[key] for key in FORWARDED_META if key in parent.META}
+    request.META.update({
+        'REQUEST_METHOD': op['method'],
+        'PATH_INFO': op['path'],
+        'QUERY_STRING': op['query'],
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(body)),
+    })
+    request.GET = QueryDict(op['query'])
+    request._body = body
+    request._stream = io.BytesIO(body)
+    request._read_started = False
+    request.resolver_match = op['match']
+    request._dont_enforce_csrf_checks = True
+
+    # Reuse the batch request's authentication instead of re-checking the token per operation
+    request.user = parent.user
+    request._force_auth_user = parent.user
+    request._force_auth_token = getattr(parent, 'auth', None)
+    return request
+
+
+def _response_body(response):
+    data = getattr(response, 'data', None)
+    if data is not None:
+        return data
+    if getattr(response, 'streaming', False):
+        content = b''.join(response.streaming_content)
+    else:
+        content = response.content
+    try:
+        return renderers.loads(content) if content else None
+    except ValueError:
+        return content.decode('utf-8', errors='replace')
+
+
+def _dispatch(parent, op):
+    match = op['match']
+    try:
+        response = match.func(_build_request(parent, op), *match.args, **match.kwargs)
+        return response.status_code, _response_body(response)
+    except Exception as e:
+        logger.error(f"❌ Batch operation {op['method']} {op['path']} failed: {e}")
+        return 500, {'success': False, 'error': str(e)}
+
+
+def run_batch(parent, operations, mode):
+    """Run validated operations in order and return (all_succeeded, results)"""
+    results = []
+    failed = False
+
+    with transaction.atomic():
+        for index, op in enumerate(operations):
+            result = {'index': index, 'method': op['method'], 'path': op['path']}
+
+            if failed and mode == 'atomic':
+                result.update({'status': None, 'skipped': True})
+                results.append(result)
+                continue
+
+            with transaction.atomic():
+                status_code, body = _dispatch(parent, op)
+                if status_code >= 400:
+                    # Undo whatever this operation wrote before it failed
+                    transaction.set_rollback(True)
+
+            result.update({'status': status_code, 'body': body})
+            results.append(result)
+            if status_code >= 400:
+                failed = True
+
+        if failed and mode == 'atomic':
+            transaction.set_rollback(True)
+
+    return not failed, results
@@ -0,0 +1,25 @@
+"""
+System checks for settings the API's security relies on.
+"""
+
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+from .tokens import cache_is_shared
+
+
+@register(Tags.security, Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """Login lockouts (api/ratelimit.py) need a shared cache"""
+    if settings.DEBUG or cache_is_shared():
+        return []
+    backend = settings.CACHES['default']['BACKEND']
+    return [Warning(
+        f'The default cache ({backend}) is not shared between processes.',
+        hint=(
+            'Login lockouts only apply in the worker that recorded them, so each gunicorn worker '
+            'allows its own LOGIN_MAX_FAILURES guesses (and token validation falls back to the '
+            'database). Set CACHE_BACKEND to a shared backend such as FileBasedCache or DatabaseCache.'
+        ),
+        id='api.W001',
+    )]
@@ -0,0 +1,119 @@
+"""
+gzip / brotli compression helpers for API responses.
+
+``CompressionMiddleware`` (api/middleware.py) uses these to negotiate an
+encoding from ``Accept-Encoding`` and compress JSON bodies above
+``COMPRESSION_MIN_SIZE``. Views whose payloads are cacheable can opt in to
+``@cache_compressed`` so the compressed bytes are kept in the cache, keyed by
+a digest of the uncompressed body, and reused instead of recompressing the
+same payload on every hit.
+"""
+
+import gzip
+import hashlib
+import logging
+import re
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import metrics
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the deployment
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_SIZE = 1024
+DEFAULT_CONTENT_TYPES = ('application/json',)
+DEFAULT_CACHE_TIMEOUT = 300
+
+
+def min_size():
+    return getattr(settings, 'COMPRESSION_MIN_SIZE', DEFAULT_MIN_SIZE)
+
+
+def allowed_content_types():
+    return tuple(getattr(settings, 'COMPRESSION_CONTENT_TYPES', DEFAULT_CONTENT_TYPES))
+
+
+def is_compressible_type(content_type):
+    media_type = (content_type or '').split(';')[0].strip().lower()
+    return media_type in allowed_content_types()
+
+
+def _accepted(accept_encoding):
+    """Parse Accept-Encoding into {coding: q}"""
+    accepted = {}
+    for part in (accept_encoding or '').split(','):
+        match = re.match(r'\s*([\w*-]+)\s*(?:;\s*q=([0-9.]+))?', part)
+        if match:
+            try:
+                accepted[match.group(1).lower()] = float(match.group(2) or 1)
+            except ValueError:
+                continue
+    return accepted
+
+
+def negotiate_encoding(accept_encoding):
+    """Pick 'br' or 'gzip' (in that order of preference), or None"""
+    accepted = _accepted(accept_encoding)
+    wildcard = accepted.get('*', 0)
+    if brotli is not None and accepted.get('br', wildcard) > 0:
+        return 'br'
+    if accepted.get('gzip', wildcard) > 0:
+        return 'gzip'
+    return None
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 5))
+    return gzip.compress(data, compresslevel=getattr(settings, 'COMPRESSION_GZIP_LEVEL', 6), mtime=0)
+
+
+def compress_stream(chunks, encoding):
+    """Compress an iterable of byte chunks, flushing after every chunk"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 5))
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+    else:
+        from django.utils.text import compress_sequence
+        yield from compress_sequence(chunks)
+
+
+def compress_cached(data, encoding, timeout=None):
+    """Compress ``data``, reusing previously compressed bytes for identical bodies"""
+    digest = hashlib.sha1(data).hexdigest()
+    cache_key = f'compressed:{encoding}:{digest}'
+    compressed = cache.get(cache_key)
+    metrics.record_cache('compressed_responses', compressed is not None)
+    if compressed is None:
+        compressed = compress(data, encoding)
+        cache.set(cache_key, compressed, timeout or DEFAULT_CACHE_TIMEOUT)
+    return compressed
+
+
+def cache_compressed(view_func=None, timeout=None):
+    """
+    Mark a view's responses as cacheable so the compression middleware stores
+    the compressed bytes instead of recompressing every time.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapped(request, *args, **kwargs):
+            response = func(request, *args, **kwargs)
+            response.cache_compressed = timeout or DEFAULT_CACHE_TIMEOUT
+            return response
+        return wrapped
+
+    if view_func is not None:
+        return decorator(view_func)
+    return decorator
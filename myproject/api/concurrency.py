@@ -0,0 +1,88 @@
+"""
+Optimistic locking for report updates.
+
+Reports carry a ``version`` column that every update increments. A client
+sends the version it last saw, either as ``If-Match: "<version>"`` or as a
+``version`` field in the body, and ``save_versioned()`` writes the changed
+columns with ``UPDATE ... WHERE id = %s AND version = %s``. If another
+counselor updated the report first no row matches, nothing is written and
+the view answers ``409 Conflict`` with ``conflict_response()``.
+
+Without an explicit version the one loaded with the row is used, which still
+catches a write that lands between the read and the update.
+
+Writes that don't go through ``save_versioned()`` bump the version too: the
+report models' ``save()`` and queryset ``update()`` add ``version + 1``
+themselves (see ``VersionedReportMixin`` in api/models.py), except for
+writes that only touch ``triage_at``/``updated_at``.
+"""
+
+from django.db import models
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class VersionError(ValueError):
+    """The client sent a malformed version"""
+
+
+def expected_version(request):
+    """Version the client expects from If-Match or the body, or None"""
+    value = request.headers.get('If-Match')
+    if value:
+        value = value.strip()
+        if value.startswith('W/'):
+            value = value[2:]
+        value = value.strip('"')
+    else:
+        value = request.data.get('version')
+
+    if value in (None, '', '*'):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise VersionError(f'Invalid report version: {value}')
+
+
+def save_versioned(instance, fields, expected=None):
+    """
+    Write only ``fields`` of ``instance`` if its row is still at ``expected``
+    (or at the version it was loaded with). Returns False on conflict.
+    """
+    version = instance.version if expected is None else expected
+    values = {field: getattr(instance, field) for field in fields}
+    values['updated_at'] = timezone.now()
+
+    updated = type(instance).objects.filter(pk=instance.pk, version=version).update(
+        version=models.F('version') + 1,
+        **values
+    )
+    if updated:
+        instance.version = version + 1
+        instance.updated_at = values['updated_at']
+    return bool(updated)
+
+
+def etag(instance):
+    return f'"{instance.version}"'
+
+
+def conflict_response(instance):
+    current = type(instance).objects.filter(pk=instance.pk).values_list('version', flat=True).first()
+    response = Response({
+        'success': False,
+        'error': 'This report was updated by someone else. Reload it and try again.',
+        'current_version': current,
+    }, status=status.HTTP_409_CONFLICT)
+    if current is not None:
+        response['ETag'] = f'"{current}"'
+    return response
+
+
+def version_error_response(error):
+    return Response({
+        'success': False,
+        'error': str(error)
+    }, status=status.HTTP_400_BAD_REQUEST)
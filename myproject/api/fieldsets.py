@@ -0,0 +1,74 @@
+"""
+Sparse fieldsets for list endpoints.
+
+A view describes every key it can return as a ``Field``: the model columns
+the key needs and a getter that builds its value from an instance. Clients
+pass ``?fields=title,status,student_name`` and only those keys are
+serialized, while the queryset is narrowed with ``only()`` and
+``select_related()`` so the columns and joins of unused keys are never
+fetched. Without ``fields=`` the full shape is returned, as before.
+"""
+
+
+class FieldsetError(ValueError):
+    """Raised when ``fields=`` names keys the endpoint does not provide"""
+
+    def __init__(self, unknown, allowed):
+        self.unknown = unknown
+        self.allowed = allowed
+        super().__init__(f"Unknown field(s): {', '.join(unknown)}")
+
+    def as_response_data(self):
+        return {
+            'success': False,
+            'error': str(self),
+            'allowed_fields': self.allowed,
+        }
+
+
+class Field:
+    """One response key: the ORM columns it reads and how to build it"""
+
+    def __init__(self, columns, getter):
+        self.columns = tuple(columns)
+        self.getter = getter
+
+
+class Fieldset:
+    def __init__(self, fields, always=('id',)):
+        self.fields = fields
+        self.always = tuple(always)
+
+    def requested(self, request, param='fields'):
+        """Return the keys to serialize for this request, in declaration order"""
+        raw = request.GET.get(param)
+        if not raw:
+            return list(self.fields)
+
+        wanted = {name.strip() for name in raw.split(',') if name.strip()}
+        unknown = sorted(wanted - set(self.fields))
+        if unknown:
+            raise FieldsetError(unknown, list(self.fields))
+
+        wanted.update(self.always)
+        return [name for name in self.fields if name in wanted]
+
+    def apply(self, queryset, keys):
+        """Restrict the queryset to the columns and joins ``keys`` need"""
+        columns = set()
+        relations = set()
+        for key in keys:
+            for column in self.fields[key].columns:
+                columns.add(column)
+                parts = column.split('__')
+                if len(parts) > 1:
+                    relations.add('__'.join(parts[:-1]))
+
+        # select_related is additive, so drop it before re-adding only what's needed
+        queryset = queryset.select_related(None)
+        if relations:
+            queryset = queryset.select_related(*sorted(relations))
+        return queryset.only(*sorted(columns))
+
+    def serialize(self, obj, keys):
+        return {key: self.fields[key].getter(obj) for key in keys}
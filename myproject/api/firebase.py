@@ -0,0 +1,197 @@
+"""
+Firebase Admin access for the API.
+
+``firebase.client()`` returns a process-wide backend that is built once,
+under a lock, the first time it is needed (the revocation thread or job),
+so ``migrate``, ``check`` and requests that never touch Firebase don't
+initialize it. The real backend wraps ``firebase_admin``;
+``StubFirebaseBackend`` is chosen explicitly under ``manage.py test``, when
+``FIREBASE_BACKEND=stub``, when no credentials are configured
+(``FIREBASE_CREDENTIALS`` or ``GOOGLE_APPLICATION_CREDENTIALS``), or when
+``firebase_admin`` is missing or fails to initialize. The stub only logs and
+records the calls it receives.
+
+``revoke_refresh_tokens()`` doesn't call Firebase inline: it queues the uid
+for a daemon thread per process, which retries transient failures with
+exponential backoff (``FIREBASE_REVOKE_MAX_RETRIES`` attempts,
+``FIREBASE_REVOKE_RETRY_DELAY`` seconds doubling each time). Pending
+revocations are drained once more at exit. With ``JOB_QUEUE_ENABLED`` the
+revocation is queued as a ``Job`` for ``manage.py run_worker`` instead.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import sys
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_RETRY_DELAY = 2
+MAX_RETRY_DELAY = 300
+
+
+class StubFirebaseBackend:
+    """Offline stand-in for ``FirebaseBackend``; keeps the uids it was asked to revoke"""
+
+    name = 'stub'
+
+    def __init__(self):
+        self.revoked = []
+
+    def revoke_refresh_tokens(self, uid):
+        self.revoked.append(uid)
+        logger.info(f"🧪 [firebase stub] revoke_refresh_tokens uid={uid}")
+
+    def is_permanent(self, exc):
+        return True
+
+
+class FirebaseBackend:
+    name = 'firebase'
+
+    def __init__(self):
+        import firebase_admin
+        from firebase_admin import credentials
+
+        try:
+            self.app = firebase_admin.get_app()
+        except ValueError:
+            credentials_path = getattr(settings, 'FIREBASE_CREDENTIALS', None)
+            credential = credentials.Certificate(credentials_path) if credentials_path else None
+            self.app = firebase_admin.initialize_app(credential)
+
+    def revoke_refresh_tokens(self, uid):
+        from firebase_admin import auth as firebase_auth_admin
+
+        firebase_auth_admin.revoke_refresh_tokens(uid, app=self.app)
+
+    def is_permanent(self, exc):
+        """Errors that retrying can't fix (unknown uid, bad argument, bad or missing credentials)"""
+        from firebase_admin import exceptions
+        from google.auth.exceptions import DefaultCredentialsError
+
+        return isinstance(exc, (
+            ValueError,
+            DefaultCredentialsError,
+            exceptions.NotFoundError,
+            exceptions.InvalidArgumentError,
+            exceptions.PermissionDeniedError,
+            exceptions.UnauthenticatedError,
+        ))
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def _has_credentials():
+    return bool(getattr(settings, 'FIREBASE_CREDENTIALS', None) or os.environ.get('GOOGLE_APPLICATION_CREDENTIALS'))
+
+
+def _use_stub():
+    backend = getattr(settings, 'FIREBASE_BACKEND', 'firebase')
+    return backend == 'stub' or (len(sys.argv) > 1 and sys.argv[1] == 'test')
+
+
+def client():
+    """The process-wide Firebase backend, initialized on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _build_client()
+    return _client
+
+
+def _build_client():
+    if _use_stub():
+        return StubFirebaseBackend()
+    if not _has_credentials():
+        # initialize_app() would succeed and only fail on the first call
+        logger.warning("⚠️ No Firebase credentials configured (FIREBASE_CREDENTIALS), using offline stub")
+        return StubFirebaseBackend()
+    try:
+        backend = FirebaseBackend()
+        logger.info("✅ Firebase Admin initialized")
+        return backend
+    except Exception as e:
+        logger.warning(f"⚠️ Firebase Admin unavailable, using offline stub: {e}")
+        return StubFirebaseBackend()
+
+
+class RevocationQueue:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._pid = None
+
+    def _ensure_worker(self):
+        # gunicorn forks after import: each worker needs its own thread
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._queue = queue.Queue()
+                threading.Thread(target=self._run, name='firebase-revoke', daemon=True).start()
+
+    def enqueue(self, uid):
+        self._ensure_worker()
+        self._queue.put((uid, 0))
+
+    def _run(self):
+        while True:
+            uid, attempt = self._queue.get()
+            self._revoke(uid, attempt)
+
+    def _revoke(self, uid, attempt):
+        backend = client()
+        try:
+            backend.revoke_refresh_tokens(uid)
+            logger.info(f"✅ Revoked Firebase refresh tokens for uid={uid}")
+            return True
+        except Exception as e:
+            max_retries = getattr(settings, 'FIREBASE_REVOKE_MAX_RETRIES', DEFAULT_MAX_RETRIES)
+            if backend.is_permanent(e) or attempt + 1 >= max_retries:
+                logger.error(f"❌ Firebase revoke failed for uid={uid} after {attempt + 1} attempt(s): {e}")
+                return False
+            delay = min(getattr(settings, 'FIREBASE_REVOKE_RETRY_DELAY', DEFAULT_RETRY_DELAY) * 2 ** attempt, MAX_RETRY_DELAY)
+            logger.warning(f"⚠️ Firebase revoke failed for uid={uid}, retrying in {delay}s: {e}")
+            retry = threading.Timer(delay, self._queue.put, args=((uid, attempt + 1),))
+            retry.daemon = True
+            retry.start()
+            return False
+
+    def drain(self):
+        """Try every queued revocation once, in this thread (used at exit)"""
+        if self._pid != os.getpid():
+            return
+        while True:
+            try:
+                uid, attempt = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                client().revoke_refresh_tokens(uid)
+            except Exception as e:
+                logger.error(f"❌ Firebase revoke dropped at exit for uid={uid}: {e}")
+
+
+revocations = RevocationQueue()
+atexit.register(revocations.drain)
+
+
+def revoke_refresh_tokens(uid):
+    """Queue a revocation of the user's Firebase refresh tokens; returns immediately"""
+    if not uid:
+        return
+    from . import jobs
+
+    if jobs.enabled():
+        # Durable: survives a restart of this process (see api/jobs.py)
+        jobs.enqueue('firebase.revoke_refresh_tokens', {'uid': uid})
+    else:
+        revocations.enqueue(uid)
@@ -0,0 +1,41 @@
+"""
+Password hashers with cost parameters taken from settings.
+
+Django re-hashes a password on a successful ``check_password()`` whenever
+the stored hash was made by a hasher other than the first entry of
+``PASSWORD_HASHERS`` or with different parameters (``must_update``). So
+listing ``TunedArgon2PasswordHasher`` first upgrades every account,
+including the ones ``bulk_add_students`` created with the default password,
+the next time it logs in; the PBKDF2 entries stay in the list so older
+hashes still verify.
+
+Argon2 needs the ``argon2-cffi`` package; settings.py only puts it first
+when it is installed.
+"""
+
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id with ``PASSWORD_ARGON2_*`` cost parameters"""
+
+    @property
+    def time_cost(self):
+        return getattr(settings, 'PASSWORD_ARGON2_TIME_COST', Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return getattr(settings, 'PASSWORD_ARGON2_MEMORY_COST', Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return getattr(settings, 'PASSWORD_ARGON2_PARALLELISM', Argon2PasswordHasher.parallelism)
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with ``PASSWORD_PBKDF2_ITERATIONS`` iterations"""
+
+    @property
+    def iterations(self):
+        return getattr(settings, 'PASSWORD_PBKDF2_ITERATIONS', PBKDF2PasswordHasher.iterations)
@@ -0,0 +1,153 @@
+"""
+``Idempotency-Key`` support for write endpoints.
+
+Mobile clients retry POSTs that time out, so a slow submission can arrive
+twice. ``@idempotent('student_report')`` stores the response of the first
+request carrying a given key and replays it for every retry with the same
+key and body, without running the view again:
+
+* same key, same body, finished: the stored response is returned with an
+  ``Idempotent-Replayed: true`` header;
+* same key while the first request is still running: 409, until
+  ``IDEMPOTENCY_IN_PROGRESS_TIMEOUT`` seconds have passed; after that the
+  first request is presumed dead (e.g. its worker was killed on timeout)
+  and the retry takes the key over;
+* same key with a different body: 422.
+
+5xx responses and exceptions are not stored, so the client can retry them.
+Keys are scoped per user and expire after ``IDEMPOTENCY_KEY_TTL`` seconds;
+``manage.py purge_idempotency_keys`` deletes expired rows.
+
+Apply it below ``@api_view``/``@permission_classes`` so ``request.user`` is
+the authenticated user.
+"""
+
+import hashlib
+import json
+import logging
+import zlib
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.http import HttpResponse
+from django.utils import timezone
+
+from . import renderers
+from .models import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+DEFAULT_TTL = 24 * 60 * 60
+DEFAULT_IN_PROGRESS_TIMEOUT = 5 * 60
+
+
+def ttl():
+    return getattr(settings, 'IDEMPOTENCY_KEY_TTL', DEFAULT_TTL)
+
+
+def in_progress_timeout():
+    return getattr(settings, 'IDEMPOTENCY_IN_PROGRESS_TIMEOUT', DEFAULT_IN_PROGRESS_TIMEOUT)
+
+
+def _request_hash(request):
+    payload = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.sha256(f'{request.path}|{payload}'.encode('utf-8')).hexdigest()
+
+
+def _error(message, status_code):
+    return HttpResponse(
+        renderers.dumps({'success': False, 'error': message}),
+        status=status_code,
+        content_type='application/json'
+    )
+
+
+def _response_bytes(response):
+    data = getattr(response, 'data', None)
+    if data is not None:
+        return renderers.dumps(data)
+    return response.content
+
+
+def _replay(record):
+    response = HttpResponse(
+        zlib.decompress(record.response_body) if record.response_body else b'',
+        status=record.status_code,
+        content_type='application/json'
+    )
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def _claim(user, key, endpoint, request_hash):
+    """
+    Create the in-progress row for a key; returns ``(row, True)``, or the
+    existing row and False
+    """
+    now = timezone.now()
+    # Expired keys, and claims whose request died before finishing
+    IdempotencyKey.objects.filter(
+        Q(created_at__lt=now - timedelta(seconds=ttl()))
+        | Q(status_code__isnull=True, created_at__lt=now - timedelta(seconds=in_progress_timeout())),
+        user=user, key=key,
+    ).delete()
+    try:
+        with transaction.atomic():
+            return IdempotencyKey.objects.create(user=user, key=key, endpoint=endpoint, request_hash=request_hash), True
+    except IntegrityError:
+        return IdempotencyKey.objects.filter(user=user, key=key).first(), False
+
+
+def idempotent(endpoint):
+    """Replay stored responses for POSTs that repeat an ``Idempotency-Key``"""
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapped(request, *args, **kwargs):
+            key = request.headers.get(HEADER)
+            if request.method != 'POST' or not key:
+                return view_func(request, *args, **kwargs)
+
+            if len(key) > MAX_KEY_LENGTH:
+                return _error(f'{HEADER} must be at most {MAX_KEY_LENGTH} characters', 400)
+
+            request_hash = _request_hash(request)
+            record, created = _claim(request.user, key, endpoint, request_hash)
+
+            if not created:
+                if record is None:
+                    # The other request failed and released the key after our INSERT; a retry will claim it
+                    return _error('A request with this idempotency key is still being processed', 409)
+                if record.endpoint != endpoint or record.request_hash != request_hash:
+                    return _error(f'{HEADER} was already used for a different request', 422)
+                if record.status_code is None:
+                    return _error('A request with this idempotency key is still being processed', 409)
+                logger.info(f"🔁 Replaying {endpoint} response for idempotency key {key}")
+                return _replay(record)
+
+            # Only our own claim: a retry may have taken over the key after the timeout
+            claim = IdempotencyKey.objects.filter(id=record.id, status_code__isnull=True)
+            try:
+                response = view_func(request, *args, **kwargs)
+            except Exception:
+                claim.delete()
+                raise
+
+            if response.status_code >= 500 or getattr(response, 'streaming', False):
+                # Let the client retry failures for real
+                claim.delete()
+            else:
+                claim.update(
+                    status_code=response.status_code,
+                    response_body=zlib.compress(_response_bytes(response))
+                )
+            return response
+
+        return wrapped
+
+    return decorator
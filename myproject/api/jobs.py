@@ -0,0 +1,286 @@
+"""
+Database-backed background jobs.
+
+Slow side effects (counselor notification fan-out, Firebase revocation,
+triage refreshes) are registered here with ``@task`` and queued with
+``enqueue()``, which inserts a ``Job`` row in the caller's transaction, so
+the job only becomes visible to workers if the request commits.
+``manage.py run_worker`` claims and runs them; no Redis or Celery needed.
+
+Claiming: on PostgreSQL ready rows are picked with
+``SELECT ... FOR UPDATE SKIP LOCKED`` so concurrent workers never wait on
+each other. Databases without SKIP LOCKED (SQLite) claim each candidate
+with a conditional UPDATE and keep only the rows whose update went
+through, which the database serializes.
+
+A claimed job is ``running`` until ``locked_until`` (the visibility
+timeout); a worker that dies leaves the lock to expire and the job is
+claimed again. Failures are retried with exponential backoff until
+``max_attempts``; raise ``PermanentJobError`` to fail a job at once.
+Without a worker to retry them, failed runs are marked ``failed`` at once,
+and ``resume()`` restarts them (as well as jobs stranded ``pending`` or
+``running`` by a process that died).
+
+With ``JOB_QUEUE_ENABLED`` off (the default, for setups without a worker
+process) ``enqueue()`` runs the task inline instead, as before; jobs that
+must not block the request are queued anyway and started in a thread with
+``spawn()``.
+"""
+
+import logging
+import os
+import socket
+import threading
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VISIBILITY_TIMEOUT = 300
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_RETRY_BACKOFF = 10
+MAX_RETRY_BACKOFF = 3600
+
+# task name -> Task
+_tasks = {}
+
+
+class PermanentJobError(Exception):
+    """Raised by a task when retrying can't help"""
+
+
+class Task:
+    def __init__(self, name, fn, bind, max_attempts, visibility_timeout):
+        self.name = name
+        self.fn = fn
+        self.bind = bind
+        self.max_attempts = max_attempts
+        self.visibility_timeout = visibility_timeout
+
+    def __call__(self, job, payload):
+        if self.bind:
+            return self.fn(job, **payload)
+        return self.fn(**payload)
+
+
+def task(name, bind=False, max_attempts=None, visibility_timeout=None):
+    """
+    Register a function as a job task. It is called with the payload as
+    keyword arguments (and the ``Job`` first when ``bind=True``); its return
+    value must be JSON-serializable and is stored on the job.
+    """
+    def decorator(fn):
+        _tasks[name] = Task(name, fn, bind, max_attempts, visibility_timeout)
+        return fn
+    return decorator
+
+
+def get_task(name):
+    _load_tasks()
+    return _tasks.get(name)
+
+
+def _load_tasks():
+    from . import tasks  # noqa: F401  registers the @task functions
+
+
+def enabled():
+    return getattr(settings, 'JOB_QUEUE_ENABLED', False)
+
+
+def visibility_timeout(registered):
+    if registered and registered.visibility_timeout:
+        return registered.visibility_timeout
+    return getattr(settings, 'JOB_VISIBILITY_TIMEOUT', DEFAULT_VISIBILITY_TIMEOUT)
+
+
+def enqueue(name, payload=None, delay=0, max_attempts=None, force_queue=False, created_by=None):
+    """
+    Queue a task; returns the ``Job``, or ``None`` if the queue is disabled
+    and the task was run inline. ``force_queue`` queues regardless, for
+    callers that report job progress (see ``spawn()``).
+    """
+    payload = payload or {}
+    registered = get_task(name)
+    if registered is None:
+        raise ValueError(f'Unknown job task: {name}')
+
+    if not (enabled() or force_queue):
+        try:
+            # Savepoint: a failed statement mustn't abort the caller's transaction
+            with transaction.atomic():
+                registered(None, payload)
+        except Exception as e:
+            logger.error(f"❌ Inline job {name} failed: {e}")
+            traceback.print_exc()
+        return None
+
+    return Job.objects.create(
+        task=name,
+        payload=payload,
+        max_attempts=max_attempts or registered.max_attempts or getattr(settings, 'JOB_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS),
+        run_at=timezone.now() + timedelta(seconds=delay),
+        created_by=created_by,
+    )
+
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _ready(now):
+    return (
+        Q(status='pending', run_at__lte=now)
+        | Q(status='running', locked_until__lt=now, attempts__lt=F('max_attempts'))
+    )
+
+
+def fail_abandoned():
+    """Fail jobs whose last attempt's lock expired (the worker died); returns the number failed"""
+    now = timezone.now()
+    return Job.objects.filter(
+        status='running', locked_until__lt=now, attempts__gte=F('max_attempts')
+    ).update(
+        status='failed', finished_at=now, locked_until=None,
+        last_error='Visibility timeout expired on the last attempt',
+    )
+
+
+def claim(worker, limit=1, job_id=None):
+    """
+    Claim up to ``limit`` ready jobs (or only ``job_id``) for ``worker``;
+    returns them with ``attempts`` already counted
+    """
+    now = timezone.now()
+    lock_until = now + timedelta(seconds=visibility_timeout(None))
+    ready = Job.objects.filter(_ready(now))
+    if job_id is not None:
+        ready = ready.filter(id=job_id)
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(
+                ready.select_for_update(skip_locked=True)
+                .order_by('run_at')
+                .values_list('id', flat=True)[:limit]
+            )
+            if ids:
+                Job.objects.filter(id__in=ids).update(
+                    status='running', locked_by=worker, locked_until=lock_until,
+                    attempts=F('attempts') + 1,
+                )
+    else:
+        ids = []
+        candidates = ready.order_by('run_at').values_list('id', flat=True)[:limit * 4]
+        for candidate in candidates:
+            # Only one worker's UPDATE can still match the ready condition
+            claimed = Job.objects.filter(_ready(now), id=candidate).update(
+                status='running', locked_by=worker, locked_until=lock_until,
+                attempts=F('attempts') + 1,
+            )
+            if claimed:
+                ids.append(candidate)
+                if len(ids) >= limit:
+                    break
+
+    jobs = list(Job.objects.filter(id__in=ids, locked_by=worker).order_by('run_at'))
+    # Tasks with their own visibility timeout get their lock extended right away
+    for job in jobs:
+        registered = get_task(job.task)
+        if registered and registered.visibility_timeout:
+            touch(job)
+    return jobs
+
+
+def _owned(job):
+    return Job.objects.filter(id=job.id, status='running', locked_by=job.locked_by, attempts=job.attempts)
+
+
+def touch(job, **fields):
+    """Extend the job's lock (call from long tasks); returns False if the job is no longer ours"""
+    registered = get_task(job.task)
+    job.locked_until = timezone.now() + timedelta(seconds=visibility_timeout(registered))
+    for name, value in fields.items():
+        setattr(job, name, value)
+    return bool(_owned(job).update(locked_until=job.locked_until, **fields))
+
+
+def backoff(attempts):
+    base = getattr(settings, 'JOB_RETRY_BACKOFF', DEFAULT_RETRY_BACKOFF)
+    return min(base * 2 ** max(attempts - 1, 0), MAX_RETRY_BACKOFF)
+
+
+def run(job):
+    """Run a claimed job and record the outcome; returns the job's new status"""
+    registered = get_task(job.task)
+    try:
+        if registered is None:
+            raise PermanentJobError(f'Unknown job task: {job.task}')
+        result = registered(job, job.payload)
+    except Exception as e:
+        error = f"{e.__class__.__name__}: {e}"
+        # Without a worker nothing would pick a retry up; fail now so it can be resumed
+        if isinstance(e, PermanentJobError) or job.attempts >= job.max_attempts or not enabled():
+            _owned(job).update(status='failed', last_error=error, locked_until=None, finished_at=timezone.now())
+            logger.error(f"❌ Job {job} failed after {job.attempts} attempt(s): {error}")
+            traceback.print_exc()
+            return 'failed'
+        delay = backoff(job.attempts)
+        _owned(job).update(
+            status='pending', last_error=error, locked_until=None,
+            run_at=timezone.now() + timedelta(seconds=delay),
+        )
+        logger.warning(f"⚠️ Job {job} failed (attempt {job.attempts}/{job.max_attempts}), retrying in {delay}s: {error}")
+        return 'pending'
+
+    updated = _owned(job).update(status='succeeded', result=result, locked_until=None, finished_at=timezone.now())
+    if not updated:
+        logger.warning(f"⚠️ Job {job} finished after its lock expired; result discarded")
+    return 'succeeded'
+
+
+def resumable():
+    """Failed jobs, pending ones, and running ones whose lock expired (their process died)"""
+    return Q(status__in=['failed', 'pending']) | Q(status='running', locked_until__lt=timezone.now())
+
+
+def resume(job):
+    """Queue a job again with fresh attempts; tasks that save progress continue from it"""
+    return bool(Job.objects.filter(resumable(), id=job.id).update(
+        status='pending', attempts=0, run_at=timezone.now(), finished_at=None,
+        locked_until=None, locked_by='',
+    ))
+
+
+def run_now(job_id, worker=None):
+    """Claim one job and run it in this thread; returns its new status, or None if it wasn't ready"""
+    claimed = claim(worker or worker_id(), job_id=job_id)
+    if not claimed:
+        return None
+    return run(claimed[0])
+
+
+def spawn(job):
+    """
+    Without a worker process (``JOB_QUEUE_ENABLED`` off), run a queued job in
+    a daemon thread of this process once the current transaction commits
+    """
+    if enabled():
+        return
+
+    def start():
+        def target():
+            try:
+                run_now(job.id)
+            finally:
+                connection.close()
+        threading.Thread(target=target, name=f'job-{job.id}', daemon=True).start()
+
+    transaction.on_commit(start)
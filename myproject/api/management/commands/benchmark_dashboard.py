@@ -0,0 +1,114 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api import parallel
+from api.models import Counselor
+from api.views.dashboard import _compute_dashboard_analytics, get_counselor_dashboard_stats
+
+
+class Command(BaseCommand):
+    help = 'Compare dashboard latency with sequential vs concurrent queries (api/parallel.py)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=10,
+            help='Calls per endpoint and mode; the median is reported (default: 10)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=getattr(settings, 'PARALLEL_QUERY_WORKERS', parallel.DEFAULT_WORKERS),
+            help='Pool size for the concurrent run (default: PARALLEL_QUERY_WORKERS)',
+        )
+        parser.add_argument(
+            '--username',
+            type=str,
+            help='Counselor to compute the dashboard for (default: first counselor)',
+        )
+        parser.add_argument(
+            '--school-year',
+            type=str,
+            help='School year filter (default: all)',
+        )
+        parser.add_argument(
+            '--latency-ms',
+            type=float,
+            default=0,
+            help='Add this round-trip delay to every query, e.g. to model a remote database (default: 0)',
+        )
+
+    def handle(self, *args, **options):
+        if options['workers'] < 2:
+            raise CommandError('--workers must be at least 2')
+
+        counselors = Counselor.objects.select_related('user')
+        if options.get('username'):
+            counselors = counselors.filter(user__username=options['username'])
+        counselor = counselors.first()
+        if not counselor:
+            raise CommandError('No counselor found; pass --username of a counselor')
+
+        school_year = options.get('school_year')
+        path = '/api/counselor/dashboard/stats/'
+        if school_year:
+            path += f'?school_year={school_year}'
+
+        def stats():
+            request = APIRequestFactory().get(path)
+            force_authenticate(request, user=counselor.user)
+            response = get_counselor_dashboard_stats(request)
+            if response.status_code != 200:
+                raise CommandError(f'dashboard stats returned {response.status_code}: {response.data}')
+
+        endpoints = (
+            ('dashboard analytics', lambda: _compute_dashboard_analytics(counselor, school_year)),
+            ('dashboard stats', stats),
+        )
+
+        self.stdout.write(f"\n⏱️ Dashboard query benchmark ({options['repeat']} runs each, {options['workers']} workers)")
+        self.stdout.write(f"   Database: {connection.vendor}")
+        if connection.vendor != 'postgresql':
+            self.stdout.write(self.style.WARNING(
+                "   ⚠️ Not PostgreSQL: point DATABASE_URL at a PostgreSQL copy for representative numbers"
+            ))
+        if options['latency_ms']:
+            self.stdout.write(f"   Simulated query latency: {options['latency_ms']:.1f} ms")
+        self.stdout.write("=" * 70)
+
+        delay = options['latency_ms'] / 1000
+
+        def add_latency(execute, sql, params, many, context):
+            time.sleep(delay)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(add_latency):
+            for name, fn in endpoints:
+                with override_settings(PARALLEL_QUERY_WORKERS=1):
+                    sequential_ms = self._time(fn, options['repeat'])
+                with override_settings(PARALLEL_QUERY_WORKERS=options['workers']):
+                    concurrent_ms = self._time(fn, options['repeat'])
+
+                self.stdout.write(f"\n📊 {name}")
+                self.stdout.write(f"   sequential: {sequential_ms:8.1f} ms")
+                self.stdout.write(f"   concurrent: {concurrent_ms:8.1f} ms")
+                if concurrent_ms:
+                    self.stdout.write(self.style.SUCCESS(f"   speedup:    {sequential_ms / concurrent_ms:8.2f}x"))
+
+        self.stdout.write("")
+
+    def _time(self, fn, repeat):
+        fn()  # warm up (and open the pool's connections)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,87 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+CHILD = """
+import json, resource, time
+start = time.perf_counter()
+import django
+django.setup()
+import api.urls
+{extra}
+print(json.dumps({{
+    'seconds': time.perf_counter() - start,
+    'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+}}))
+"""
+
+SCENARIOS = (
+    ('lazy URLconf (worker boot)', ''),
+    ('all view modules (preload / old views.py)', 'from api.views import preload; preload()'),
+)
+
+
+def parse_importtime(stderr):
+    """{module: (self_us, cumulative_us)} from ``python -X importtime`` output"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+class Command(BaseCommand):
+    help = 'Measure import time and memory of loading the API with `python -X importtime`'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--runs',
+            type=int,
+            default=5,
+            help='Fresh interpreters per scenario; the fastest run is reported (default: 5)',
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=10,
+            help='Slowest api.* modules to list (default: 10)',
+        )
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'myproject.settings'))
+
+        self.stdout.write(f"\n⏱️ Import benchmark: {options['runs']} runs per scenario")
+        self.stdout.write("=" * 70)
+
+        for label, extra in SCENARIOS:
+            best = None
+            for _ in range(options['runs']):
+                result = subprocess.run(
+                    [sys.executable, '-X', 'importtime', '-c', CHILD.format(extra=extra)],
+                    capture_output=True, text=True, env=env,
+                )
+                if result.returncode != 0:
+                    raise CommandError(result.stderr.strip().splitlines()[-1])
+                stats = json.loads(result.stdout.strip().splitlines()[-1])
+                if best is None or stats['seconds'] < best[0]['seconds']:
+                    best = (stats, parse_importtime(result.stderr))
+
+            stats, modules = best
+            api_modules = {name: times for name, times in modules.items() if name.startswith('api')}
+            self.stdout.write(f"\n📦 {label}")
+            self.stdout.write(f"   wall time:     {stats['seconds'] * 1000:8.1f} ms")
+            self.stdout.write(self.style.SUCCESS(
+                f"   imports:       {sum(self_us for self_us, _ in modules.values()) / 1000:8.1f} ms ({len(modules)} modules)"
+            ))
+            self.stdout.write(f"   api.* modules: {sum(self_us for self_us, _ in api_modules.values()) / 1000:8.1f} ms ({len(api_modules)} modules)")
+            self.stdout.write(f"   max RSS:       {stats['max_rss_kb'] / 1024:8.1f} MiB")
+            slowest = sorted(api_modules.items(), key=lambda item: item[1][0], reverse=True)[:options['top']]
+            for name, (self_us, cumulative_us) in slowest:
+                self.stdout.write(f"     {self_us / 1000:7.1f} ms self {cumulative_us / 1000:8.1f} ms cumulative  {name}")
+
+        self.stdout.write("")
@@ -0,0 +1,130 @@
+import json
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api import renderers
+from api.views.students import get_students_list
+from api.views.violations import get_student_violations
+
+
+class Command(BaseCommand):
+    help = 'Compare JSON encode time (stdlib vs fast renderer) on the students and violations endpoints'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Encode each payload this many times (default: 20)',
+        )
+        parser.add_argument(
+            '--username',
+            type=str,
+            help='User to call the endpoints as (default: first superuser)',
+        )
+        parser.add_argument(
+            '--synthetic',
+            type=int,
+            default=0,
+            help='Benchmark N generated rows instead of calling the endpoints',
+        )
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+
+        if options['synthetic']:
+            payloads = self._synthetic_payloads(options['synthetic'])
+        else:
+            payloads = self._endpoint_payloads(options.get('username'))
+
+        self.stdout.write(f"\n⏱️ JSON encode benchmark ({repeat} runs each)")
+        self.stdout.write(f"   Fast backend: {'orjson' if renderers.orjson else 'not installed (stdlib fallback)'}")
+        self.stdout.write("=" * 70)
+
+        for name, data in payloads.items():
+            stdlib_ms = self._time(lambda: json.dumps(data, cls=renderers.ISOFormatJSONEncoder).encode('utf-8'), repeat)
+            fast_ms = self._time(lambda: renderers.dumps(data), repeat)
+            size_kb = len(renderers.dumps(data)) / 1024
+
+            self.stdout.write(f"\n📦 {name} ({size_kb:.1f} KB)")
+            self.stdout.write(f"   stdlib json: {stdlib_ms:8.3f} ms")
+            self.stdout.write(f"   renderer:    {fast_ms:8.3f} ms")
+            if fast_ms:
+                self.stdout.write(self.style.SUCCESS(f"   speedup:     {stdlib_ms / fast_ms:8.2f}x"))
+
+        self.stdout.write("")
+
+    def _time(self, fn, repeat):
+        fn()  # warm up
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        return (time.perf_counter() - start) * 1000 / repeat
+
+    def _endpoint_payloads(self, username):
+        if username:
+            user = User.objects.filter(username=username).first()
+        else:
+            user = User.objects.filter(is_superuser=True).first()
+        if not user:
+            raise CommandError('No user to authenticate as; pass --username or use --synthetic N')
+
+        factory = APIRequestFactory()
+        payloads = {}
+        for name, view, path in (
+            ('students', get_students_list, '/api/students/'),
+            ('violations', get_student_violations, '/api/violations/'),
+        ):
+            request = factory.get(path)
+            force_authenticate(request, user=user)
+            response = view(request)
+            if response.status_code != 200:
+                raise CommandError(f'{name} endpoint returned {response.status_code}: {response.data}')
+            payloads[name] = response.data
+        return payloads
+
+    def _synthetic_payloads(self, rows):
+        now = timezone.now()
+        students = [{
+            'id': i,
+            'student_id': f'2024-{i:05d}',
+            'lrn': f'1000000{i:05d}',
+            'username': f'student{i}',
+            'first_name': 'Juan',
+            'last_name': f'Dela Cruz {i}',
+            'email': f'student{i}@example.com',
+            'grade_level': str(7 + i % 6),
+            'section': 'Section A',
+            'strand': 'STEM',
+            'school_year': '2024-2025',
+            'contact_number': '09171234567',
+            'guardian_name': 'Maria Dela Cruz',
+            'guardian_contact': '09181234567',
+        } for i in range(rows)]
+        violations = [{
+            'id': i,
+            'student': {
+                'id': i,
+                'name': f'Juan Dela Cruz {i}',
+                'student_id': f'2024-{i:05d}',
+                'grade_level': str(7 + i % 6),
+                'section': 'Section A',
+                'school_year': '2024-2025',
+            },
+            'violation_type': {'id': i % 20, 'name': 'Tardiness', 'category': 'Minor Offenses'},
+            'severity_level': 'Medium',
+            'incident_date': now - timedelta(days=i % 200),
+            'description': 'Arrived late to class without a valid excuse. ' * 3,
+            'status': 'active',
+            'counselor': 'Guidance Counselor',
+            'created_at': now - timedelta(days=i % 200),
+        } for i in range(rows)]
+        return {
+            'students': {'success': True, 'students': students, 'total': rows},
+            'violations': {'success': True, 'violations': violations, 'total': rows},
+        }
@@ -0,0 +1,117 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import get_hashers, identify_hasher
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.test import APIRequestFactory
+
+from api.views.auth import login_view
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = 'Measure password hasher cost and p50/p95/p99 login latency under concurrent load'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--username',
+            type=str,
+            help='Existing account to log in as (skip to benchmark the hashers only)',
+        )
+        parser.add_argument(
+            '--password',
+            type=str,
+            help='Password of --username',
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=50,
+            help='Number of logins / hash verifications (default: 50)',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=8,
+            help='Concurrent threads (default: 8)',
+        )
+
+    def handle(self, *args, **options):
+        requests = options['requests']
+        concurrency = options['concurrency']
+
+        self.stdout.write(f"\n⏱️ Login benchmark: {requests} runs, {concurrency} threads")
+        self.stdout.write("=" * 70)
+
+        self._benchmark_hashers(requests, concurrency)
+
+        if options.get('username'):
+            if not options.get('password'):
+                raise CommandError('--password is required with --username')
+            self._benchmark_logins(options['username'], options['password'], requests, concurrency)
+
+        self.stdout.write("")
+
+    def _run(self, fn, requests, concurrency):
+        def timed_call(_):
+            start = time.perf_counter()
+            ok = fn()
+            elapsed = (time.perf_counter() - start) * 1000
+            connection.close()
+            return elapsed, ok
+
+        wall_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(timed_call, range(requests)))
+        wall = time.perf_counter() - wall_start
+        return [elapsed for elapsed, _ in results], sum(1 for _, ok in results if ok), wall
+
+    def _report(self, label, latencies, succeeded, wall):
+        self.stdout.write(f"\n🔐 {label}")
+        self.stdout.write(f"   ok:         {succeeded}/{len(latencies)}")
+        self.stdout.write(f"   p50:        {percentile(latencies, 50):8.1f} ms")
+        self.stdout.write(self.style.SUCCESS(f"   p95:        {percentile(latencies, 95):8.1f} ms"))
+        self.stdout.write(f"   p99:        {percentile(latencies, 99):8.1f} ms")
+        self.stdout.write(f"   throughput: {len(latencies) / wall:8.1f} /s")
+
+    def _benchmark_hashers(self, requests, concurrency):
+        password = 'Benchmark#Passw0rd'
+        for hasher in get_hashers():
+            if hasher.algorithm not in ('argon2', 'pbkdf2_sha256'):
+                continue
+            encoded = hasher.encode(password, hasher.salt())
+            latencies, succeeded, wall = self._run(
+                lambda: hasher.verify(password, encoded), requests, concurrency
+            )
+            self._report(f"verify with {hasher.__class__.__name__} ({hasher.algorithm})", latencies, succeeded, wall)
+
+    def _benchmark_logins(self, username, password, requests, concurrency):
+        user = User.objects.filter(username=username).first()
+        if not user:
+            raise CommandError(f'User {username} not found')
+        self.stdout.write(f"\n   stored hash before: {identify_hasher(user.password).algorithm}")
+
+        factory = APIRequestFactory()
+        body = json.dumps({'username': username, 'password': password})
+
+        def login():
+            request = factory.post('/api/login/', body, content_type='application/json')
+            response = login_view(request)
+            return response.status_code == 200
+
+        # The first login may re-hash the stored password; keep it out of the numbers
+        login()
+        user.refresh_from_db(fields=['password'])
+        self.stdout.write(f"   stored hash after:  {identify_hasher(user.password).algorithm}")
+
+        latencies, succeeded, wall = self._run(login, requests, concurrency)
+        self._report(f"POST /api/login/ as {username}", latencies, succeeded, wall)
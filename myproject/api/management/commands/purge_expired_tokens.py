@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from api import tokens
+
+class Command(BaseCommand):
+    help = 'Delete API tokens older than TOKEN_TTL (run from cron)'
+
+    def handle(self, *args, **options):
+        deleted = tokens.purge_expired()
+        self.stdout.write(self.style.SUCCESS(f'✅ Purged {deleted} expired API tokens'))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from api.models import IdempotencyKey
+from api import idempotency
+
+class Command(BaseCommand):
+    help = 'Delete stored Idempotency-Key responses older than IDEMPOTENCY_KEY_TTL (run from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--ttl',
+            type=int,
+            help='Override the TTL in seconds',
+        )
+
+    def handle(self, *args, **options):
+        ttl = options.get('ttl') or idempotency.ttl()
+        deleted = IdempotencyKey.purge_expired(ttl)
+        self.stdout.write(self.style.SUCCESS(f'✅ Purged {deleted} idempotency keys older than {ttl}s'))
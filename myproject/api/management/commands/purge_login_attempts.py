@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from api.models import LoginAttempt
+
+class Command(BaseCommand):
+    help = 'Delete login audit rows older than LOGIN_AUDIT_RETENTION_DAYS (run from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            help='Override the retention period in days',
+        )
+
+    def handle(self, *args, **options):
+        days = options.get('days') or getattr(settings, 'LOGIN_AUDIT_RETENTION_DAYS', 90)
+        deleted = LoginAttempt.purge_older_than(days)
+        self.stdout.write(self.style.SUCCESS(f'✅ Purged {deleted} login attempts older than {days} days'))
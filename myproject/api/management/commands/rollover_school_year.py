@@ -1,7 +1,6 @@
-from django.core.management.base import BaseCommand
-from api.models import Student, StudentSchoolYearHistory, Teacher
-from datetime import datetime
-from django.db import transaction
+from django.core.management.base import BaseCommand, CommandError
+from api import jobs, rollover
+from api.models import Job
 
 class Command(BaseCommand):
     help = 'Roll over students to new school year (keeps violation history)'
@@ -17,87 +16,64 @@ class Command(BaseCommand):
             action='store_true',
             help='Preview changes without applying them',
         )
+        parser.add_argument(
+            '--resume',
+            type=int,
+            metavar='JOB_ID',
+            help='Continue a failed rollover job from its last completed chunk',
+        )
+        parser.add_argument(
+            '--background',
+            action='store_true',
+            help='Only queue the job for `manage.py run_worker` and print its id',
+        )
 
     def handle(self, *args, **options):
-        dry_run = options.get('dry_run', False)
-        new_year = options.get('new_year')
-        
-        if not new_year:
-            current_year = datetime.now().year
-            current_month = datetime.now().month
-            new_year = f"{current_year}-{current_year + 1}" if current_month >= 6 else f"{current_year - 1}-{current_year}"
-        
-        self.stdout.write(f"\n{'🔍 DRY RUN MODE' if dry_run else '🚀 EXECUTING'}: School Year Rollover to {new_year}\n")
+        if options.get('resume'):
+            job = Job.objects.filter(id=options['resume'], task='school_year.rollover').first()
+            if not job:
+                raise CommandError(f"Rollover job #{options['resume']} not found")
+            if not jobs.resume(job):
+                raise CommandError(f'Job #{job.id} is {job.status}; only failed, pending or abandoned jobs can be resumed')
+            self.stdout.write(f"\n🔁 Resuming rollover job #{job.id} ({(job.progress or {}).get('processed', 0)} students already done)")
+        else:
+            dry_run = options.get('dry_run', False)
+            new_year = options.get('new_year') or rollover.default_school_year()
+            job = jobs.enqueue('school_year.rollover', {
+                'new_school_year': new_year,
+                'dry_run': dry_run,
+            }, force_queue=True)
+            self.stdout.write(f"\n{'🔍 DRY RUN MODE' if dry_run else '🚀 EXECUTING'}: School Year Rollover to {new_year} (job #{job.id})\n")
+
         self.stdout.write("=" * 70)
-        
-        students = Student.objects.select_related('user').all()
-        total_students = students.count()
-        
-        self.stdout.write(f"\n📊 Total students: {total_students}")
-        
-        if dry_run:
-            self.stdout.write(f"\n{'⚠️ DRY RUN - No changes will be made'}\n")
-        
-        updated_count = 0
-        history_created = 0
-        
-        with transaction.atomic():
-            for student in students:
-                old_year = student.school_year
-                old_grade = student.grade_level
-                old_section = student.section
-                
-                # Save current year to history
-                history, created = StudentSchoolYearHistory.objects.get_or_create(
-                    student=student,
-                    school_year=old_year,
-                    defaults={
-                        'grade_level': old_grade,
-                        'section': old_section,
-                        'strand': student.strand,
-                        'is_active': False,
-                    }
-                )
-                
-                if created:
-                    history_created += 1
-                    self.stdout.write(f"  📝 Archived: {student.user.get_full_name()} - {old_year} ({old_grade} {old_section})")
-                
-                # Update student to new school year
-                if not dry_run:
-                    # Promote grade level (if not Grade 12)
-                    if old_grade.isdigit():
-                        new_grade = str(int(old_grade) + 1) if int(old_grade) < 12 else old_grade
-                    else:
-                        new_grade = old_grade
-                    
-                    student.school_year = new_year
-                    student.grade_level = new_grade
-                    # Note: Section will be updated by advisers later
-                    student.save()
-                    
-                    # Create new history entry for new year
-                    StudentSchoolYearHistory.objects.create(
-                        student=student,
-                        school_year=new_year,
-                        grade_level=new_grade,
-                        section=old_section,  # Temporary, adviser will update
-                        strand=student.strand,
-                        is_active=True,
-                    )
-                    
-                    updated_count += 1
-                    self.stdout.write(
-                        f"  ✅ Updated: {student.user.get_full_name()} - "
-                        f"{old_grade} → {new_grade} (School Year: {new_year})"
-                    )
-            
-            if dry_run:
-                self.stdout.write(f"\n⚠️ DRY RUN COMPLETE - No changes were made")
-                raise Exception("Dry run - rolling back transaction")
-        
+
+        if options.get('background'):
+            self.stdout.write(self.style.SUCCESS(f"\n✅ Queued job #{job.id}; follow it with GET /api/jobs/{job.id}/\n"))
+            return
+
+        outcome = jobs.run_now(job.id)
+        if outcome is None:
+            raise CommandError(f'Job #{job.id} was already claimed by a worker')
+        job.refresh_from_db()
+        progress = job.progress or {}
+        counts = progress.get('counts', {})
+
+        self.stdout.write(f"\n📊 Students processed: {progress.get('processed', 0)}/{progress.get('total', 0)}")
+        self.stdout.write(f"  📚 School Year History Records Created: {counts.get('history_archived', 0)}")
+        self.stdout.write(f"  👥 Students Updated: {counts.get('students_updated', 0)}")
+        self.stdout.write(f"  ⏭️ Already in the new school year: {counts.get('skipped', 0)}")
+        for error in progress.get('errors', []):
+            self.stdout.write(self.style.ERROR(f"  ❌ {error}"))
+
         self.stdout.write("\n" + "=" * 70)
-        self.stdout.write(self.style.SUCCESS(f"\n✅ Rollover Complete!"))
-        self.stdout.write(f"  📚 School Year History Records Created: {history_created}")
-        self.stdout.write(f"  👥 Students Updated to {new_year}: {updated_count}")
-        self.stdout.write(f"\n⚠️ Note: Advisers should now update student sections for their advisory classes\n")
\ No newline at end of file
+        if outcome == 'succeeded':
+            dry_run = job.payload.get('dry_run')
+            self.stdout.write(self.style.SUCCESS(f"\n✅ Rollover {'simulated' if dry_run else 'complete'}!"))
+            if not dry_run:
+                self.stdout.write(f"\n⚠️ Note: Advisers should now update student sections for their advisory classes\n")
+        else:
+            retry = "A worker will retry it, or re-run" if outcome == 'pending' else "Re-run"
+            self.stdout.write(self.style.ERROR(
+                f"\n❌ Rollover job #{job.id} is {outcome}: {job.last_error}"
+                f"\n   {retry} with --resume {job.id} to continue from the last completed chunk\n"
+            ))
@@ -0,0 +1,82 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api import jobs
+from api.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (set JOB_QUEUE_ENABLED=True on the web service)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10,
+            help='Jobs claimed per poll (default: 10)',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            help='Seconds to wait when the queue is empty (default: JOB_POLL_INTERVAL)',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once no job is ready instead of polling',
+        )
+        parser.add_argument(
+            '--purge-days',
+            type=int,
+            help='Also delete finished jobs older than this many days (default: JOB_RETENTION_DAYS)',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        sleep = options.get('sleep') or getattr(settings, 'JOB_POLL_INTERVAL', 2)
+        purge_days = options.get('purge_days') or getattr(settings, 'JOB_RETENTION_DAYS', 7)
+        worker = jobs.worker_id()
+
+        self._stopping = False
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Job worker {worker} started'))
+        counts = {'succeeded': 0, 'pending': 0, 'failed': 0}
+        last_purge = 0
+
+        while not self._stopping:
+            close_old_connections()
+
+            if time.monotonic() - last_purge > 3600:
+                failed = jobs.fail_abandoned()
+                purged = Job.purge_finished(purge_days)
+                if failed or purged:
+                    self.stdout.write(f'🧹 Failed {failed} abandoned jobs, purged {purged} finished jobs')
+                last_purge = time.monotonic()
+
+            claimed = jobs.claim(worker, batch_size)
+            for job in claimed:
+                outcome = jobs.run(job)
+                counts[outcome] += 1
+                self.stdout.write(f'   {job.task} #{job.id}: {outcome}')
+                if self._stopping:
+                    break
+
+            if not claimed:
+                if options['once']:
+                    break
+                time.sleep(sleep)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Job worker {worker} stopped: {counts['succeeded']} succeeded, "
+            f"{counts['pending']} retried, {counts['failed']} failed"
+        ))
+
+    def _stop(self, signum, frame):
+        # Finish the current job; its lock would otherwise have to time out
+        self._stopping = True
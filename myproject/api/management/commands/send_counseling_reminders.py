@@ -0,0 +1,68 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api import reminders
+
+
+class Command(BaseCommand):
+    help = 'Send reminders for counseling sessions scheduled within the next window (run from cron or with --loop)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--window-hours',
+            type=int,
+            help='Remind sessions scheduled within this many hours (default: COUNSELING_REMINDER_WINDOW_HOURS)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Sessions handled per transaction (default: COUNSELING_REMINDER_BATCH_SIZE)',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running, dispatching every --interval seconds',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=300,
+            help='Seconds between runs with --loop (default: 300)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Count due reminders without sending them',
+        )
+
+    def handle(self, *args, **options):
+        self._stopping = False
+        if options['loop']:
+            signal.signal(signal.SIGTERM, self._stop)
+            signal.signal(signal.SIGINT, self._stop)
+
+        while True:
+            close_old_connections()
+            totals = reminders.dispatch_due(
+                window_hours=options.get('window_hours'),
+                batch_size=options.get('batch_size'),
+                dry_run=options['dry_run'],
+            )
+            for name, (reminded, created) in totals.items():
+                self.stdout.write(self.style.SUCCESS(
+                    f"✅ {name}: {'would send' if options['dry_run'] else 'sent'} {created} reminders for {reminded} sessions"
+                ))
+
+            if not options['loop'] or self._stopping:
+                break
+            deadline = time.monotonic() + options['interval']
+            while not self._stopping and time.monotonic() < deadline:
+                time.sleep(1)
+            if self._stopping:
+                break
+
+    def _stop(self, signum, frame):
+        self._stopping = True
@@ -0,0 +1,435 @@
+"""
+In-process Prometheus metrics for the guidance tracker API.
+
+Every worker process keeps its own counters, gauges and histograms in memory
+and periodically flushes them to a JSON file named after its PID inside
+``METRICS_DIR``. The ``/api/metrics/`` endpoint merges all of those files so a
+scrape sees the totals for every gunicorn worker, not just the one that
+happened to answer the request.
+
+When a worker exits, its file is folded into ``metrics_archive.json`` (the
+same idea as prometheus_client's ``mark_process_dead``): the next scrape
+that finds a file whose PID is no longer running moves its counters and
+histograms into the archive and deletes it, and a new process reusing a PID
+archives the file it would otherwise overwrite. Totals therefore never go
+backwards on worker restarts, and dead workers don't linger as files.
+"""
+
+import atexit
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows (development only)
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FILE = 'metrics_archive.json'
+LOCK_FILE = 'metrics.lock'
+
+# Seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Queries per request
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+# Recipients per notification broadcast
+FANOUT_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+METRIC_HELP = {
+    'http_request_duration_seconds': ('histogram', 'API request latency by URL name'),
+    'db_queries_per_request': ('histogram', 'Database queries executed per request by URL name'),
+    'db_queries_total': ('counter', 'Total database queries executed by URL name'),
+    'cache_requests_total': ('counter', 'Cache lookups by cache name and result'),
+    'cache_hit_ratio': ('gauge', 'Cache hit ratio by cache name'),
+    'login_attempts_total': ('counter', 'Login attempts by result'),
+    'login_lockouts_total': ('counter', 'Login requests rejected because the account was locked out'),
+    'login_locked_out_usernames': ('gauge', 'Usernames with LOGIN_MAX_FAILURES+ failed attempts in the login audit log within LOGIN_LOCKOUT_WINDOW'),
+    'login_failed_attempts_window': ('gauge', 'Failed attempts in the login audit log within LOGIN_LOCKOUT_WINDOW'),
+    'notifications_created_total': ('counter', 'Notifications created by fan-out source'),
+    'notification_fanout_recipients': ('histogram', 'Recipients per notification fan-out by source'),
+    'rollover_students_total': ('gauge', 'Students in the current school year rollover'),
+    'rollover_students_processed': ('gauge', 'Students processed by the current school year rollover'),
+    'rollover_errors': ('gauge', 'Errors raised by the current school year rollover'),
+    'rollover_last_update_timestamp_seconds': ('gauge', 'Unix time of the last rollover progress update'),
+}
+
+
+def _metrics_dir():
+    return getattr(
+        settings,
+        'METRICS_DIR',
+        os.path.join(tempfile.gettempdir(), 'guidance_tracker_metrics'),
+    )
+
+
+def _flush_interval():
+    return getattr(settings, 'METRICS_FLUSH_INTERVAL', 5)
+
+
+def _can_archive():
+    # Liveness is checked with os.kill(pid, 0), which terminates the process on Windows
+    return os.name == 'posix'
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@contextmanager
+def _directory_lock(directory):
+    """Serialize archive updates between processes"""
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(directory, LOCK_FILE), 'a') as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _read(path):
+    try:
+        with open(path) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def _write(directory, filename, payload):
+    """Atomically replace ``filename`` with ``payload``"""
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w') as fh:
+        fh.write(payload)
+    os.replace(tmp_path, os.path.join(directory, filename))
+
+
+def _merge(totals, data):
+    """Add one process's values to ``totals`` ({'counters', 'gauges', 'histograms'})"""
+    counters, gauges, histograms = totals['counters'], totals['gauges'], totals['histograms']
+    for key, value in data.get('counters', {}).items():
+        counters[key] = counters.get(key, 0) + value
+    for key, (value, ts) in data.get('gauges', {}).items():
+        # Gauges are last-write-wins across processes
+        if key not in gauges or ts > gauges[key][1]:
+            gauges[key] = [value, ts]
+    for key, hist in data.get('histograms', {}).items():
+        merged = histograms.get(key)
+        if merged is None:
+            histograms[key] = {
+                'le': list(hist['le']),
+                'buckets': list(hist['buckets']),
+                'sum': hist['sum'],
+                'count': hist['count'],
+            }
+        else:
+            merged['buckets'] = [a + b for a, b in zip(merged['buckets'], hist['buckets'])]
+            merged['sum'] += hist['sum']
+            merged['count'] += hist['count']
+
+
+def _empty():
+    return {'counters': {}, 'gauges': {}, 'histograms': {}}
+
+
+def archive_files(directory, filenames):
+    """Fold the metric files of exited processes into the archive and delete them"""
+    with _directory_lock(directory):
+        archive = _read(os.path.join(directory, ARCHIVE_FILE)) or _empty()
+        archived = False
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            # Another process may have archived it while we waited for the lock
+            data = _read(path)
+            if data is None:
+                continue
+            _merge(archive, data)
+            os.remove(path)
+            archived = True
+        if archived:
+            _write(directory, ARCHIVE_FILE, json.dumps(archive))
+
+
+def _file_pid(filename):
+    try:
+        return int(filename[len('metrics_'):-len('.json')])
+    except ValueError:
+        return None
+
+
+def _key(name, labels):
+    """Serialize a metric name and its labels into a stable dictionary key"""
+    return json.dumps([name, sorted((labels or {}).items())])
+
+
+class MetricsStore:
+    """Per-process metric values backed by one JSON file per PID"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._reset()
+
+    def _reset(self):
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self._dirty = False
+        self._last_flush = 0.0
+        # Whether a file left by an earlier process with our PID has been archived
+        self._claimed = False
+
+    def _check_fork(self):
+        # gunicorn forks workers after the app is imported; start clean in the child
+        if os.getpid() != self._pid:
+            self._pid = os.getpid()
+            self._reset()
+
+    def inc(self, name, labels=None, amount=1):
+        with self._lock:
+            self._check_fork()
+            key = _key(name, labels)
+            self.counters[key] = self.counters.get(key, 0) + amount
+            self._dirty = True
+        self.maybe_flush()
+
+    def set(self, name, value, labels=None):
+        with self._lock:
+            self._check_fork()
+            self.gauges[_key(name, labels)] = [value, time.time()]
+            self._dirty = True
+        self.maybe_flush()
+
+    def observe(self, name, value, buckets, labels=None):
+        with self._lock:
+            self._check_fork()
+            key = _key(name, labels)
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = {'le': list(buckets), 'buckets': [0] * len(buckets), 'sum': 0.0, 'count': 0}
+                self.histograms[key] = hist
+            for i, bound in enumerate(hist['le']):
+                if value <= bound:
+                    hist['buckets'][i] += 1
+            hist['sum'] += value
+            hist['count'] += 1
+            self._dirty = True
+        self.maybe_flush()
+
+    def maybe_flush(self):
+        if self._dirty and time.monotonic() - self._last_flush >= _flush_interval():
+            self.flush()
+
+    def flush(self):
+        """Atomically write this process's values to its own file"""
+        with self._lock:
+            self._check_fork()
+            payload = json.dumps({
+                'counters': self.counters,
+                'gauges': self.gauges,
+                'histograms': self.histograms,
+            })
+            self._dirty = False
+            self._last_flush = time.monotonic()
+            claimed, self._claimed = self._claimed, True
+        directory = _metrics_dir()
+        filename = f'metrics_{self._pid}.json'
+        try:
+            os.makedirs(directory, exist_ok=True)
+            if not claimed and _can_archive() and os.path.exists(os.path.join(directory, filename)):
+                # Left by a dead process whose PID we reuse: keep its totals
+                archive_files(directory, [filename])
+            _write(directory, filename, payload)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not flush metrics: {e}")
+
+
+_store = MetricsStore()
+atexit.register(_store.flush)
+
+
+def inc(name, labels=None, amount=1):
+    _store.inc(name, labels, amount)
+
+
+def set_gauge(name, value, labels=None):
+    _store.set(name, value, labels)
+
+
+def observe(name, value, buckets, labels=None):
+    _store.observe(name, value, buckets, labels)
+
+
+# =============================================================================
+# DOMAIN HELPERS
+# =============================================================================
+
+def record_request(url_name, method, duration, query_count):
+    labels = {'url_name': url_name, 'method': method}
+    observe('http_request_duration_seconds', duration, LATENCY_BUCKETS, labels)
+    if query_count is None:
+        # async views: queries aren't countable from the middleware
+        return
+    observe('db_queries_per_request', query_count, QUERY_BUCKETS, {'url_name': url_name})
+    inc('db_queries_total', {'url_name': url_name}, query_count)
+
+
+def record_cache(cache_name, hit):
+    inc('cache_requests_total', {'cache': cache_name, 'result': 'hit' if hit else 'miss'})
+
+
+def record_login_attempt(success):
+    inc('login_attempts_total', {'result': 'success' if success else 'failure'})
+
+
+def record_login_lockout():
+    inc('login_lockouts_total')
+
+
+def record_notification_fanout(source, recipients):
+    inc('notifications_created_total', {'source': source}, recipients)
+    observe('notification_fanout_recipients', recipients, FANOUT_BUCKETS, {'source': source})
+
+
+def record_rollover_progress(processed, total, errors=0):
+    set_gauge('rollover_students_processed', processed)
+    set_gauge('rollover_students_total', total)
+    set_gauge('rollover_errors', errors)
+    set_gauge('rollover_last_update_timestamp_seconds', time.time())
+    if processed >= total:
+        # Make the final state visible to other workers immediately
+        _store.flush()
+
+
+# =============================================================================
+# AGGREGATION & EXPOSITION
+# =============================================================================
+
+def collect():
+    """Merge the metric files of every worker process"""
+    _store.flush()
+    directory = _metrics_dir()
+    try:
+        filenames = [f for f in os.listdir(directory) if f.startswith('metrics_') and f.endswith('.json')]
+    except FileNotFoundError:
+        filenames = []
+
+    if _can_archive():
+        dead = [
+            f for f in filenames
+            if f != ARCHIVE_FILE and _file_pid(f) is not None and not _pid_alive(_file_pid(f))
+        ]
+        if dead:
+            try:
+                archive_files(directory, dead)
+                filenames = [f for f in filenames if f not in dead]
+            except OSError as e:
+                logger.warning(f"⚠️ Could not archive metrics of exited workers: {e}")
+
+    totals = _empty()
+    for filename in filenames:
+        data = _read(os.path.join(directory, filename))
+        if data is not None:
+            _merge(totals, data)
+
+    counters, gauges, histograms = totals['counters'], totals['gauges'], totals['histograms']
+    return counters, {k: v[0] for k, v in gauges.items()}, histograms
+
+
+def _login_attempt_gauges():
+    """Approximate lockout state from the (batched) LoginAttempt audit log"""
+    from datetime import timedelta
+    from django.db.models import Count
+    from django.utils import timezone
+    from .models import LoginAttempt
+
+    window_start = timezone.now() - timedelta(seconds=getattr(settings, 'LOGIN_LOCKOUT_WINDOW', 30 * 60))
+    max_failures = getattr(settings, 'LOGIN_MAX_FAILURES', 5)
+    failed = LoginAttempt.objects.filter(success=False, attempt_time__gte=window_start)
+    locked = failed.values('username').annotate(n=Count('id')).filter(n__gte=max_failures).count()
+    return {
+        _key('login_failed_attempts_window', None): failed.count(),
+        _key('login_locked_out_usernames', None): locked,
+    }
+
+
+def _cache_ratio_gauges(counters):
+    totals = {}
+    for key, value in counters.items():
+        name, labels = json.loads(key)
+        if name != 'cache_requests_total':
+            continue
+        labels = dict(labels)
+        hits, total = totals.get(labels['cache'], (0, 0))
+        if labels['result'] == 'hit':
+            hits += value
+        totals[labels['cache']] = (hits, total + value)
+    return {
+        _key('cache_hit_ratio', {'cache': cache}): (hits / total if total else 0.0)
+        for cache, (hits, total) in totals.items()
+    }
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels) + '}'
+
+
+def _format_value(value):
+    if isinstance(value, float) and value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus():
+    """Render every metric in the Prometheus text exposition format (0.0.4)"""
+    counters, gauges, histograms = collect()
+    gauges.update(_cache_ratio_gauges(counters))
+    try:
+        gauges.update(_login_attempt_gauges())
+    except Exception as e:
+        logger.error(f"❌ Error reading login attempt gauges: {e}")
+
+    samples = {}
+    for source in (counters, gauges):
+        for key, value in source.items():
+            name, labels = json.loads(key)
+            samples.setdefault(name, []).append((labels, value))
+
+    lines = []
+    for name in sorted(set(samples) | {json.loads(k)[0] for k in histograms}):
+        metric_type, help_text = METRIC_HELP.get(name, ('untyped', name))
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {metric_type}')
+        for labels, value in sorted(samples.get(name, []), key=lambda s: s[0]):
+            lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        for key in sorted(k for k in histograms if json.loads(k)[0] == name):
+            labels = json.loads(key)[1]
+            hist = histograms[key]
+            for bound, count in zip(hist['le'], hist['buckets']):
+                lines.append(f'{name}_bucket{_format_labels(labels + [["le", str(bound)]])} {count}')
+            lines.append(f'{name}_bucket{_format_labels(labels + [["le", "+Inf"]])} {hist["count"]}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(float(hist["sum"]))}')
+            lines.append(f'{name}_count{_format_labels(labels)} {hist["count"]}')
+
+    return '\n'.join(lines) + '\n'
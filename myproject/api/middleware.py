@@ -1,7 +1,12 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connection
 from django.http import JsonResponse
+from django.utils.cache import patch_vary_headers
 from django.utils.deprecation import MiddlewareMixin
 from .models import SystemSettings
+from . import compression, metrics
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -56,4 +61,119 @@ class SystemStatusMiddleware(MiddlewareMixin):
             # If error checking status, allow request to proceed
             return None
         
-        return None
\ No newline at end of file
+        return None
+
+class AsyncCapableMiddleware:
+    """
+    Base for middleware that works in both sync (WSGI) and async (ASGI)
+    stacks, so async views aren't pushed back onto a thread
+    """
+    
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.handle(request)
+
+
+class MetricsMiddleware(AsyncCapableMiddleware):
+    """
+    Records request latency and database query counts per URL name
+    for the /api/metrics/ endpoint.
+    """
+    
+    SKIPPED_PREFIXES = ('/static/', '/media/')
+    
+    def handle(self, request):
+        if request.path.startswith(self.SKIPPED_PREFIXES):
+            return self.get_response(request)
+        
+        query_count = [0]
+        
+        def count_queries(execute, sql, params, many, context):
+            query_count[0] += 1
+            return execute(sql, params, many, context)
+        
+        start = time.perf_counter()
+        with connection.execute_wrapper(count_queries):
+            response = self.get_response(request)
+        self.record(request, time.perf_counter() - start, query_count[0])
+        return response
+    
+    async def __acall__(self, request):
+        if request.path.startswith(self.SKIPPED_PREFIXES):
+            return await self.get_response(request)
+        
+        # Async ORM queries run on another thread's connection; only latency is recorded
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        self.record(request, time.perf_counter() - start, None)
+        return response
+    
+    def record(self, request, duration, query_count):
+        match = getattr(request, 'resolver_match', None)
+        url_name = (match.url_name or match.view_name) if match else 'unresolved'
+        try:
+            metrics.record_request(url_name, request.method, duration, query_count)
+        except Exception as e:
+            logger.error(f"❌ Error recording request metrics: {e}")
+
+
+class CompressionMiddleware(AsyncCapableMiddleware):
+    """
+    Compress API JSON responses with brotli or gzip.
+    
+    Only bodies above COMPRESSION_MIN_SIZE whose content type is in
+    COMPRESSION_CONTENT_TYPES are compressed. Responses marked with
+    @cache_compressed reuse compressed bytes from the cache.
+    """
+    
+    def handle(self, request):
+        return self.process_response(request, self.get_response(request))
+    
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+    
+    def process_response(self, request, response):
+        if response.status_code != 200 or response.has_header('Content-Encoding'):
+            return response
+        if not compression.is_compressible_type(response.get('Content-Type')):
+            return response
+        
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = compression.negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if not encoding:
+            return response
+        
+        if response.streaming:
+            response.streaming_content = compression.compress_stream(response.streaming_content, encoding)
+            del response.headers['Content-Length']
+        else:
+            if len(response.content) < compression.min_size():
+                return response
+            
+            timeout = getattr(response, 'cache_compressed', None)
+            if timeout:
+                compressed = compression.compress_cached(response.content, encoding, timeout)
+            else:
+                compressed = compression.compress(response.content, encoding)
+            
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+        
+        # The body changed, so a strong ETag no longer matches it byte for byte
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        
+        return response
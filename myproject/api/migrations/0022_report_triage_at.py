@@ -0,0 +1,63 @@
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import Count
+
+# Frozen copy of the api/triage.py formula as of this migration
+SEVERITY_HOURS = {'low': 0, 'medium': 24, 'high': 72, 'critical': 168}
+HOURS_PER_VIOLATION = 12
+MAX_VIOLATION_HOURS = 120
+REPEAT_OFFENDER_THRESHOLD = 3
+REPEAT_OFFENDER_HOURS = 72
+
+
+def compute_triage_at(created_at, severity, violation_count):
+    hours = SEVERITY_HOURS.get(severity, SEVERITY_HOURS['medium'])
+    hours += min(violation_count * HOURS_PER_VIOLATION, MAX_VIOLATION_HOURS)
+    if violation_count >= REPEAT_OFFENDER_THRESHOLD:
+        hours += REPEAT_OFFENDER_HOURS
+    return created_at - timedelta(hours=hours)
+
+
+def backfill_triage_at(apps, schema_editor):
+    StudentViolationRecord = apps.get_model('api', 'StudentViolationRecord')
+    counts = dict(
+        StudentViolationRecord.objects.values_list('student_id').annotate(count=Count('id')).order_by()
+    )
+    for model_name in ('StudentReport', 'TeacherReport'):
+        model = apps.get_model('api', model_name)
+        reports = list(model.objects.only('id', 'created_at', 'severity', 'reported_student_id'))
+        for report in reports:
+            report.triage_at = compute_triage_at(
+                report.created_at, report.severity, counts.get(report.reported_student_id, 0)
+            )
+        model.objects.bulk_update(reports, ['triage_at'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0021_report_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentreport',
+            name='triage_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='teacherreport',
+            name='triage_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='studentreport',
+            index=models.Index(condition=models.Q(('is_archived', False), ('status__in', ['pending', 'under_review'])), fields=['triage_at', 'id'], name='student_report_queue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teacherreport',
+            index=models.Index(condition=models.Q(('is_archived', False), ('status__in', ['pending', 'under_review'])), fields=['triage_at', 'id'], name='teacher_report_queue_idx'),
+        ),
+        migrations.RunPython(backfill_triage_at, migrations.RunPython.noop),
+    ]
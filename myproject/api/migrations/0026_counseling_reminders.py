@@ -0,0 +1,24 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0025_job_progress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='counselinglog',
+            name='reminder_sent',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='counselinglog',
+            index=models.Index(condition=models.Q(('reminder_sent', False), ('status', 'scheduled')), fields=['scheduled_date'], name='counseling_log_reminder_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='counselingsession',
+            index=models.Index(condition=models.Q(('reminder_sent', False), ('status', 'scheduled')), fields=['scheduled_date'], name='session_reminder_idx'),
+        ),
+    ]
@@ -230,7 +230,35 @@ class ViolationType(models.Model):
     class Meta:
         ordering = ['category', 'name']
 
-class StudentReport(models.Model):
+# Columns that change without the report changing for the client (see api/triage.py)
+UNVERSIONED_REPORT_FIELDS = frozenset({'triage_at', 'updated_at'})
+
+
+class VersionedReportQuerySet(models.QuerySet):
+    """``update()`` increments ``version`` like every other report write (see api/concurrency.py)"""
+
+    def update(self, **kwargs):
+        if 'version' not in kwargs and set(kwargs) - UNVERSIONED_REPORT_FIELDS:
+            kwargs['version'] = models.F('version') + 1
+        return super().update(**kwargs)
+
+
+class VersionedReportMixin:
+    """``save()`` of an existing report increments ``version`` so stale If-Match checks fail"""
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if self._state.adding or (update_fields is not None and not set(update_fields) - UNVERSIONED_REPORT_FIELDS):
+            return super().save(*args, **kwargs)
+
+        self.version = models.F('version') + 1
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {'version'}
+        super().save(*args, **kwargs)
+        self.refresh_from_db(fields=['version'])
+
+
+class StudentReport(VersionedReportMixin, models.Model):
     """Reports submitted by students (self-reporting incidents they experienced or witnessed)"""
     REPORT_STATUS_CHOICES = [
         ('pending', 'Pending Review'),
@@ -351,6 +379,14 @@ class StudentReport(models.Model):
     # Review tracking
     is_reviewed = models.BooleanField(default=False)
     reviewed_at = models.DateTimeField(null=True, blank=True)
+    
+    # ✅ Optimistic locking: incremented on every update (see api/concurrency.py)
+    version = models.PositiveIntegerField(default=1)
+    
+    objects = VersionedReportQuerySet.as_manager()
+    
+    # ✅ Counselor queue ordering: earlier = more urgent (see api/triage.py)
+    triage_at = models.DateTimeField(null=True, blank=True)
 
     def is_self_report(self):
         """Check if this is a self-report"""
@@ -370,9 +406,16 @@ class StudentReport(models.Model):
     class Meta:
         db_table = 'student_reports'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['triage_at', 'id'],
+                name='student_report_queue_idx',
+                condition=models.Q(status__in=['pending', 'under_review'], is_archived=False),
+            ),
+        ]
 
 
-class TeacherReport(models.Model):
+class TeacherReport(VersionedReportMixin, models.Model):
     """Reports submitted by teachers about student violations"""
     REPORT_STATUS_CHOICES = [
         ('pending', 'Pending Review'),
@@ -498,6 +541,14 @@ class TeacherReport(models.Model):
     # Review tracking
     is_reviewed = models.BooleanField(default=False)
     reviewed_at = models.DateTimeField(null=True, blank=True)
+    
+    # ✅ Optimistic locking: incremented on every update (see api/concurrency.py)
+    version = models.PositiveIntegerField(default=1)
+    
+    objects = VersionedReportQuerySet.as_manager()
+    
+    # ✅ Counselor queue ordering: earlier = more urgent (see api/triage.py)
+    triage_at = models.DateTimeField(null=True, blank=True)
 
     def get_violation_name(self):
         """Get the violation name"""
@@ -511,6 +562,13 @@ class TeacherReport(models.Model):
     class Meta:
         db_table = 'teacher_reports'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['triage_at', 'id'],
+                name='teacher_report_queue_idx',
+                condition=models.Q(status__in=['pending', 'under_review'], is_archived=False),
+            ),
+        ]
 
 class ArchivedStudent(Student):
     """Proxy model for archived students"""
@@ -559,10 +617,19 @@ class CounselingLog(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     school_year = models.CharField(max_length=20)
+    reminder_sent = models.BooleanField(default=False)
     
     class Meta:
         ordering = ['-created_at']
         db_table = 'counseling_logs'
+        indexes = [
+            # ✅ Reminder dispatcher range scan (see api/reminders.py)
+            models.Index(
+                fields=['scheduled_date'],
+                name='counseling_log_reminder_idx',
+                condition=models.Q(status='scheduled', reminder_sent=False),
+            ),
+        ]
         
     def __str__(self):
         return f"{self.action_type} - {self.student.user.get_full_name()} by {self.counselor.user.get_full_name()}"
@@ -656,6 +723,14 @@ class CounselingSession(models.Model):
         ordering = ['-scheduled_date']
         verbose_name = 'Counseling Session'
         verbose_name_plural = 'Counseling Sessions'
+        indexes = [
+            # ✅ Reminder dispatcher range scan (see api/reminders.py)
+            models.Index(
+                fields=['scheduled_date'],
+                name='session_reminder_idx',
+                condition=models.Q(status='scheduled', reminder_sent=False),
+            ),
+        ]
     
     def __str__(self):
         report = self.get_report()
@@ -852,17 +927,21 @@ class StudentViolationRecord(models.Model):
     recorded_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    @staticmethod
+    def default_school_year():
+        """School year of today's date (school years start in June)"""
+        from datetime import datetime
+        current_year = datetime.now().year
+        current_month = datetime.now().month
+        # School year starts in June (month 6)
+        if current_month >= 6:
+            return f"{current_year}-{current_year + 1}"
+        return f"{current_year - 1}-{current_year}"
+
     def save(self, *args, **kwargs):
         """Auto-populate school_year if not set"""
         if not self.school_year:
-            from datetime import datetime
-            current_year = datetime.now().year
-            current_month = datetime.now().month
-            # School year starts in June (month 6)
-            if current_month >= 6:
-                self.school_year = f"{current_year}-{current_year + 1}"
-            else:
-                self.school_year = f"{current_year - 1}-{current_year}"
+            self.school_year = self.default_school_year()
         super().save(*args, **kwargs)
 
     @classmethod
@@ -982,6 +1061,112 @@ class StudentViolationTally(models.Model):
         
         self.save()
     
+    SEVERITY_FIELDS = {
+        'Low': 'low_severity_count',
+        'Medium': 'medium_severity_count',
+        'High': 'high_severity_count',
+        'Critical': 'critical_severity_count',
+    }
+
+    CATEGORY_FIELDS = {
+        'Tardiness': 'tardiness_violations',
+        'Using Vape/Cigarette': 'using_vape_cigarette_violations',
+        'Misbehavior': 'misbehavior_violations',
+        'Bullying': 'bullying_violations',
+        'Gambling': 'gambling_violations',
+        'Haircut': 'haircut_violations',
+        'Not Wearing Proper Uniform/ID': 'not_wearing_uniform_violations',
+        'Cheating': 'cheating_violations',
+        'Cutting Classes': 'cutting_classes_violations',
+        'Absenteeism': 'absenteeism_violations',
+        'Others': 'other_violations',
+    }
+
+    @classmethod
+    def _count_expressions(cls):
+        """Aggregates over ``StudentViolationRecord`` that give each counter ``update_counts()`` fills"""
+        counts = {
+            'total_violations': models.Count('id'),
+            'active_violations': models.Count('id', filter=models.Q(status='active')),
+            'resolved_violations': models.Count('id', filter=models.Q(status='resolved')),
+        }
+        for level, field in cls.SEVERITY_FIELDS.items():
+            counts[field] = models.Count('id', filter=models.Q(violation_type__severity_level=level))
+        for category, field in cls.CATEGORY_FIELDS.items():
+            counts[field] = models.Count('id', filter=models.Q(violation_type__category=category))
+        counts['first_violation_date'] = models.Min('incident_date')
+        counts['last_violation_date'] = models.Max('incident_date')
+        return counts
+
+    @classmethod
+    def record_violations(cls, students, violation_type, incident_date, status='active'):
+        """
+        Count one new ``violation_type`` violation for each student, after
+        its record was saved, without recalculating: existing tallies get
+        set-based increments, and missing ones are built from one grouped
+        aggregate over the students' records (so earlier records count too).
+        The query count doesn't grow with students.
+        """
+        counters = ['total_violations']
+        if status == 'active':
+            counters.append('active_violations')
+        elif status == 'resolved':
+            counters.append('resolved_violations')
+        for field in (cls.SEVERITY_FIELDS.get(violation_type.severity_level),
+                      cls.CATEGORY_FIELDS.get(violation_type.category)):
+            if field:
+                counters.append(field)
+
+        student_ids = [student.id for student in students]
+        existing = set(cls.objects.filter(student_id__in=student_ids).values_list('student_id', flat=True))
+
+        if existing:
+            cls.objects.filter(student_id__in=existing).update(
+                last_violation_date=models.Case(
+                    models.When(
+                        models.Q(last_violation_date__isnull=True) | models.Q(last_violation_date__lt=incident_date),
+                        then=models.Value(incident_date)
+                    ),
+                    default=models.F('last_violation_date')
+                ),
+                first_violation_date=models.Case(
+                    models.When(
+                        models.Q(first_violation_date__isnull=True) | models.Q(first_violation_date__gt=incident_date),
+                        then=models.Value(incident_date)
+                    ),
+                    default=models.F('first_violation_date')
+                ),
+                last_updated=timezone.now(),
+                **{field: models.F(field) + 1 for field in counters}
+            )
+            for field, attribute in (('current_grade_violations', 'grade_level'), ('current_strand_violations', 'strand')):
+                ids = [student.id for student in students if getattr(student, attribute) and student.id in existing]
+                if ids:
+                    cls.objects.filter(student_id__in=ids).update(**{field: models.F(field) + 1})
+
+        missing = [student for student in students if student.id not in existing]
+        if not missing:
+            return
+
+        # ✅ Same numbers update_counts() would compute, for all missing students in one query
+        totals = {
+            row.pop('student_id'): row
+            for row in StudentViolationRecord.objects.filter(
+                student_id__in=[student.id for student in missing]
+            ).values('student_id').annotate(**cls._count_expressions())
+        }
+        tallies = []
+        for student in missing:
+            row = totals.get(student.id, {})
+            total = row.get('total_violations', 0)
+            tallies.append(cls(
+                student=student,
+                current_grade_violations=total if student.grade_level else 0,
+                current_strand_violations=total if student.strand else 0,
+                **row
+            ))
+        cls.objects.bulk_create(tallies)
+
     def get_violation_summary(self):
         """Get a summary of violations for display"""
         return {
@@ -1202,10 +1387,10 @@ class SystemSettings(models.Model):
         pass
 
 class LoginAttempt(models.Model):
-    """Track login attempts to prevent brute force attacks"""
+    """Audit log of login attempts (written in batches by api/audit.py; lockouts use api/ratelimit.py)"""
     username = models.CharField(max_length=150, db_index=True)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
-    attempt_time = models.DateTimeField(auto_now_add=True)
+    attempt_time = models.DateTimeField(default=timezone.now, db_index=True)
     success = models.BooleanField(default=False)
     
     class Meta:
@@ -1264,4 +1449,123 @@ class LoginAttempt(models.Model):
         """Clear attempts older than 30 minutes"""
         thirty_mins_ago = timezone.now() - timedelta(minutes=30)
         deleted_count = cls.objects.filter(attempt_time__lt=thirty_mins_ago).delete()[0]
-        return deleted_count
\ No newline at end of file
+        return deleted_count
+    
+    @classmethod
+    def purge_older_than(cls, days):
+        """Delete audit rows older than the retention period"""
+        cutoff = timezone.now() - timedelta(days=days)
+        return cls.objects.filter(attempt_time__lt=cutoff).delete()[0]
+class ResourceVersion(models.Model):
+    """
+    Cheap version stamp per resource (e.g. 'violation_type', 'student').
+    Bumped on every change so read endpoints can answer conditional GETs
+    with 304 Not Modified without re-serializing anything.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    version = models.PositiveBigIntegerField(default=1)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'resource_versions'
+    
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+    
+    @classmethod
+    def bump(cls, name):
+        """Increment the version of a resource (creates it on first use)"""
+        updated = cls.objects.filter(name=name).update(
+            version=models.F('version') + 1,
+            updated_at=timezone.now()
+        )
+        if not updated:
+            cls.objects.get_or_create(name=name)
+    
+    @classmethod
+    def get_stamps(cls, names):
+        """Return {name: (version, updated_at)} for the given resources in one query"""
+        return {
+            row['name']: (row['version'], row['updated_at'])
+            for row in cls.objects.filter(name__in=names).values('name', 'version', 'updated_at')
+        }
+
+
+class IdempotencyKey(models.Model):
+    """
+    Stored result of a write request sent with an ``Idempotency-Key`` header,
+    replayed when the client retries the same request. ``status_code`` is
+    null while the first request is still running. Bodies are zlib-compressed.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='idempotency_keys')
+    key = models.CharField(max_length=255)
+    endpoint = models.CharField(max_length=100)
+    request_hash = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.BinaryField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    class Meta:
+        db_table = 'idempotency_keys'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='unique_idempotency_key_per_user'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_id}:{self.key} ({self.endpoint})"
+    
+    @classmethod
+    def purge_expired(cls, ttl_seconds):
+        """Delete keys older than the TTL; returns the number removed"""
+        cutoff = timezone.now() - timedelta(seconds=ttl_seconds)
+        return cls.objects.filter(created_at__lt=cutoff).delete()[0]
+
+
+class Job(models.Model):
+    """
+    Background job run by ``manage.py run_worker`` (see api/jobs.py).
+
+    A worker claims a job by setting it to ``running`` with ``locked_until``
+    one visibility timeout ahead; if the worker dies the lock expires and
+    another worker picks the job up again. Failed attempts are retried with
+    backoff by moving ``run_at`` forward until ``max_attempts`` is reached.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+    
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    last_error = models.TextField(blank=True)
+    result = models.JSONField(null=True, blank=True)
+    # Set by long tasks as they go (e.g. processed / total / errors of a rollover)
+    progress = models.JSONField(null=True, blank=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs')
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'jobs'
+        ordering = ['run_at']
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='job_ready_idx'),
+            models.Index(fields=['status', 'locked_until'], name='job_lock_idx'),
+        ]
+    
+    def __str__(self):
+        return f"#{self.id} {self.task} ({self.status})"
+    
+    @classmethod
+    def purge_finished(cls, days):
+        """Delete succeeded/failed jobs finished more than ``days`` ago; returns the number removed"""
+        cutoff = timezone.now() - timedelta(days=days)
+        return cls.objects.filter(status__in=['succeeded', 'failed'], finished_at__lt=cutoff).delete()[0]
@@ -0,0 +1,92 @@
+"""
+Concurrent execution of independent read-only queries.
+
+Composite endpoints (the counselor dashboard) run a dozen or more aggregates
+that don't depend on each other; one after another, their latency adds up.
+``gather(name=callable, ...)`` runs the callables on a bounded thread pool
+and returns ``{name: result}``::
+
+    counts = parallel.gather(
+        students=students.count,
+        recent=lambda: list(violations.order_by('-incident_date')[:10]),
+    )
+
+Each callable must evaluate its query itself (``.count``, ``list(...)``):
+a lazy QuerySet returned from the pool would run on the caller's thread.
+
+Django connections are per thread, so every pool thread queries on its own
+connection. ``close_old_connections()`` runs around each call as it does
+around a request, so those connections follow CONN_MAX_AGE (and are closed
+after every call when it is 0). A process therefore opens at most
+PARALLEL_QUERY_WORKERS extra connections; size the database's connection
+limit (or pgbouncer pool) for that.
+
+Callables run sequentially on the caller's thread when the pool is
+disabled (PARALLEL_QUERY_WORKERS <= 1), from inside a pool thread (no
+nested waits on the same pool) and inside ``transaction.atomic()``: other
+connections can't see that transaction's uncommitted rows. Queries on
+different connections don't share a snapshot, which is fine for dashboard
+counts but not for figures that must add up exactly.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+DEFAULT_WORKERS = 4
+
+_local = threading.local()
+_lock = threading.Lock()
+_pool = None
+_pool_pid = None
+
+
+def workers():
+    return getattr(settings, 'PARALLEL_QUERY_WORKERS', DEFAULT_WORKERS)
+
+
+def _executor():
+    global _pool, _pool_pid
+    with _lock:
+        # gunicorn forks after import: each worker needs its own threads
+        if _pool_pid != os.getpid():
+            _pool_pid = os.getpid()
+            _pool = ThreadPoolExecutor(max_workers=workers(), thread_name_prefix='parallel-query')
+        return _pool
+
+
+def _sequential():
+    return workers() <= 1 or getattr(_local, 'in_pool', False) or connection.in_atomic_block
+
+
+def _call(fn, execute_wrappers):
+    _local.in_pool = True
+    close_old_connections()
+    try:
+        # Keep the caller's wrappers (MetricsMiddleware's query counter) on this thread's connection
+        with ExitStack() as stack:
+            for wrapper in execute_wrappers:
+                stack.enter_context(connection.execute_wrapper(wrapper))
+            return fn()
+    finally:
+        close_old_connections()
+
+
+def gather(**queries):
+    """Run independent read-only callables concurrently; returns {name: result}"""
+    if len(queries) < 2 or _sequential():
+        return {name: fn() for name, fn in queries.items()}
+
+    pool = _executor()
+    execute_wrappers = list(connection.execute_wrappers)
+    futures = {name: pool.submit(_call, fn, execute_wrappers) for name, fn in queries.items()}
+    try:
+        return {name: future.result() for name, future in futures.items()}
+    finally:
+        # After a failure, drop the calls that haven't started
+        for future in futures.values():
+            future.cancel()
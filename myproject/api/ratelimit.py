@@ -0,0 +1,157 @@
+"""
+Cache-backed login rate limiting.
+
+Failed logins are counted per username and per client IP in fixed windows
+of ``LOGIN_LOCKOUT_WINDOW`` seconds. The count used for decisions is a
+sliding-window estimate: the current window plus the previous one weighted
+by how much of it still overlaps the last ``LOGIN_LOCKOUT_WINDOW`` seconds.
+Crossing ``LOGIN_MAX_FAILURES`` locks the username: a lock key that expires
+after ``LOGIN_LOCKOUT_SECONDS``.
+
+The per-IP limit is only a soft throttle with a high threshold
+(``LOGIN_IP_MAX_FAILURES``): a whole school can share one NAT address, so it
+never locks anything, it just turns logins from that address away while the
+estimate is over the limit. The address is the one our own proxies saw
+(``client_ip()``), never the client-supplied part of X-Forwarded-For.
+
+``status()`` reads the lock and counter keys with a single ``get_many``, so
+checking a login costs one cache round trip instead of queries against
+``login_attempts``. Counters and locks live in the default cache, which
+must be shared by every worker (the file cache by default) or each worker
+would allow its own ``LOGIN_MAX_FAILURES`` guesses; the api.W001 system
+check warns about a per-process cache outside DEBUG.
+"""
+
+import hashlib
+import math
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+
+DEFAULT_WINDOW = 30 * 60
+DEFAULT_MAX_FAILURES = 5
+DEFAULT_IP_MAX_FAILURES = 200
+DEFAULT_LOCKOUT_SECONDS = 30 * 60
+DEFAULT_TRUSTED_PROXY_COUNT = 1
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _ident(value):
+    # Hash so any username is a safe cache key
+    return hashlib.sha1(str(value).encode('utf-8')).hexdigest()
+
+
+def client_ip(request):
+    """
+    The address that connected to our outermost proxy: the
+    ``TRUSTED_PROXY_COUNT``-th X-Forwarded-For entry from the right, as
+    entries to the left of it are whatever the client sent.
+    """
+    proxies = _setting('TRUSTED_PROXY_COUNT', DEFAULT_TRUSTED_PROXY_COUNT)
+    forwarded = [part.strip() for part in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if part.strip()]
+    if proxies and len(forwarded) >= proxies:
+        return forwarded[-proxies]
+    return request.META.get('REMOTE_ADDR') or None
+
+
+@dataclass
+class LoginStatus:
+    locked: bool
+    failures: int
+    seconds_remaining: int = 0
+    # Too many failures from the client's address (not a lockout)
+    throttled: bool = False
+
+    @property
+    def minutes_remaining(self):
+        return math.ceil(self.seconds_remaining / 60)
+
+
+class LoginRateLimiter:
+    def __init__(self, prefix='login'):
+        self.prefix = prefix
+
+    @property
+    def window(self):
+        return _setting('LOGIN_LOCKOUT_WINDOW', DEFAULT_WINDOW)
+
+    @property
+    def max_failures(self):
+        return _setting('LOGIN_MAX_FAILURES', DEFAULT_MAX_FAILURES)
+
+    @property
+    def ip_max_failures(self):
+        return _setting('LOGIN_IP_MAX_FAILURES', DEFAULT_IP_MAX_FAILURES)
+
+    @property
+    def lockout_seconds(self):
+        return _setting('LOGIN_LOCKOUT_SECONDS', DEFAULT_LOCKOUT_SECONDS)
+
+    def _lock_key(self, scope, value):
+        return f'{self.prefix}:lock:{scope}:{_ident(value)}'
+
+    def _counter_keys(self, scope, value, now):
+        window_index = int(now // self.window)
+        base = f'{self.prefix}:fail:{scope}:{_ident(value)}'
+        return f'{base}:{window_index}', f'{base}:{window_index - 1}'
+
+    def _estimate(self, current, previous, now):
+        elapsed = (now % self.window) / self.window
+        return current + previous * (1 - elapsed)
+
+    def status(self, username, ip_address=None):
+        """Lockout/throttle state for this username/IP, from one cache read"""
+        now = time.time()
+        user_keys = self._counter_keys('user', username, now)
+        keys = [self._lock_key('user', username), *user_keys]
+        ip_keys = self._counter_keys('ip', ip_address, now) if ip_address else ()
+        keys.extend(ip_keys)
+
+        values = cache.get_many(keys)
+        failures = int(self._estimate(values.get(user_keys[0], 0), values.get(user_keys[1], 0), now))
+
+        unlock_at = values.get(self._lock_key('user', username), 0)
+        if unlock_at > now:
+            return LoginStatus(True, failures, int(unlock_at - now))
+
+        if ip_keys:
+            ip_failures = self._estimate(values.get(ip_keys[0], 0), values.get(ip_keys[1], 0), now)
+            if ip_failures >= self.ip_max_failures:
+                # The estimate decays as the window moves on; suggest the end of this one
+                return LoginStatus(False, failures, int(self.window - now % self.window), throttled=True)
+        return LoginStatus(False, failures)
+
+    def _incr(self, key):
+        cache.add(key, 0, self.window * 2)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # Expired between add() and incr()
+            cache.set(key, 1, self.window * 2)
+            return 1
+
+    def record_failure(self, username, ip_address=None):
+        """Count a failed login; returns the username's failures in the window"""
+        now = time.time()
+        if ip_address:
+            self._incr(self._counter_keys('ip', ip_address, now)[0])
+
+        current_key, previous_key = self._counter_keys('user', username, now)
+        current = self._incr(current_key)
+        failures = self._estimate(current, cache.get(previous_key, 0), now)
+        if failures >= self.max_failures:
+            cache.set(self._lock_key('user', username), now + self.lockout_seconds, self.lockout_seconds)
+        return int(failures)
+
+    def reset(self, username):
+        """Forget a username's failures after a successful login"""
+        now = time.time()
+        cache.delete_many([self._lock_key('user', username), *self._counter_keys('user', username, now)])
+
+
+login_limiter = LoginRateLimiter()
@@ -0,0 +1,144 @@
+"""
+Counseling reminder dispatcher (run by ``manage.py send_counseling_reminders``).
+
+Finds scheduled ``CounselingSession``s and ``CounselingLog``s whose
+``scheduled_date`` falls within the next window and that haven't had a
+reminder yet. The lookup is a range scan on a partial index over
+``scheduled_date`` (``status='scheduled' AND reminder_sent=false``), so sent
+and finished rows cost nothing. Each batch is handled in one transaction:
+one SELECT of the due rows with their recipients, one ``bulk_create`` of
+the reminder notifications, and one UPDATE setting ``reminder_sent``. On
+PostgreSQL the batch is locked with SKIP LOCKED so overlapping runs never
+remind twice.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import metrics
+from .models import CounselingLog, CounselingSession, Notification
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW_HOURS = 24
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _format_date(value):
+    return timezone.localtime(value).strftime('%B %d, %Y at %I:%M %p')
+
+
+def _session_notifications(row):
+    when = _format_date(row['scheduled_date'])
+    related = {
+        'related_student_report_id': row['student_report_id'],
+        'related_teacher_report_id': row['teacher_report_id'],
+    }
+    recipients = {row['counselor__user_id']: (
+        '⏰ Upcoming Counseling Session',
+        f'Reminder: you have a counseling session scheduled on {when}.',
+    )}
+    for user_id in (row['reporter_student__user_id'], row['reported_student__user_id']):
+        if user_id and user_id not in recipients:
+            recipients[user_id] = (
+                '⏰ Counseling Session Reminder',
+                f'Reminder: please report to the Guidance Office for your counseling session on {when}.',
+            )
+    return [
+        Notification(user_id=user_id, title=title, message=message, type='reminder', **related)
+        for user_id, (title, message) in recipients.items()
+        if user_id
+    ]
+
+
+def _log_notifications(row):
+    when = _format_date(row['scheduled_date'])
+    notifications = [
+        Notification(
+            user_id=row['student__user_id'],
+            title='⏰ Counseling Session Reminder',
+            message=f"Reminder: your {row['action_type']} with the Guidance Office is scheduled on {when}.",
+            type='reminder',
+        )
+    ]
+    if row['counselor__user_id'] != row['student__user_id']:
+        notifications.append(Notification(
+            user_id=row['counselor__user_id'],
+            title='⏰ Upcoming Counseling Session',
+            message=f"Reminder: {row['action_type']} scheduled on {when}.",
+            type='reminder',
+        ))
+    return [notification for notification in notifications if notification.user_id]
+
+
+# model -> (fields read for the message, builder)
+SOURCES = {
+    CounselingSession: (
+        ('id', 'scheduled_date', 'counselor__user_id', 'reporter_student__user_id',
+         'reported_student__user_id', 'student_report_id', 'teacher_report_id'),
+        _session_notifications,
+    ),
+    CounselingLog: (
+        ('id', 'scheduled_date', 'action_type', 'counselor__user_id', 'student__user_id'),
+        _log_notifications,
+    ),
+}
+
+
+def due(model, now, window):
+    return model.objects.filter(
+        status='scheduled',
+        reminder_sent=False,
+        scheduled_date__gte=now,
+        scheduled_date__lt=now + window,
+    )
+
+
+def _dispatch_batch(model, now, window, batch_size, dry_run):
+    fields, build = SOURCES[model]
+    with transaction.atomic():
+        rows = due(model, now, window).order_by('scheduled_date')
+        if connection.features.has_select_for_update_skip_locked:
+            rows = rows.select_for_update(skip_locked=True, of=('self',))
+        rows = list(rows.values(*fields)[:batch_size])
+        if not rows:
+            return 0, 0
+
+        notifications = [notification for row in rows for notification in build(row)]
+        if dry_run:
+            transaction.set_rollback(True)
+            return len(rows), len(notifications)
+
+        Notification.objects.bulk_create(notifications, batch_size=500)
+        model.objects.filter(id__in=[row['id'] for row in rows]).update(reminder_sent=True)
+    return len(rows), len(notifications)
+
+
+def dispatch_due(window_hours=None, batch_size=None, dry_run=False):
+    """
+    Send reminders for everything scheduled within the next ``window_hours``;
+    returns {model name: (rows reminded, notifications created)}
+    """
+    window = timedelta(hours=window_hours or getattr(settings, 'COUNSELING_REMINDER_WINDOW_HOURS', DEFAULT_WINDOW_HOURS))
+    batch_size = batch_size or getattr(settings, 'COUNSELING_REMINDER_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    now = timezone.now()
+
+    totals = {}
+    for model in SOURCES:
+        reminded = created = 0
+        while True:
+            rows, notifications = _dispatch_batch(model, now, window, batch_size, dry_run)
+            reminded += rows
+            created += notifications
+            # A dry run doesn't mark rows, so the next batch would be the same one
+            if rows < batch_size or dry_run:
+                break
+        totals[model.__name__] = (reminded, created)
+        if created and not dry_run:
+            logger.info(f"✅ Sent {created} reminders for {reminded} {model._meta.verbose_name_plural}")
+            metrics.record_notification_fanout('counseling_reminder', created)
+    return totals
@@ -0,0 +1,97 @@
+"""
+Fast JSON renderer and parser for Django REST Framework.
+
+Uses ``orjson`` when it is installed and falls back to the standard library
+otherwise. Both paths serialize ``datetime``/``date``/``time`` values with
+``isoformat()`` so views can put model datetimes straight into the response
+dict instead of converting every field by hand.
+"""
+
+import datetime
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder as DRFJSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the deployment
+    orjson = None
+
+
+class ISOFormatJSONEncoder(DRFJSONEncoder):
+    """DRF's encoder, but with the same datetime format as ``.isoformat()``"""
+
+    def default(self, obj):
+        if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+            return obj.isoformat()
+        return super().default(obj)
+
+
+_fallback_encoder = ISOFormatJSONEncoder()
+
+
+def _orjson_default(obj):
+    # orjson handles datetimes, dates, UUIDs and dataclasses itself; anything
+    # else (Decimal, lazy translation strings, querysets, ...) goes through DRF
+    return _fallback_encoder.default(obj)
+
+
+def use_fast_json():
+    return orjson is not None and getattr(settings, 'FAST_JSON_ENABLED', True)
+
+
+def dumps(data, indent=False):
+    """Encode ``data`` to UTF-8 JSON bytes"""
+    if use_fast_json():
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_orjson_default, option=option)
+    return json.dumps(
+        data,
+        cls=ISOFormatJSONEncoder,
+        ensure_ascii=False,
+        indent=2 if indent else None,
+        separators=None if indent else (',', ':'),
+    ).encode('utf-8')
+
+
+def loads(data):
+    """Decode JSON from bytes or str"""
+    if use_fast_json():
+        return orjson.loads(data)
+    if isinstance(data, bytes):
+        data = data.decode('utf-8')
+    return json.loads(data)
+
+
+class FastJSONRenderer(BaseRenderer):
+    """Drop-in replacement for ``rest_framework.renderers.JSONRenderer``"""
+
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = False
+        if accepted_media_type and 'indent=' in accepted_media_type:
+            indent = True
+        return dumps(data, indent=indent)
+
+
+class FastJSONParser(BaseParser):
+    """Drop-in replacement for ``rest_framework.parsers.JSONParser``"""
+
+    media_type = 'application/json'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return loads(stream.read())
+        except ValueError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
@@ -0,0 +1,213 @@
+"""
+School year rollover and bulk grade promotion, run in resumable chunks.
+
+Students are processed in id order, ``ROLLOVER_CHUNK_SIZE`` per
+transaction. Progress (processed / total / errors and the last student id
+done) is saved in the same transaction as the chunk it describes, so after
+a crash or a failed job attempt the run continues exactly where the last
+committed chunk ended. Students already moved to the target school year are
+skipped, which makes re-running a finished rollover harmless.
+
+The same engine runs as a background job (``school_year.rollover`` and
+``school_year.bulk_promote`` in api/tasks.py) with ``JobProgress``, and
+from ``manage.py rollover_school_year`` with ``Progress``.
+"""
+
+import logging
+from datetime import datetime
+
+from django.conf import settings
+from django.db import transaction
+
+from . import jobs, metrics
+from .models import Student, StudentSchoolYearHistory
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 200
+MAX_STORED_ERRORS = 100
+
+
+def default_school_year():
+    """School year starting in June of the current year (or the previous one before June)"""
+    now = datetime.now()
+    return f"{now.year}-{now.year + 1}" if now.month >= 6 else f"{now.year - 1}-{now.year}"
+
+
+def next_grade(grade_level):
+    if grade_level and grade_level.isdigit() and int(grade_level) < 12:
+        return str(int(grade_level) + 1)
+    return grade_level
+
+
+class JobLost(Exception):
+    """This job's lock expired and another worker took it over"""
+
+
+class Progress:
+    """Counters of a run; ``cursor`` is the id of the last student done"""
+
+    def __init__(self, state=None):
+        state = state or {}
+        self.total = state.get('total')
+        self.processed = state.get('processed', 0)
+        self.cursor = state.get('cursor', 0)
+        self.error_count = state.get('error_count', 0)
+        self.errors = state.get('errors', [])
+        self.counts = state.get('counts', {})
+
+    def count(self, name):
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def add_error(self, student_id, error):
+        self.error_count += 1
+        if len(self.errors) < MAX_STORED_ERRORS:
+            self.errors.append(f"Error updating student {student_id}: {error}")
+
+    def as_dict(self):
+        return {
+            'total': self.total,
+            'processed': self.processed,
+            'cursor': self.cursor,
+            'error_count': self.error_count,
+            'errors': self.errors,
+            'counts': self.counts,
+        }
+
+    def save(self):
+        metrics.record_rollover_progress(self.processed, self.total or 0, self.error_count)
+
+
+class JobProgress(Progress):
+    """Progress stored on a ``Job`` (also extends the job's lock)"""
+
+    def __init__(self, job):
+        super().__init__(job.progress)
+        self.job = job
+
+    def save(self):
+        super().save()
+        if not jobs.touch(self.job, progress=self.as_dict()):
+            raise JobLost(f'Job {self.job.id} is no longer owned by this worker')
+
+
+def run(students, process, progress, dry_run=False):
+    """
+    Call ``process(student)`` for every student after ``progress.cursor``,
+    one transaction per chunk. ``process`` returns the name of a counter to
+    bump or ``None``; an exception only fails that student.
+    """
+    if progress.total is None:
+        progress.total = students.count()
+        progress.save()
+
+    chunk_size = getattr(settings, 'ROLLOVER_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+    while True:
+        chunk = list(students.filter(id__gt=progress.cursor).order_by('id')[:chunk_size])
+        if not chunk:
+            break
+
+        with transaction.atomic():
+            for student in chunk:
+                try:
+                    with transaction.atomic():
+                        counter = process(student)
+                    if counter:
+                        progress.count(counter)
+                except Exception as e:
+                    logger.error(f"❌ Error updating student {student.id}: {e}")
+                    progress.add_error(student.id, e)
+                progress.processed += 1
+                progress.cursor = student.id
+
+            if dry_run:
+                transaction.set_rollback(True)
+            else:
+                progress.save()
+        if dry_run:
+            progress.save()
+
+        # Bulk updates skip the model signals; publish the change once per chunk
+        if not dry_run:
+            from .violation_registry import bump
+            bump('student')
+            bump('school_year_history')
+            bump('profiles')
+
+    return progress
+
+
+def rollover(new_school_year, progress, dry_run=False):
+    """Archive every student's current year, promote them and enroll them in ``new_school_year``"""
+    students = Student.objects.select_related('user')
+
+    def process(student):
+        old_year = student.school_year or 'Unknown'
+        if old_year == new_school_year:
+            return 'skipped'
+
+        _, archived = StudentSchoolYearHistory.objects.get_or_create(
+            student=student,
+            school_year=old_year,
+            defaults={
+                'grade_level': student.grade_level,
+                'section': student.section,
+                'strand': student.strand,
+                'is_active': False,
+            }
+        )
+
+        new_grade = next_grade(student.grade_level)
+        # Note: Section stays same until adviser updates
+        Student.objects.filter(id=student.id).update(school_year=new_school_year, grade_level=new_grade)
+        StudentSchoolYearHistory.objects.get_or_create(
+            student=student,
+            school_year=new_school_year,
+            defaults={
+                'grade_level': new_grade,
+                'section': student.section,
+                'strand': student.strand,
+                'is_active': True,
+            }
+        )
+        if archived:
+            progress.count('history_archived')
+        return 'students_updated'
+
+    logger.info(f"{'🔍 DRY RUN' if dry_run else '🚀 EXECUTING'}: School Year Rollover to {new_school_year}")
+    return run(students, process, progress, dry_run)
+
+
+def bulk_promote(current_grade, current_school_year, new_school_year, progress, exclude_student_ids=()):
+    """Promote the active students of one grade (Grade 12 graduates), except the excluded ones"""
+    students = Student.objects.filter(
+        grade_level=current_grade,
+        school_year=current_school_year,
+        is_active=True,
+    ).exclude(id__in=exclude_student_ids)
+    graduating = current_grade.isdigit() and int(current_grade) >= 12
+
+    def process(student):
+        StudentSchoolYearHistory.objects.get_or_create(
+            student=student,
+            school_year=student.school_year,
+            defaults={
+                'grade_level': student.grade_level,
+                'section': student.section,
+                'strand': student.strand,
+                'is_active': False,
+            }
+        )
+        if graduating:
+            Student.objects.filter(id=student.id).update(
+                school_year=f"{new_school_year} - GRADUATED",
+                is_active=False,
+            )
+            return 'graduated'
+        Student.objects.filter(id=student.id).update(
+            grade_level=next_grade(current_grade),
+            school_year=new_school_year,
+        )
+        return 'promoted'
+
+    return run(students, process, progress)
@@ -0,0 +1,155 @@
+"""
+Keep ResourceVersion stamps and report triage priorities in sync with the
+models they describe.
+
+Profiles are versioned per user (``user:<id>``, see ``profile_resource``)
+rather than per table, so a save only invalidates the profile it belongs
+to, and saves that touch nothing but ``last_login`` (every login) bump
+nothing.
+
+Bulk ``queryset.update()``/``bulk_create()`` calls skip these signals, so code
+that writes rows that way must call ``ResourceVersion.bump()`` (plus
+``bump(PROFILES)`` for profile fields) or ``triage.refresh_for_students()``
+itself.
+
+Triage work only happens when its inputs change: a report's ``triage_at`` is
+recomputed when its severity, reported student or status (back into the
+queue) differs from what was loaded, and the student refresh is queued (see
+api/jobs.py) when a violation record is created, moved or deleted.
+"""
+
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+
+from . import jobs, triage
+from .models import (
+    ArchivedStudent, ArchivedStudentReport, ArchivedTeacher, ArchivedTeacherReport,
+    Student, StudentReport, StudentSchoolYearHistory, StudentViolationRecord,
+    SystemSettings, Teacher, TeacherReport, ViolationType,
+)
+
+# model -> resource name used by the conditional GET endpoints
+VERSIONED_MODELS = {
+    ViolationType: 'violation_type',
+    Student: 'student',
+    ArchivedStudent: 'student',
+    Teacher: 'teacher',
+    ArchivedTeacher: 'teacher',
+    StudentSchoolYearHistory: 'school_year_history',
+    SystemSettings: 'system_settings',
+}
+
+# model -> attribute holding the id of the user whose profile the row is part of
+PROFILE_MODELS = {
+    User: 'pk',
+    Student: 'user_id',
+    ArchivedStudent: 'user_id',
+    Teacher: 'user_id',
+    ArchivedTeacher: 'user_id',
+}
+
+# Bumped by bulk updates of profile fields (e.g. the school year rollover)
+PROFILES = 'profiles'
+
+# Saves limited to these fields change nothing a versioned response shows
+UNVERSIONED_FIELDS = frozenset({'last_login'})
+
+
+def profile_resource(user_id):
+    return f'user:{user_id}'
+
+
+def _bump_resource_version(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and update_fields <= UNVERSIONED_FIELDS:
+        return
+    from .violation_registry import bump
+    if sender in VERSIONED_MODELS:
+        bump(VERSIONED_MODELS[sender])
+    if sender in PROFILE_MODELS:
+        user_id = getattr(instance, PROFILE_MODELS[sender])
+        if user_id:
+            bump(profile_resource(user_id))
+
+
+def _connect(model):
+    label = model._meta.label_lower
+    post_save.connect(_bump_resource_version, sender=model, dispatch_uid=f'version_{label}_save')
+    post_delete.connect(_bump_resource_version, sender=model, dispatch_uid=f'version_{label}_delete')
+
+
+def connect_versioned_model(model, name):
+    """Bump ``name`` whenever a ``model`` row is saved or deleted (used by other apps too)"""
+    VERSIONED_MODELS[model] = name
+    _connect(model)
+
+
+# Report models whose triage_at is kept current (proxies send their own signals)
+TRIAGED_MODELS = (StudentReport, ArchivedStudentReport, TeacherReport, ArchivedTeacherReport)
+TRIAGE_INPUTS = {'severity', 'reported_student', 'reported_student_id', 'status', 'created_at'}
+# Values compared against the ones a report was loaded with
+TRACKED_TRIAGE_FIELDS = ('severity', 'reported_student_id', 'status')
+
+# A field that was deferred when the row was loaded
+_UNKNOWN = object()
+
+
+def _loaded_values(instance, fields):
+    # __dict__ so deferred fields aren't fetched one query at a time
+    return {field: instance.__dict__.get(field, _UNKNOWN) for field in fields}
+
+
+def _remember_triage_inputs(sender, instance, **kwargs):
+    instance._triage_loaded = _loaded_values(instance, TRACKED_TRIAGE_FIELDS)
+
+
+def _triage_inputs_changed(instance):
+    loaded = getattr(instance, '_triage_loaded', {})
+    for field in ('severity', 'reported_student_id'):
+        if loaded.get(field, _UNKNOWN) is _UNKNOWN or loaded[field] != getattr(instance, field):
+            return True
+    # Closed reports aren't kept current; recompute when one (re)enters the queue
+    status = loaded.get('status', _UNKNOWN)
+    return instance.status in triage.QUEUE_STATUSES and (status is _UNKNOWN or status != instance.status)
+
+
+def _set_triage_at(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not TRIAGE_INPUTS & set(update_fields):
+        return
+    if not instance._state.adding and not _triage_inputs_changed(instance):
+        # Saves that don't touch severity, student or status skip the COUNT
+        return
+    triage.set_triage_at(instance)
+
+
+def _remember_student(sender, instance, **kwargs):
+    instance._loaded_student_id = instance.__dict__.get('student_id')
+
+
+def _refresh_triage(student_ids):
+    jobs.enqueue('triage.refresh_for_students', {'student_ids': student_ids})
+
+
+def _refresh_triage_on_save(sender, instance, created, **kwargs):
+    # Only a new or moved record changes a student's violation count
+    previous = getattr(instance, '_loaded_student_id', None)
+    if created or previous != instance.student_id:
+        _refresh_triage([instance.student_id, previous])
+    instance._loaded_student_id = instance.student_id
+
+
+def _refresh_triage_on_delete(sender, instance, **kwargs):
+    _refresh_triage([instance.student_id])
+
+
+def connect_signals():
+    for model in {**VERSIONED_MODELS, **PROFILE_MODELS}:
+        _connect(model)
+
+    for model in TRIAGED_MODELS:
+        label = model._meta.label_lower
+        post_init.connect(_remember_triage_inputs, sender=model, dispatch_uid=f'triage_{label}_init')
+        pre_save.connect(_set_triage_at, sender=model, dispatch_uid=f'triage_{label}')
+        post_save.connect(_remember_triage_inputs, sender=model, dispatch_uid=f'triage_{label}_saved')
+    post_init.connect(_remember_student, sender=StudentViolationRecord, dispatch_uid='triage_violation_init')
+    post_save.connect(_refresh_triage_on_save, sender=StudentViolationRecord, dispatch_uid='triage_violation_save')
+    post_delete.connect(_refresh_triage_on_delete, sender=StudentViolationRecord, dispatch_uid='triage_violation_delete')
@@ -0,0 +1,103 @@
+"""
+Cached snapshots with stale-while-revalidate and single-flight recomputation.
+
+``get_snapshot(key, compute)`` returns ``(data, computed_at, is_stale)``:
+
+* fresh (younger than ``ttl``): served straight from the cache;
+* stale (older than ``ttl`` but within ``ttl + stale_ttl``): served as is, and
+  the first caller to grab the key's lock refreshes it in a background thread
+  while everyone else keeps getting the previous snapshot;
+* missing: one caller computes it inline while concurrent callers for the
+  same key wait briefly for that result instead of recomputing it.
+
+The lock uses ``cache.add()``, which is atomic on the shared backends, so
+coalescing spans gunicorn workers when CACHES points at a shared cache and
+stays per-process with the default local-memory cache.
+"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 60
+DEFAULT_STALE_TTL = 300
+DEFAULT_LOCK_TIMEOUT = 30
+WAIT_POLL_INTERVAL = 0.1
+
+
+def _lock_key(key):
+    return f'{key}:lock'
+
+
+def _store(key, data, ttl, stale_ttl):
+    entry = {'data': data, 'computed_at': timezone.now(), 'expires': time.time() + ttl}
+    cache.set(key, entry, ttl + stale_ttl)
+    return entry
+
+
+def _refresh_in_background(key, compute, ttl, stale_ttl):
+    def run():
+        try:
+            _store(key, compute(), ttl, stale_ttl)
+            logger.info(f"🔄 Refreshed snapshot {key}")
+        except Exception as e:
+            logger.error(f"❌ Error refreshing snapshot {key}: {e}")
+        finally:
+            cache.delete(_lock_key(key))
+            connection.close()
+
+    threading.Thread(target=run, name=f'snapshot-refresh:{key}', daemon=True).start()
+
+
+def get_snapshot(key, compute, ttl=None, stale_ttl=None, lock_timeout=None, background=True):
+    """Return ``(data, computed_at, is_stale)`` for ``key``"""
+    if ttl is None:
+        ttl = getattr(settings, 'SNAPSHOT_TTL', DEFAULT_TTL)
+    if stale_ttl is None:
+        stale_ttl = getattr(settings, 'SNAPSHOT_STALE_TTL', DEFAULT_STALE_TTL)
+    lock_timeout = lock_timeout or getattr(settings, 'SNAPSHOT_LOCK_TIMEOUT', DEFAULT_LOCK_TIMEOUT)
+
+    entry = cache.get(key)
+    if entry is not None:
+        metrics.record_cache('snapshot', True)
+        is_stale = time.time() >= entry['expires']
+        if is_stale and cache.add(_lock_key(key), 1, lock_timeout):
+            if background:
+                _refresh_in_background(key, compute, ttl, stale_ttl)
+            else:
+                try:
+                    entry = _store(key, compute(), ttl, stale_ttl)
+                    is_stale = False
+                finally:
+                    cache.delete(_lock_key(key))
+        return entry['data'], entry['computed_at'], is_stale
+
+    metrics.record_cache('snapshot', False)
+
+    # Cold key: only the lock holder computes; the others wait for its result
+    if not cache.add(_lock_key(key), 1, lock_timeout):
+        deadline = time.monotonic() + lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(WAIT_POLL_INTERVAL)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry['data'], entry['computed_at'], False
+            if cache.get(_lock_key(key)) is None:
+                break  # the holder failed; compute it ourselves
+        else:
+            logger.warning(f"⚠️ Timed out waiting for snapshot {key}; computing it here")
+
+    try:
+        entry = _store(key, compute(), ttl, stale_ttl)
+    finally:
+        cache.delete(_lock_key(key))
+    return entry['data'], entry['computed_at'], False
@@ -0,0 +1,81 @@
+"""
+Streaming JSON responses for large list endpoints.
+
+Instead of building the whole list of dicts and encoding it in one go, the
+queryset is walked with ``.iterator(chunk_size=...)`` and every serialized row
+is encoded and flushed in small buffers through ``StreamingHttpResponse``.
+Memory stays bounded by the chunk size rather than by the number of rows.
+"""
+
+import logging
+
+from django.http import StreamingHttpResponse
+
+from .renderers import dumps
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+# Flush the output buffer once it grows past this many bytes
+FLUSH_THRESHOLD = 64 * 1024
+
+
+def stream_json_list(queryset, serialize, items_key, counters=None, extra=None,
+                     chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield a JSON envelope of the form
+    ``{"<items_key>": [...], "count": n, <counters>..., <extra>..., "success": true}``.
+
+    ``serialize`` turns one model instance into a dict; rows that raise are
+    logged and skipped. ``counters`` maps an envelope key to a predicate that
+    is counted over the serialized rows (e.g. ``tallied_count``). The totals
+    are only known once the queryset is exhausted, so they are written after
+    the list.
+    """
+    counters = counters or {}
+    totals = {key: 0 for key in counters}
+    count = 0
+
+    buffer = [b'{' + dumps(items_key) + b':[']
+    buffered = len(buffer[0])
+    try:
+        for obj in queryset.iterator(chunk_size=chunk_size):
+            try:
+                data = serialize(obj)
+            except Exception as e:
+                logger.error(f"❌ Error serializing {items_key} row {getattr(obj, 'pk', None)}: {e}")
+                continue
+
+            encoded = dumps(data)
+            if count:
+                encoded = b',' + encoded
+            buffer.append(encoded)
+            buffered += len(encoded)
+            count += 1
+            for key, predicate in counters.items():
+                if predicate(data):
+                    totals[key] += 1
+
+            if buffered >= FLUSH_THRESHOLD:
+                yield b''.join(buffer)
+                buffer, buffered = [], 0
+
+        trailer = {'count': count, **totals, **(extra or {}), 'success': True}
+    except Exception as e:
+        # Headers are already sent, so report the failure inside the envelope
+        logger.error(f"❌ Error streaming {items_key}: {e}")
+        trailer = {'count': count, 'success': False, 'message': f'Error streaming {items_key}: {str(e)}'}
+
+    buffer.append(b'],' + dumps(trailer)[1:])
+    yield b''.join(buffer)
+    logger.info(f"✅ Streamed {count} {items_key}")
+
+
+def streaming_json_response(queryset, serialize, items_key, counters=None, extra=None,
+                            chunk_size=DEFAULT_CHUNK_SIZE, status=200):
+    """Wrap ``stream_json_list`` in a ``StreamingHttpResponse``"""
+    return StreamingHttpResponse(
+        stream_json_list(queryset, serialize, items_key, counters, extra, chunk_size),
+        content_type='application/json',
+        status=status,
+    )
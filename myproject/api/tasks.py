@@ -0,0 +1,68 @@
+"""
+Background job tasks (see api/jobs.py). Payloads hold ids, not model
+instances, so a job re-reads current rows when it runs.
+"""
+
+import logging
+
+from . import firebase, metrics, rollover, triage
+from .jobs import PermanentJobError, task
+from .models import Counselor, Notification
+
+logger = logging.getLogger(__name__)
+
+
+@task('notifications.notify_counselors')
+def notify_counselors(title, message, notification_type, fanout_source,
+                      related_student_report_id=None, related_teacher_report_id=None):
+    """One notification per counselor, in a single INSERT"""
+    counselor_user_ids = list(
+        Counselor.objects.filter(user__isnull=False).values_list('user_id', flat=True)
+    )
+    Notification.objects.bulk_create([
+        Notification(
+            user_id=user_id,
+            title=title,
+            message=message,
+            type=notification_type,
+            related_student_report_id=related_student_report_id,
+            related_teacher_report_id=related_teacher_report_id,
+        )
+        for user_id in counselor_user_ids
+    ])
+    logger.info(f"✅ Sent notifications to {len(counselor_user_ids)} counselors")
+    metrics.record_notification_fanout(fanout_source, len(counselor_user_ids))
+    return {'notified': len(counselor_user_ids)}
+
+
+@task('firebase.revoke_refresh_tokens')
+def revoke_firebase_refresh_tokens(uid):
+    backend = firebase.client()
+    try:
+        backend.revoke_refresh_tokens(uid)
+    except Exception as e:
+        if backend.is_permanent(e):
+            raise PermanentJobError(str(e)) from e
+        raise
+    logger.info(f"✅ Revoked Firebase refresh tokens for uid={uid}")
+    return {'uid': uid}
+
+
+@task('triage.refresh_for_students')
+def refresh_triage(student_ids):
+    return {'refreshed': triage.refresh_for_students(student_ids)}
+
+
+@task('school_year.rollover', bind=True, max_attempts=3, visibility_timeout=900)
+def rollover_school_year(job, new_school_year, dry_run=False):
+    progress = rollover.rollover(new_school_year, rollover.JobProgress(job), dry_run)
+    return progress.as_dict()
+
+
+@task('school_year.bulk_promote', bind=True, max_attempts=3, visibility_timeout=900)
+def bulk_promote_grade(job, current_grade, current_school_year, new_school_year, exclude_student_ids=()):
+    progress = rollover.bulk_promote(
+        current_grade, current_school_year, new_school_year,
+        rollover.JobProgress(job), exclude_student_ids,
+    )
+    return progress.as_dict()
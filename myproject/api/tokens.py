@@ -0,0 +1,155 @@
+"""
+Expiring, rotatable API tokens with cached validation.
+
+DRF's ``Token`` rows are reused as they are (one per user); a token is valid
+for ``TOKEN_TTL`` seconds after it was created. ``issue_token()`` hands out
+the user's current token on login and replaces it once it is older than
+``TOKEN_ROTATE_AFTER``; ``rotate_token()`` replaces it on demand.
+
+Validated tokens are cached under a SHA-256 digest of the key (never the key
+itself) for ``TOKEN_CACHE_TIMEOUT`` seconds, so authenticated requests don't
+query ``authtoken_token``. Revoking a token deletes the row and its cache
+entry and writes a revocation marker to the cache that
+``ExpiringTokenAuthentication`` checks in the same ``get_many``, so
+revocation is immediate in every worker sharing the cache. With a
+per-process cache backend (``cache_is_shared()`` is False) other workers
+would keep accepting a revoked token, so validation skips the cache and
+reads the token row every time instead.
+
+Issuing and rotating lock the user's row first, so concurrent logins of one
+user agree on a single token instead of racing to create the one row each
+user may have.
+"""
+
+import hashlib
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 30 * 24 * 60 * 60
+DEFAULT_ROTATE_AFTER = 7 * 24 * 60 * 60
+DEFAULT_CACHE_TIMEOUT = 300
+
+
+# Backends whose entries other processes can't see
+PER_PROCESS_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def cache_is_shared():
+    return settings.CACHES.get('default', {}).get('BACKEND', '') not in PER_PROCESS_CACHE_BACKENDS
+
+
+def ttl():
+    return getattr(settings, 'TOKEN_TTL', DEFAULT_TTL)
+
+
+def rotate_after():
+    return getattr(settings, 'TOKEN_ROTATE_AFTER', DEFAULT_ROTATE_AFTER)
+
+
+def cache_timeout():
+    return getattr(settings, 'TOKEN_CACHE_TIMEOUT', DEFAULT_CACHE_TIMEOUT)
+
+
+def digest(key):
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def entry_key(token_digest):
+    return f'auth_token:{token_digest}'
+
+
+def revoked_key(token_digest):
+    return f'auth_token_revoked:{token_digest}'
+
+
+def expires_at(token):
+    return token.created + timedelta(seconds=ttl())
+
+
+def is_expired(token):
+    return timezone.now() >= expires_at(token)
+
+
+def cache_token(token):
+    """Cache a validated token (with its user) until it expires or the cache timeout"""
+    if not cache_is_shared():
+        return
+    remaining = int((expires_at(token) - timezone.now()).total_seconds())
+    timeout = min(cache_timeout(), remaining)
+    if timeout > 0:
+        cache.set(entry_key(digest(token.key)), token, timeout)
+
+
+def revoke_keys(keys):
+    """Drop cached copies of these token keys and blacklist them in the cache"""
+    digests = [digest(key) for key in keys]
+    if not digests:
+        return
+    cache.delete_many([entry_key(token_digest) for token_digest in digests])
+    # Outlives any entry a concurrent request might re-cache from a stale read
+    cache.set_many({revoked_key(token_digest): True for token_digest in digests}, cache_timeout() * 2)
+
+
+def revoke_user_tokens(user_ids):
+    """Delete and revoke the tokens of these users; returns the number revoked"""
+    tokens = Token.objects.filter(user_id__in=list(user_ids))
+    keys = list(tokens.values_list('key', flat=True))
+    tokens.delete()
+    revoke_keys(keys)
+    if keys:
+        logger.info(f"🔒 Revoked {len(keys)} API token(s)")
+    return len(keys)
+
+
+def _lock_user(user):
+    # A missing token row can't be locked, so serialize on the user's row
+    list(get_user_model().objects.select_for_update().filter(pk=user.pk).values_list('pk', flat=True))
+
+
+def _replace_token(user):
+    revoke_user_tokens([user.id])
+    try:
+        with transaction.atomic():
+            return Token.objects.create(user=user)
+    except IntegrityError:
+        # Created by a concurrent request first (SQLite doesn't lock rows)
+        return Token.objects.get(user=user)
+
+
+def rotate_token(user):
+    """Replace the user's token with a new one"""
+    with transaction.atomic():
+        _lock_user(user)
+        return _replace_token(user)
+
+
+def issue_token(user):
+    """The user's current token, or a fresh one if it is missing, expired or due for rotation"""
+    with transaction.atomic():
+        _lock_user(user)
+        token = Token.objects.filter(user=user).first()
+        if token is not None and (timezone.now() - token.created).total_seconds() < rotate_after():
+            return token
+        return _replace_token(user)
+
+
+def purge_expired():
+    """Delete every expired token row; returns the number removed"""
+    cutoff = timezone.now() - timedelta(seconds=ttl())
+    expired = Token.objects.filter(created__lt=cutoff)
+    keys = list(expired.values_list('key', flat=True))
+    expired.delete()
+    revoke_keys(keys)
+    return len(keys)
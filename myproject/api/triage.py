@@ -0,0 +1,97 @@
+"""
+Priority ordering for the counselor triage queue.
+
+Each open report gets a ``triage_at`` timestamp: its creation time moved
+earlier by a head start, in hours, that grows with the report's severity,
+the reported student's violation count and the repeat-offender flag.
+Ordering by ``triage_at`` ascending therefore ranks by
+
+    priority = head start + hours waiting
+
+without recomputing anything as time passes: every report ages at the same
+rate, so the order only changes when a head start does. Head starts change
+when a report is saved or the student's violation count changes, which is
+when ``refresh_for_students()`` runs. The queue reads ``triage_at`` through
+a partial index on the open statuses (see the report models).
+"""
+
+from datetime import timedelta
+
+QUEUE_STATUSES = ('pending', 'under_review')
+
+SEVERITY_HOURS = {
+    'low': 0,
+    'medium': 24,
+    'high': 72,
+    'critical': 168,
+}
+HOURS_PER_VIOLATION = 12
+MAX_VIOLATION_HOURS = 120
+REPEAT_OFFENDER_THRESHOLD = 3
+REPEAT_OFFENDER_HOURS = 72
+
+
+def is_repeat_offender(violation_count):
+    return violation_count >= REPEAT_OFFENDER_THRESHOLD
+
+
+def head_start_hours(severity, violation_count):
+    hours = SEVERITY_HOURS.get(severity, SEVERITY_HOURS['medium'])
+    hours += min(violation_count * HOURS_PER_VIOLATION, MAX_VIOLATION_HOURS)
+    if is_repeat_offender(violation_count):
+        hours += REPEAT_OFFENDER_HOURS
+    return hours
+
+
+def compute_triage_at(created_at, severity, violation_count):
+    return created_at - timedelta(hours=head_start_hours(severity, violation_count))
+
+
+def priority_score(report, now):
+    """Head start plus hours waiting, for display"""
+    return round((now - report.triage_at).total_seconds() / 3600, 1)
+
+
+def violation_counts(student_ids):
+    from django.db.models import Count
+    from .models import StudentViolationRecord
+
+    return dict(
+        StudentViolationRecord.objects.filter(student_id__in=student_ids)
+        .values_list('student_id')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+
+
+def set_triage_at(report):
+    """Fill ``report.triage_at`` before it is saved"""
+    from django.utils import timezone
+
+    student_id = report.reported_student_id
+    count = violation_counts([student_id]).get(student_id, 0) if student_id else 0
+    report.triage_at = compute_triage_at(report.created_at or timezone.now(), report.severity, count)
+
+
+def refresh_for_students(student_ids):
+    """Recompute ``triage_at`` of the open reports about these students"""
+    from .models import StudentReport, TeacherReport
+
+    student_ids = [student_id for student_id in set(student_ids) if student_id]
+    if not student_ids:
+        return 0
+
+    counts = violation_counts(student_ids)
+    refreshed = 0
+    for model in (StudentReport, TeacherReport):
+        reports = list(
+            model.objects.filter(reported_student_id__in=student_ids, status__in=QUEUE_STATUSES)
+            .only('id', 'created_at', 'severity', 'reported_student_id', 'triage_at')
+        )
+        for report in reports:
+            report.triage_at = compute_triage_at(
+                report.created_at, report.severity, counts.get(report.reported_student_id, 0)
+            )
+        model.objects.bulk_update(reports, ['triage_at'], batch_size=500)
+        refreshed += len(reports)
+    return refreshed
@@ -0,0 +1,84 @@
+"""
+API views, one module per domain.
+
+api/urls.py routes to views by dotted name with ``lazy_view('auth.login_view')``,
+so loading the URLconf imports none of these modules; each one is imported
+the first time one of its URLs is requested. ``preload()`` imports them all
+up front (see wsgi.py: with gunicorn ``--preload`` that keeps the modules in
+memory shared by all workers instead of each worker importing its own copy).
+
+Async views (``live``) are routed with ``lazy_async_view`` so the wrapper is
+a coroutine function too and Django calls them without a thread hop.
+
+``from api.views import login_view`` still works: names are looked up in the
+domain modules on first access.
+"""
+
+from importlib import import_module
+
+DOMAIN_MODULES = (
+    'auth', 'students', 'reports', 'violations', 'notifications',
+    'counseling', 'school_year', 'dashboard', 'system', 'live', 'common',
+)
+
+
+def _import(module):
+    return import_module(f'{__name__}.{module}')
+
+
+def _resolver(dotted_name):
+    module, name = dotted_name.rsplit('.', 1)
+    resolved = []
+
+    def resolve():
+        if not resolved:
+            resolved.append(getattr(_import(module), name))
+        return resolved[0]
+
+    return module, name, resolve
+
+
+def _lazy(view, module, name):
+    view.__name__ = view.__qualname__ = name
+    view.__module__ = f'{__name__}.{module}'
+    view.csrf_exempt = True
+    return view
+
+
+def lazy_view(dotted_name):
+    """
+    A view that imports ``api.views.<module>`` on its first call. All API
+    views are DRF views, which are CSRF exempt.
+    """
+    module, name, resolve = _resolver(dotted_name)
+
+    def view(request, *args, **kwargs):
+        return resolve()(request, *args, **kwargs)
+
+    return _lazy(view, module, name)
+
+
+def lazy_async_view(dotted_name):
+    """``lazy_view`` for an ``async def`` view (see ``live.async_api_view``)"""
+    module, name, resolve = _resolver(dotted_name)
+
+    async def view(request, *args, **kwargs):
+        return await resolve()(request, *args, **kwargs)
+
+    return _lazy(view, module, name)
+
+
+def preload():
+    """Import every view module now"""
+    for module in DOMAIN_MODULES:
+        _import(module)
+
+
+def __getattr__(name):
+    if name.startswith('__'):
+        raise AttributeError(name)
+    for module in DOMAIN_MODULES:
+        value = getattr(_import(module), name, None)
+        if value is not None:
+            return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,862 @@
+"""
+Login, registration, password and account profile endpoints.
+"""
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.models import User
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from django.db import transaction
+from django.utils import timezone
+import json
+import logging
+import traceback
+from .. import metrics
+from ..conditional import versioned
+from ..ratelimit import client_ip, login_limiter
+from ..audit import login_audit
+from .. import tokens
+from .. import firebase
+from ..models import Student, Teacher, Notification
+from .common import create_notification, get_current_school_year
+
+logger = logging.getLogger(__name__)
+
+
+# Authentication Views
+@csrf_exempt
+@api_view(['POST'])
+def register_view(request):
+    try:
+        data = json.loads(request.body)
+
+        # Extract user data
+        username = data.get('username')
+        password = data.get('password')
+        email = data.get('email')
+        first_name = data.get('first_name', '')
+        last_name = data.get('last_name', '')
+        role = data.get('role', 'student')
+
+        # Validate required fields
+        if not all([username, password, email]):
+            return Response({
+                'success': False,
+                'error': 'Username, password, and email are required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # Check if user already exists
+        if User.objects.filter(username=username).exists():
+            return Response({
+                'success': False,
+                'error': 'Username already exists'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        if User.objects.filter(email=email).exists():
+            return Response({
+                'success': False,
+                'error': 'Email already registered'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            # Create user
+            user = User.objects.create_user(
+                username=username,
+                password=password,
+                email=email,
+                first_name=first_name,
+                last_name=last_name,
+                is_active=True if role != 'teacher' else False
+            )
+
+            logger.info(f"✅ User created: {username}, role: {role}, is_active: {user.is_active}")
+
+            # Create role-specific profile
+            if role == 'student':
+                lrn = data.get('lrn', '').strip()
+
+                # ✅ Validate LRN
+                if not lrn:
+                    raise ValueError("LRN is required for student registration")
+
+                if len(lrn) != 12:
+                    raise ValueError("LRN must be exactly 12 digits")
+
+                if not lrn.isdigit():
+                    raise ValueError("LRN must contain only numbers")
+
+                # ✅ Check if LRN already exists
+                if Student.objects.filter(lrn=lrn).exists():
+                    raise ValueError(f"LRN {lrn} is already registered")
+
+                # Generate student_id
+                student_count = Student.objects.count()
+                student_id = f"STU-{student_count + 1:04d}"
+
+                # Get school year
+                school_year = data.get('school_year') or get_current_school_year()
+
+                student = Student.objects.create(
+                    user=user,
+                    student_id=student_id,
+                    lrn=lrn,  # ✅ NEW
+                    grade_level=data.get('grade_level'),
+                    strand=data.get('strand'),
+                    section=data.get('section'),
+                    school_year=school_year,
+                    contact_number=data.get('contact_number', ''),
+                    guardian_name=data.get('guardian_name', ''),
+                    guardian_contact=data.get('guardian_contact', '')
+                )
+
+                logger.info(f"✅ Student created: {student_id}, LRN: {lrn}, SY: {school_year}")
+
+                # Create token for student
+                token = Token.objects.create(user=user)
+
+                return Response({
+                    'success': True,
+                    'message': f'Student account created successfully! Student ID: {student_id}',
+                    'token': token.key,
+                    'user': {
+                        'id': user.id,
+                        'username': user.username,
+                        'first_name': user.first_name,
+                        'last_name': user.last_name,
+                        'email': user.email,
+                        'role': role,
+                        'student_id': student_id,
+                        'lrn': lrn,
+                        'school_year': school_year
+                    }
+                }, status=status.HTTP_201_CREATED)
+
+            elif role == 'teacher':
+                employee_id = data.get('employee_id', '').strip()
+
+                if not employee_id:
+                    raise ValueError("Employee ID is required for teacher registration")
+
+                if Teacher.objects.filter(employee_id=employee_id).exists():
+                    raise ValueError(f"Employee ID {employee_id} is already registered")
+
+                teacher = Teacher.objects.create(
+                    user=user,
+                    employee_id=employee_id,
+                    department=data.get('department', ''),
+                    specialization=data.get('specialization', ''),
+                    advising_grade=data.get('advising_grade'),
+                    advising_section=data.get('advising_section'),
+                    is_approved=False,
+                    approval_status='pending'
+                )
+
+                logger.info(f"✅ Teacher account created (pending approval): {employee_id}")
+
+                return Response({
+                    'success': True,
+                    'message': 'Teacher account created successfully. Awaiting admin approval.',
+                    'approval_status': 'pending',
+                    'user': {
+                        'id': user.id,
+                        'username': user.username,
+                        'first_name': user.first_name,
+                        'last_name': user.last_name,
+                        'email': user.email,
+                        'role': role,
+                        'employee_id': employee_id,
+                        'approval_status': 'pending'
+                    }
+                }, status=status.HTTP_201_CREATED)
+
+    except ValueError as ve:
+        logger.error(f"❌ Validation error: {str(ve)}")
+        return Response({
+            'success': False,
+            'error': str(ve)
+        }, status=status.HTTP_400_BAD_REQUEST)
+    except json.JSONDecodeError:
+        logger.error("❌ Invalid JSON data in registration")
+        return Response({
+            'success': False,
+            'error': 'Invalid JSON data'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        logger.error(f"❌ Registration error: {str(e)}")
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': f'Registration failed: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@csrf_exempt
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def forgot_password_view(request):
+    """
+    Password reset - Firebase disabled for production
+    """
+    try:
+        data = json.loads(request.body)
+        email = data.get('email', '').strip()
+
+        logger.info(f"🔐 Password reset request for email: {email}")
+
+        if not email:
+            return Response({
+                'success': False,
+                'error': 'Email address is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # Validate email format
+        import re
+        if not re.match(r'^[\w\.-]+@[\w\.-]+\.\w+$', email):
+            return Response({
+                'success': False,
+                'error': 'Invalid email format'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # Check if user exists
+        try:
+            user = User.objects.get(email=email)
+        except User.DoesNotExist:
+            # Don't reveal if email exists or not for security
+            logger.warning(f"⚠️ Password reset attempted for non-existent email: {email}")
+            return Response({
+                'success': True,
+                'message': 'If an account with that email exists, password reset instructions have been sent.',
+                'email': email
+            }, status=status.HTTP_200_OK)
+
+        # Create notification for user
+        try:
+            Notification.objects.create(
+                user=user,
+                title="🔐 Password Reset Request",
+                message=f"A password reset was requested for your account. Please contact an administrator to reset your password.",
+                type='security_alert'
+            )
+        except Exception as notif_error:
+            logger.warning(f"⚠️ Could not create notification: {notif_error}")
+
+        return Response({
+            'success': True,
+            'message': 'Password reset request received. Please contact administration.',
+            'email': email,
+            'user_exists': True
+        }, status=status.HTTP_200_OK)
+
+    except json.JSONDecodeError:
+        logger.error("❌ Invalid JSON data in password reset request")
+        return Response({
+            'success': False,
+            'error': 'Invalid request data'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        logger.error(f"❌ Password reset error: {str(e)}")
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': 'An error occurred during password reset. Please try again.'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+# Profile Views
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def profile_view(request):
+    try:
+        user = request.user
+        profile_data = {
+            'id': user.id,
+            'username': user.username,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'email': user.email,
+        }
+
+        # Add role-specific data
+        if hasattr(user, 'student'):
+            student = user.student
+            profile_data.update({
+                'role': 'student',
+                'student_id': getattr(student, 'student_id', '') or '',
+                'grade_level': student.grade_level,
+                'section': student.section,
+                'strand': getattr(student, 'strand', '') or '',
+                'contact_number': getattr(student, 'contact_number', '') or '',
+                'guardian_name': getattr(student, 'guardian_name', '') or '',
+                'guardian_contact': getattr(student, 'guardian_contact', '') or '',
+            })
+        elif hasattr(user, 'teacher'):
+            teacher = user.teacher
+            profile_data.update({
+                'role': 'teacher',
+                'employee_id': teacher.employee_id,
+                'department': teacher.department,
+                'advising_grade': teacher.advising_grade,
+                'advising_strand': teacher.advising_strand,
+                'advising_section': teacher.advising_section,
+            })
+        elif hasattr(user, 'counselor'):
+            counselor = user.counselor
+            profile_data.update({
+                'role': 'counselor',
+                'employee_id': counselor.employee_id,
+                'department': counselor.department,
+            })
+
+        return Response({
+            'success': True,
+            'user': profile_data
+        })
+
+    except Exception as e:
+        logger.error(f"Profile error: {str(e)}")
+        return Response({
+            'success': False,
+            'error': 'Failed to retrieve profile'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+# Teacher Views
+def _teacher_profile_data(teacher, user):
+    # ✅ Build full name properly
+    first_name = user.first_name or ''
+    last_name = user.last_name or ''
+    full_name = f"{first_name} {last_name}".strip()
+
+    # If no name is set, use username as fallback
+    if not full_name:
+        full_name = user.username
+
+    return {
+        'id': teacher.id,
+        'user_id': user.id,
+        'username': user.username,
+        'first_name': first_name,
+        'last_name': last_name,
+        'full_name': full_name,  # ✅ Add explicit full_name field
+        'email': user.email or '',
+        'employee_id': teacher.employee_id or '',
+        'department': teacher.department or '',
+        'advising_grade': teacher.advising_grade or '',
+        'advising_strand': teacher.advising_strand or '',
+        'advising_section': teacher.advising_section or '',
+        'contact_number': getattr(teacher, 'contact_number', '') or '',  # ✅ Add if field exists
+        'created_at': teacher.created_at.isoformat() if hasattr(teacher, 'created_at') and teacher.created_at else None,
+    }
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@versioned('user:{user}', 'profiles', per_user=True)
+def teacher_profile(request):
+    """Get teacher profile information"""
+    try:
+        if not hasattr(request.user, 'teacher'):
+            return Response({
+                'success': False,
+                'error': 'Teacher profile not found',
+                'profile': None  # ✅ Add default profile
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        teacher_data = _teacher_profile_data(request.user.teacher, request.user)
+
+        logger.info(f"✅ Teacher profile retrieved: {teacher_data['full_name']} ({request.user.username})")
+
+        return Response({
+            'success': True,
+            'profile': teacher_data,  # ✅ Changed from 'teacher' to 'profile' for consistency
+            'message': 'Teacher profile retrieved successfully'
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Teacher profile error: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': str(e),
+            'profile': None  # ✅ Add default profile
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def _student_profile_data(student, user):
+    return {
+        'id': student.id,
+        'student_id': student.student_id,
+        'user_id': user.id,
+        'lrn': student.lrn,
+        'username': user.username,
+        'email': user.email,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'grade_level': student.grade_level,
+        'section': student.section,
+        'strand': student.strand if student.strand else '',
+        'school_year': student.school_year,
+        'contact_number': student.contact_number if student.contact_number else '',
+        'guardian_name': student.guardian_name if student.guardian_name else '',
+        'guardian_contact': student.guardian_contact if student.guardian_contact else '',
+        # ✅ REMOVED: 'is_active': student.is_active,  # This field doesn't exist
+    }
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@versioned('user:{user}', 'profiles', per_user=True)
+def student_profile(request):
+    """Get student profile information"""
+    try:
+        if not hasattr(request.user, 'student'):
+            logger.error(f"❌ User {request.user.username} is not a student")
+            return Response({
+                'success': False,
+                'error': 'Not a student account'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        student = request.user.student
+
+        profile_data = _student_profile_data(student, request.user)
+
+        logger.info(f"✅ Student profile retrieved: {student.student_id}")
+        logger.info(f"📚 Grade: {student.grade_level}, Section: {student.section}, SY: {student.school_year}")
+
+        return Response({
+            'success': True,
+            'student': profile_data
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error fetching student profile: {e}")
+        import traceback
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def _counselor_profile_data(counselor, user):
+    # Build full name
+    first_name = user.first_name or ''
+    last_name = user.last_name or ''
+    full_name = f"{first_name} {last_name}".strip()
+
+    # If no name is set, use username as fallback
+    if not full_name:
+        full_name = user.username
+
+    # ✅ FIXED: Only use fields that exist in the Counselor model
+    profile_data = {
+        'id': counselor.id,
+        'user_id': user.id,
+        'username': user.username,
+        'first_name': first_name,
+        'last_name': last_name,
+        'full_name': full_name,
+        'email': user.email or '',
+        'role': 'counselor',
+    }
+
+    # ✅ Add optional fields only if they exist
+    if hasattr(counselor, 'employee_id'):
+        profile_data['employee_id'] = counselor.employee_id or ''
+
+    if hasattr(counselor, 'department'):
+        profile_data['department'] = counselor.department or ''
+
+    if hasattr(counselor, 'phone'):
+        profile_data['phone'] = counselor.phone or ''
+
+    return profile_data
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def counselor_profile(request):
+    """Get counselor profile information with full name"""
+    try:
+        if not hasattr(request.user, 'counselor'):
+            return Response({
+                'success': False,
+                'error': 'Counselor profile not found',
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        profile_data = _counselor_profile_data(request.user.counselor, request.user)
+
+        logger.info(f"✅ Counselor profile retrieved: {profile_data['full_name']} ({request.user.username})")
+
+        # Return profile data at root level
+        return Response(profile_data)
+
+    except Exception as e:
+        logger.error(f"❌ Counselor profile error: {str(e)}")
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': str(e),
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@csrf_exempt
+@api_view(['POST'])
+def login_view(request):
+    try:
+        data = json.loads(request.body)
+        username = data.get('username')
+        password = data.get('password')
+
+        logger.info(f"🔐 Login attempt for username: {username}")
+
+        if not username or not password:
+            return Response({
+                'success': False,
+                'error': 'Username and password are required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # ✅ Client IP as seen by our own proxy (X-Forwarded-For is client-controlled)
+        ip_address = client_ip(request)
+
+        # ✅ SECURITY: Check if user is locked out or the IP throttled (one cache read)
+        limit = login_limiter.status(username, ip_address)
+        if limit.throttled:
+            logger.warning(f"🚦 Login throttled for {ip_address}: too many failed logins from this address")
+            metrics.record_login_lockout()
+
+            response = Response({
+                'success': False,
+                'error': 'Too many login attempts',
+                'locked': False,
+                'retry_after_seconds': limit.seconds_remaining,
+                'message': 'Too many failed login attempts from your network. Please try again in a few minutes.'
+            }, status=status.HTTP_429_TOO_MANY_REQUESTS)
+            response['Retry-After'] = str(limit.seconds_remaining)
+            return response
+
+        if limit.locked:
+            remaining_time = limit.minutes_remaining
+            failed_count = limit.failures
+
+            logger.warning(f"🔒 Account locked: {username} - {failed_count} failed attempts")
+            metrics.record_login_lockout()
+
+            return Response({
+                'success': False,
+                'error': 'Account temporarily locked',
+                'locked': True,
+                'failed_attempts': failed_count,
+                'lockout_minutes_remaining': remaining_time,
+                'message': f'Too many failed login attempts. Your account is locked for {remaining_time} more minute(s). Please try again later.'
+            }, status=status.HTTP_429_TOO_MANY_REQUESTS)
+
+        # Attempt authentication
+        user = authenticate(username=username, password=password)
+        logger.info(f"Authentication result for {username}: {user is not None}")
+
+        if user:
+            # ✅ SUCCESSFUL LOGIN
+            # Record successful login
+            login_audit.record(username, ip_address, success=True)
+            login_limiter.reset(username)
+            metrics.record_login_attempt(success=True)
+
+            # Determine role
+            role = None
+            approval_status = None
+
+            if hasattr(user, 'student'):
+                role = 'student'
+            elif hasattr(user, 'teacher'):
+                role = 'teacher'
+                teacher = user.teacher
+                approval_status = teacher.approval_status
+
+                # ✅ Check teacher approval status
+                if not teacher.is_approved:
+                    logger.warning(f"⏳ Teacher login blocked - {approval_status}: {username}")
+
+                    # Record failed attempt due to approval status
+                    login_audit.record(username, ip_address, success=False)
+                    login_limiter.record_failure(username, ip_address)
+                    metrics.record_login_attempt(success=False)
+
+                    return Response({
+                        'success': False,
+                        'error': f'Account {approval_status}',
+                        'approval_status': approval_status,
+                        'message': (
+                            'Your teacher account is pending admin approval. Please wait for approval notification.'
+                            if approval_status == 'pending'
+                            else 'Your teacher account application was rejected. Please contact the administrator.'
+                        )
+                    }, status=status.HTTP_403_FORBIDDEN)
+
+            elif hasattr(user, 'counselor'):
+                role = 'counselor'
+            else:
+                logger.error(f"❌ User has no role: {username}")
+                login_audit.record(username, ip_address, success=False)
+                login_limiter.record_failure(username, ip_address)
+                metrics.record_login_attempt(success=False)
+                return Response({
+                    'success': False,
+                    'error': 'User role not found'
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            # ✅ Current token, or a new one if it expired or is due for rotation
+            token = tokens.issue_token(user)
+
+            logger.info(f"✅ Login successful: {username} ({role})")
+
+            return Response({
+                'success': True,
+                'token': token.key,
+                'token_expires_at': tokens.expires_at(token),
+                'user': {
+                    'id': user.id,
+                    'username': user.username,
+                    'first_name': user.first_name,
+                    'last_name': user.last_name,
+                    'email': user.email,
+                    'role': role,
+                },
+                'message': f'Welcome back, {user.first_name or user.username}!'
+            }, status=status.HTTP_200_OK)
+
+        else:
+            # ✅ FAILED LOGIN
+            # Record failed attempt; the limiter returns the failures in the window
+            login_audit.record(username, ip_address, success=False)
+            failed_count = login_limiter.record_failure(username, ip_address)
+            metrics.record_login_attempt(success=False)
+
+            max_failures = login_limiter.max_failures
+            remaining_attempts = max(0, max_failures - failed_count)
+
+            logger.warning(f"❌ Failed login: {username} - Attempt {failed_count}/{max_failures}")
+
+            error_message = 'Invalid username or password'
+
+            # Add warning if getting close to lockout
+            if remaining_attempts > 0 and remaining_attempts <= 2:
+                error_message += f'. Warning: {remaining_attempts} attempt(s) remaining before account lockout.'
+            elif remaining_attempts == 0:
+                error_message = f'Account locked due to too many failed attempts. Please try again in {login_limiter.lockout_seconds // 60} minutes.'
+
+            return Response({
+                'success': False,
+                'error': error_message,
+                'failed_attempts': failed_count,
+                'remaining_attempts': remaining_attempts,
+                'locked': remaining_attempts == 0
+            }, status=status.HTTP_401_UNAUTHORIZED)
+
+    except json.JSONDecodeError as json_error:
+        logger.error(f"JSON decode error: {str(json_error)}")
+        return Response({
+            'success': False,
+            'error': 'Invalid JSON data'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        logger.error(f"❌ Login error: {str(e)}")
+        logger.error(f"❌ Login traceback: ", exc_info=True)
+        return Response({
+            'success': False,
+            'error': f'Login failed: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def refresh_token(request):
+    """Replace the caller's API token with a new one"""
+    try:
+        token = tokens.rotate_token(request.user)
+        logger.info(f"🔄 Token rotated for user: {request.user.username}")
+        return Response({
+            'success': True,
+            'token': token.key,
+            'token_expires_at': tokens.expires_at(token),
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(f"❌ Token refresh error: {str(e)}")
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@csrf_exempt
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def sync_firebase_password(request):
+    """Sync password change from Firebase to Django - called after Firebase password reset"""
+    try:
+        data = json.loads(request.body)
+        email = data.get('email')
+        new_password = data.get('new_password')
+        firebase_uid = data.get('firebase_uid')  # Optional: for extra security
+
+        logger.info(f"🔄 Password sync request for email: {email}")
+
+        if not email or not new_password:
+            return Response({
+                'success': False,
+                'error': 'Email and new password are required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # Find user by email
+        try:
+            user = User.objects.get(email=email)
+            logger.info(f"✅ Found user: {user.username}")
+        except User.DoesNotExist:
+            logger.error(f"❌ User not found with email: {email}")
+            return Response({
+                'success': False,
+                'error': 'User not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        # Update Django password
+        user.set_password(new_password)
+        user.save()
+
+        logger.info(f"✅ Django password updated for user: {user.username}")
+
+        # Regenerate auth token (revokes the old one, including cached copies)
+        token = tokens.rotate_token(user)
+
+        logger.info(f"✅ Auth token regenerated for user: {user.username}")
+
+        # Send notification to user
+        try:
+            create_notification(
+                user=user,
+                title="🔐 Password Reset Successful",
+                message="Your password has been successfully reset. If you didn't make this change, please contact administration immediately.",
+                notification_type='security_alert'
+            )
+            logger.info(f"✅ Notification sent to user: {user.username}")
+        except Exception as notif_error:
+            logger.warning(f"⚠️ Failed to send notification: {notif_error}")
+
+        return Response({
+            'success': True,
+            'message': 'Password synced successfully',
+            'token': token.key,
+            'user': {
+                'id': user.id,
+                'username': user.username,
+                'email': user.email,
+                'first_name': user.first_name,
+                'last_name': user.last_name,
+            }
+        }, status=status.HTTP_200_OK)
+
+    except json.JSONDecodeError:
+        return Response({
+            'success': False,
+            'error': 'Invalid JSON data'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        logger.error(f"❌ Password sync error: {str(e)}")
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@csrf_exempt
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def change_password(request):
+    """Change user password while authenticated - updates both Django and Firebase"""
+    try:
+        data = json.loads(request.body)
+        current_password = data.get('current_password')
+        new_password = data.get('new_password')
+
+        if not current_password or not new_password:
+            return Response({
+                'success': False,
+                'error': 'Both current and new passwords are required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        user = request.user
+
+        # Verify current password
+        if not user.check_password(current_password):
+            return Response({
+                'success': False,
+                'error': 'Current password is incorrect'
+            }, status=status.HTTP_401_UNAUTHORIZED)
+
+        # Validate new password strength
+        if len(new_password) < 6:
+            return Response({
+                'success': False,
+                'error': 'New password must be at least 6 characters long'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # Update Django password
+        user.set_password(new_password)
+        user.save()
+
+        # Invalidate existing DRF Token(s), including cached copies
+        new_token = tokens.rotate_token(user)
+
+        # Invalidate server-side sessions for this user
+        try:
+            from django.contrib.sessions.models import Session
+            sessions = Session.objects.filter(expire_date__gte=timezone.now())
+            for s in sessions:
+                session_data = s.get_decoded()
+                if str(session_data.get('_auth_user_id')) == str(user.id):
+                    s.delete()
+            logger.info(f"✅ Cleared Django sessions for user {user.username}")
+        except Exception as sess_err:
+            logger.warning(f"⚠️ Failed to clear sessions: {sess_err}")
+
+        # Revoke Firebase refresh tokens in the background if firebase UID is available
+        firebase_uid = getattr(user, 'firebase_uid', None) or data.get('firebase_uid')
+        firebase.revoke_refresh_tokens(firebase_uid)
+
+        # Notify user
+        try:
+            create_notification(
+                user=user,
+                title="🔐 Password Changed",
+                message="Your account password was successfully changed. If you did not perform this action, contact the administrator immediately.",
+                notification_type='security_alert'
+            )
+        except Exception as notif_err:
+            logger.warning(f"⚠️ Failed to create notification: {notif_err}")
+
+        logger.info(f"✅ Password changed for user: {user.username}")
+
+        return Response({
+            'success': True,
+            'message': 'Password changed successfully',
+            'token': new_token.key
+        }, status=status.HTTP_200_OK)
+
+    except json.JSONDecodeError:
+        return Response({
+            'success': False,
+            'error': 'Invalid JSON data'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        logger.error(f"❌ Password change error: {str(e)}")
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
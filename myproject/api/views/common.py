@@ -0,0 +1,46 @@
+"""
+Helpers shared by the view modules.
+"""
+
+import logging
+from datetime import datetime
+from ..models import Notification, SystemSettings
+
+logger = logging.getLogger(__name__)
+
+
+def get_current_school_year():
+    """Get current school year from SystemSettings"""
+    try:
+        settings = SystemSettings.get_current_settings()
+        return settings.current_school_year
+    except Exception as e:
+        logger.warning(f"⚠️  Could not get school year from settings: {e}")
+        # Fallback: calculate from current date
+        current_year = datetime.now().year
+        current_month = datetime.now().month
+        return f"{current_year}-{current_year + 1}" if current_month >= 6 else f"{current_year - 1}-{current_year}"
+
+
+def create_notification(user, title, message, notification_type='general', related_report=None):
+    """Helper function to create a notification"""
+    try:
+        kwargs = {
+            'user': user,
+            'title': title,
+            'message': message,
+            'type': notification_type,
+        }
+        # Link to the correct report type
+        if related_report is not None:
+            from ..models import StudentReport, TeacherReport
+            if isinstance(related_report, StudentReport):
+                kwargs['related_student_report'] = related_report
+            elif isinstance(related_report, TeacherReport):
+                kwargs['related_teacher_report'] = related_report
+        notification = Notification.objects.create(**kwargs)
+        logger.info(f"✅ Notification created for {user.username}: {title}")
+        return notification
+    except Exception as e:
+        logger.error(f"❌ Error creating notification: {str(e)}")
+        return None
@@ -0,0 +1,1059 @@
+"""
+Counseling summons, sessions, logs and guidance notices.
+"""
+
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+import logging
+from datetime import datetime, timedelta
+import traceback
+from ..models import Student, Counselor, StudentReport, TeacherReport, Notification, StudentViolationRecord, CounselingLog
+from .common import create_notification, get_current_school_year
+
+logger = logging.getLogger(__name__)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def send_counseling_notification(request):
+    """Send counseling notification to a student"""
+    try:
+        # Verify counselor
+        try:
+            counselor = Counselor.objects.get(user=request.user)
+        except Counselor.DoesNotExist:
+            return Response({
+                'success': False,
+                'error': 'Only counselors can send notifications'
+            }, status=403)
+
+        student_id = request.data.get('student_id')
+        message = request.data.get('message')
+        scheduled_date = request.data.get('scheduled_date')
+
+        if not student_id or not message:
+            return Response({
+                'success': False,
+                'error': 'Student ID and message are required'
+            }, status=400)
+
+        # Get student
+        try:
+            student = Student.objects.get(id=student_id)
+        except Student.DoesNotExist:
+            return Response({
+                'success': False,
+                'error': 'Student not found'
+            }, status=404)
+
+        if not student.user:
+            return Response({
+                'success': False,
+                'error': 'Student has no user account'
+            }, status=400)
+
+        # Create notification
+        title = "🏫 Counseling Session Notification"
+        full_message = message
+
+        if scheduled_date:
+            try:
+                scheduled_datetime = parse_datetime(scheduled_date)
+                if scheduled_datetime:
+                    from django.utils.dateformat import DateFormat
+                    date_format = DateFormat(scheduled_datetime)
+                    formatted_date = date_format.format('F j, Y')
+                    formatted_time = date_format.format('g:i A')
+                    full_message += f"\n\nScheduled: {formatted_date} at {formatted_time}"
+            except Exception as e:
+                logger.warning(f"Could not parse date: {e}")
+
+        notification = Notification.objects.create(
+            user=student.user,
+            title=title,
+            message=full_message,
+            type='session_scheduled'
+        )
+
+        logger.info(f"✅ Counseling notification sent to {student.user.username}")
+
+        return Response({
+            'success': True,
+            'message': 'Notification sent successfully',
+            'notification_id': notification.id,
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error sending counseling notification: {str(e)}")
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=500)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def send_counseling_summons(request, report_id):
+    """Send notification to student to come to guidance office for counseling"""
+    try:
+        # Verify counselor
+        try:
+            counselor = Counselor.objects.get(user=request.user)
+        except Counselor.DoesNotExist:
+            return Response({
+                'success': False,
+                'error': 'Only counselors can send counseling summons'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        # Get the report
+        try:
+            report = Report.objects.select_related(
+                'student',
+                'student__user',
+                'reported_by',
+                'violation_type'
+            ).get(id=report_id)
+        except Report.DoesNotExist:
+            return Response({
+                'success': False,
+                'error': 'Report not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        # Check if student has user account
+        if not report.student or not report.student.user:
+            return Response({
+                'success': False,
+                'error': 'Student has no associated user account'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # Get optional scheduled date/time
+        scheduled_date = request.data.get('scheduled_date')
+        additional_message = request.data.get('message', '')
+
+        # Create notification for student
+        student_name = f"{report.student.user.first_name} {report.student.user.last_name}".strip()
+        violation_name = report.violation_type.name if report.violation_type else 'a reported incident'
+
+        notification_title = "🏫 Summons to Guidance Office"
+        notification_message = (
+            f"Dear {student_name},\n\n"
+            f"You are required to report to the Guidance Office regarding {violation_name}.\n\n"
+            f"Report Details:\n"
+            f"• Title: {report.title}\n"
+            f"• Reported on: {report.created_at.strftime('%B %d, %Y')}\n"
+        )
+
+        if scheduled_date:
+            try:
+                from django.utils.dateparse import parse_datetime
+                date_obj = parse_datetime(scheduled_date)
+                if date_obj:
+                    formatted_date = date_obj.strftime('%B %d, %Y at %I:%M %p')
+                    notification_message += f"• Scheduled: {formatted_date}\n"
+            except:
+                notification_message += f"• Scheduled: {scheduled_date}\n"
+
+        if additional_message:
+            notification_message += f"\n{additional_message}\n"
+
+        notification_message += (
+            "\n⚠️ IMPORTANT:\n"
+            "Please come prepared to discuss the incident. Failure to appear may result in "
+            "automatic tallying of the violation.\n\n"
+            "If you cannot attend at the scheduled time, please inform the guidance office immediately."
+        )
+
+        # Create notification
+        notification = create_notification(
+            user=report.student.user,
+            title=notification_title,
+            message=notification_message,
+            notification_type='counseling_summons',
+            related_report=report
+        )
+
+        # Update report status to "summoned"
+        report.status = 'summoned'
+        report.counselor_notes = (report.counselor_notes or '') + f"\n[{timezone.now().strftime('%Y-%m-%d %H:%M')}] Student summoned to guidance office."
+        report.save()
+
+        logger.info(f"✅ Counseling summons sent to student {report.student.user.username} for report {report_id}")
+
+        return Response({
+            'success': True,
+            'message': 'Counseling summons sent successfully',
+            'notification': {
+                'id': notification.id,
+                'title': notification.title,
+                'sent_to': student_name,
+            },
+            'report': {
+                'id': report.id,
+                'status': report.status,
+            }
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error sending counseling summons: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@csrf_exempt
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def send_guidance_notice(request, report_id):
+    """Send guidance notice/summons to students involved in a report"""
+    try:
+        # Verify counselor authentication
+        try:
+            counselor = Counselor.objects.get(user=request.user)
+        except Counselor.DoesNotExist:
+            return Response({
+                'success': False,
+                'message': 'Only counselors can send guidance notices'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        # ✅ Determine report type from request body
+        report_type = request.data.get('report_type', 'student_report')  # Default to student_report
+
+        logger.info(f"📢 Sending guidance notice for {report_type} #{report_id}")
+
+        # ✅ Get the report based on type
+        report = None
+        report_model_name = ""
+
+        if report_type == 'student_report':
+            try:
+                report = StudentReport.objects.select_related(
+                    'reporter_student__user',
+                    'reported_student__user',
+                    'violation_type',
+                    'assigned_counselor__user'
+                ).get(id=report_id)
+                report_model_name = "StudentReport"
+            except StudentReport.DoesNotExist:
+                return Response({
+                    'success': False,
+                    'message': f'Student report with ID {report_id} not found'
+                }, status=status.HTTP_404_NOT_FOUND)
+
+        elif report_type == 'teacher_report':
+            try:
+                report = TeacherReport.objects.select_related(
+                    'reporter_teacher__user',
+                    'reported_student__user',
+                    'violation_type',
+                    'assigned_counselor__user'
+                ).get(id=report_id)
+                report_model_name = "TeacherReport"
+            except TeacherReport.DoesNotExist:
+                return Response({
+                    'success': False,
+                    'message': f'Teacher report with ID {report_id} not found'
+                }, status=status.HTTP_404_NOT_FOUND)
+
+        else:
+            return Response({
+                'success': False,
+                'message': f'Invalid report type: {report_type}'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # Get notice details from request
+        notice_message = request.data.get('message', '')
+        scheduled_date_str = request.data.get('scheduled_date', '')
+
+        if not notice_message:
+            return Response({
+                'success': False,
+                'message': 'Notice message is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # Parse scheduled date
+        scheduled_date = None
+        if scheduled_date_str:
+            try:
+                from datetime import datetime
+                scheduled_date = datetime.fromisoformat(scheduled_date_str.replace('Z', '+00:00'))
+            except Exception as e:
+                logger.warning(f"⚠️ Could not parse scheduled date: {e}")
+                scheduled_date = timezone.now()
+        else:
+            scheduled_date = timezone.now()
+
+        logger.info(f"📨 Notice message: {notice_message[:50]}...")
+        logger.info(f"📅 Scheduled date: {scheduled_date}")
+
+        # ✅ Send notifications based on report type
+        notifications_sent = []
+
+        if report_type == 'student_report':
+            # Send to reporter (if exists and not self-report)
+            if report.reporter_student and report.reporter_student != report.reported_student:
+                notification = Notification.objects.create(
+                    user=report.reporter_student.user,
+                    title='Guidance Office Notice',
+                    message=notice_message,
+                    type='summons',
+                    related_student_report=report
+                )
+                notifications_sent.append({
+                    'recipient': 'reporter',
+                    'user': report.reporter_student.user.username,
+                    'name': report.reporter_student.user.get_full_name()
+                })
+                logger.info(f"✅ Notification sent to reporter: {report.reporter_student.user.username}")
+
+            # Send to reported student
+            if report.reported_student:
+                notification = Notification.objects.create(
+                    user=report.reported_student.user,
+                    title='Guidance Office Notice',
+                    message=notice_message,
+                    type='summons',
+                    related_student_report=report
+                )
+                notifications_sent.append({
+                    'recipient': 'reported_student',
+                    'user': report.reported_student.user.username,
+                    'name': report.reported_student.user.get_full_name()
+                })
+                logger.info(f"✅ Notification sent to reported student: {report.reported_student.user.username}")
+
+            # Update report status
+            report.summons_sent_at = timezone.now()
+            report.summons_sent_to_reporter = True
+            report.summons_sent_to_reported = True
+
+        elif report_type == 'teacher_report':
+            # Send notification to reported student
+            if report.reported_student:
+                notification = Notification.objects.create(
+                    user=report.reported_student.user,
+                    title='Guidance Office Notice',
+                    message=notice_message,
+                    type='summons',
+                    related_teacher_report=report
+                )
+                notifications_sent.append({
+                    'recipient': 'reported_student',
+                    'user': report.reported_student.user.username,
+                    'name': report.reported_student.user.get_full_name()
+                })
+                logger.info(f"✅ Notification sent to reported student: {report.reported_student.user.username}")
+
+            # Optionally send to teacher (FYI)
+            if report.reporter_teacher:
+                notification = Notification.objects.create(
+                    user=report.reporter_teacher.user,
+                    title='Guidance Notice Sent',
+                    message=f'A guidance notice has been sent regarding your report: {report.title}',
+                    type='system_alert',
+                    related_teacher_report=report
+                )
+                notifications_sent.append({
+                    'recipient': 'teacher',
+                    'user': report.reporter_teacher.user.username,
+                    'name': report.reporter_teacher.user.get_full_name()
+                })
+                logger.info(f"✅ FYI notification sent to teacher: {report.reporter_teacher.user.username}")
+
+            # Update report status
+            report.summons_sent_at = timezone.now()
+            report.summons_sent_to_student = True
+            report.teacher_notified = True
+
+        # Update report status if still pending
+        if report.status == 'pending':
+            report.status = 'summoned'
+
+        report.save()
+
+        logger.info(f"✅ Guidance notice sent successfully for {report_model_name} #{report_id}")
+        logger.info(f"   Notifications sent to {len(notifications_sent)} recipient(s)")
+
+        return Response({
+            'success': True,
+            'message': f'Guidance notice sent successfully to {len(notifications_sent)} recipient(s)',
+            'report_id': report.id,
+            'report_type': report_type,
+            'notifications_sent': notifications_sent,
+            'scheduled_date': scheduled_date.isoformat(),
+            'report': {
+                'id': report.id,
+                'title': report.title,
+                'status': report.status,
+                'summons_sent_at': report.summons_sent_at.isoformat() if report.summons_sent_at else None,
+            }
+        }, status=status.HTTP_200_OK)
+
+    except Exception as e:
+        logger.error(f"❌ Error sending guidance notice: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'message': f'Failed to send guidance notice: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def log_counseling_action(request):
+    """Log a counseling action for a student and notify them"""
+    try:
+        # Verify counselor
+        if not hasattr(request.user, 'counselor'):
+            return Response({
+                'success': False,
+                'error': 'Only counselors can log counseling actions'
+            }, status=403)
+
+        counselor = request.user.counselor
+        data = request.data
+
+        # Get required data
+        student_id = data.get('student_id')
+        action_type = data.get('action_type', 'Individual Counseling')
+        description = data.get('description', '')
+        scheduled_date = data.get('scheduled_date')
+        notes = data.get('notes', '')
+        school_year = data.get('school_year', get_current_school_year())
+
+        if not student_id or not scheduled_date:
+            return Response({
+                'success': False,
+                'error': 'Student ID and scheduled date are required'
+            }, status=400)
+
+        # Get student
+        try:
+            student = Student.objects.get(id=student_id)
+        except Student.DoesNotExist:
+            return Response({
+                'success': False,
+                'error': 'Student not found'
+            }, status=404)
+
+        # Parse scheduled date
+        try:
+            scheduled_datetime = parse_datetime(scheduled_date)
+            if not scheduled_datetime:
+                # Try parsing as date only and add default time
+                from datetime import datetime
+                import datetime as dt
+                date_part = datetime.strptime(scheduled_date.split('T')[0], '%Y-%m-%d').date()
+                scheduled_datetime = datetime.combine(date_part, dt.time(10, 0))  # Default 10:00 AM
+                scheduled_datetime = timezone.make_aware(scheduled_datetime)
+        except (ValueError, TypeError):
+            return Response({
+                'success': False,
+                'error': 'Invalid date format'
+            }, status=400)
+
+        # Create counseling log
+        counseling_log = CounselingLog.objects.create(
+            counselor=counselor,
+            student=student,
+            action_type=action_type,
+            description=description,
+            scheduled_date=scheduled_datetime,
+            status='scheduled',
+            notes=notes,
+            school_year=school_year
+        )
+
+        # ✅ NEW: Send notification to student
+        if student.user:
+            student_name = f"{student.user.first_name} {student.user.last_name}".strip() or student.user.username
+            counselor_name = f"{counselor.user.first_name} {counselor.user.last_name}".strip() or counselor.user.username
+
+            # Format scheduled date for notification
+            from django.utils.dateformat import DateFormat
+            date_format = DateFormat(scheduled_datetime)
+            formatted_date = date_format.format('F j, Y')  # e.g., "December 15, 2025"
+            formatted_time = date_format.format('g:i A')   # e.g., "2:30 PM"
+
+            notification_title = "🏫 Counseling Session Scheduled"
+            notification_message = (
+                f"Dear {student_name},\n\n"
+                f"A counseling session has been scheduled for you with the Guidance Office.\n\n"
+                f"📅 Date: {formatted_date}\n"
+                f"🕒 Time: {formatted_time}\n"
+                f"👥 Counselor: {counselor_name}\n"
+                f"📋 Session Type: {action_type}\n"
+            )
+
+            if description:
+                notification_message += f"\n📝 Details:\n{description}\n"
+
+            notification_message += (
+                f"\n⚠️ IMPORTANT REMINDERS:\n"
+                f"• Please arrive 5 minutes before your scheduled time\n"
+                f"• Bring your student ID and any relevant documents\n"
+                f"• If you cannot attend, please inform the guidance office immediately\n"
+                f"• Failure to attend without prior notice may result in disciplinary action\n\n"
+                f"📍 Location: Guidance Office\n"
+                f"💬 For questions, please approach the guidance office during office hours.\n\n"
+                f"Thank you for your cooperation."
+            )
+
+            try:
+                # Create notification
+                notification = Notification.objects.create(
+                    user=student.user,
+                    title=notification_title,
+                    message=notification_message,
+                    type='session_scheduled'
+                )
+
+                logger.info(f"✅ Counseling session notification sent to {student.user.username}")
+
+            except Exception as notif_error:
+                logger.error(f"⚠️ Failed to send notification: {notif_error}")
+                # Don't fail the counseling log creation if notification fails
+
+        logger.info(f"✅ Counseling action logged: {action_type} for {student.user.username}")
+
+        return Response({
+            'success': True,
+            'message': 'Counseling session scheduled and student notified successfully',
+            'counseling_log': {
+                'id': counseling_log.id,
+                'student_id': student.id,
+                'student_name': f"{student.user.first_name} {student.user.last_name}".strip(),
+                'action_type': counseling_log.action_type,
+                'scheduled_date': counseling_log.scheduled_date.isoformat(),
+                'status': counseling_log.status,
+                'notification_sent': student.user is not None,
+            }
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error logging counseling action: {str(e)}")
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=500)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def schedule_emergency_counseling(request):
+    """Schedule emergency counseling for high-risk students and notify them"""
+    try:
+        # Verify counselor
+        if not hasattr(request.user, 'counselor'):
+            return Response({
+                'success': False,
+                'error': 'Only counselors can schedule emergency counseling'
+            }, status=403)
+
+        counselor = request.user.counselor
+        data = request.data
+
+        # Get required data
+        student_id = data.get('student_id')
+        student_name = data.get('student_name', '')
+        violation_count = data.get('violation_count', 0)
+        violation_types = data.get('violation_types', [])
+        notes = data.get('notes', '')
+        scheduled_date = data.get('scheduled_date')
+
+        if not student_id:
+            return Response({
+                'success': False,
+                'error': 'Student ID is required'
+            }, status=400)
+
+        # Get student
+        try:
+            student = Student.objects.get(id=student_id)
+        except Student.DoesNotExist:
+            return Response({
+                'success': False,
+                'error': 'Student not found'
+            }, status=404)
+
+        # Parse or set scheduled date
+        if scheduled_date:
+            try:
+                scheduled_datetime = parse_datetime(scheduled_date)
+            except (ValueError, TypeError):
+                scheduled_datetime = timezone.now() + timedelta(days=1)  # Tomorrow
+        else:
+            scheduled_datetime = timezone.now() + timedelta(days=1)  # Default to tomorrow
+
+        # Create emergency counseling log
+        counseling_log = CounselingLog.objects.create(
+            counselor=counselor,
+            student=student,
+            action_type='Emergency Critical Intervention',
+            description=f'URGENT: Student has {violation_count} violations requiring immediate counseling. Violation types: {", ".join(violation_types)}',
+            scheduled_date=scheduled_datetime,
+            status='scheduled',
+            notes=notes,
+            school_year=get_current_school_year()
+        )
+
+        # ✅ NEW: Send urgent notification to student
+        if student.user:
+            student_display_name = student_name or f"{student.user.first_name} {student.user.last_name}".strip() or student.user.username
+            counselor_name = f"{counselor.user.first_name} {counselor.user.last_name}".strip() or counselor.user.username
+
+            # Format scheduled date
+            from django.utils.dateformat import DateFormat
+            date_format = DateFormat(scheduled_datetime)
+            formatted_date = date_format.format('F j, Y')
+            formatted_time = date_format.format('g:i A')
+
+            notification_title = "🚨 URGENT: Emergency Counseling Required"
+            notification_message = (
+                f"Dear {student_display_name},\n\n"
+                f"⚠️ URGENT NOTICE: You are required to report to the Guidance Office for an emergency counseling session.\n\n"
+                f"📊 REASON: You have accumulated {violation_count} disciplinary violations, which requires immediate intervention.\n\n"
+                f"📅 Scheduled Date: {formatted_date}\n"
+                f"🕒 Time: {formatted_time}\n"
+                f"👥 Counselor: {counselor_name}\n"
+                f"📋 Session Type: Emergency Critical Intervention\n\n"
+                f"🔍 VIOLATIONS RECORDED:\n"
+            )
+
+            # Add violation types
+            for i, violation_type in enumerate(violation_types[:5], 1):
+                notification_message += f"   {i}. {violation_type}\n"
+
+            if len(violation_types) > 5:
+                notification_message += f"   ... and {len(violation_types) - 5} more\n"
+
+            notification_message += (
+                f"\n🚨 CRITICAL REMINDERS:\n"
+                f"• This is an EMERGENCY session - attendance is MANDATORY\n"
+                f"• Failure to attend will result in automatic disciplinary action\n"
+                f"• Please arrive 10 minutes early for check-in\n"
+                f"• Bring your student ID and be prepared to discuss these incidents\n"
+                f"• Parent/guardian may be contacted if you fail to attend\n\n"
+                f"📍 Location: Guidance Office (Main Building)\n"
+                f"☎️ For emergencies only: Contact the guidance office immediately\n\n"
+                f"This session is designed to help you get back on track. Your cooperation is essential."
+            )
+
+            try:
+                # Create urgent notification
+                notification = Notification.objects.create(
+                    user=student.user,
+                    title=notification_title,
+                    message=notification_message,
+                    type='counseling_summons'  # Use summons type for urgency
+                )
+
+                logger.info(f"🚨 Emergency counseling notification sent to {student.user.username}")
+
+            except Exception as notif_error:
+                logger.error(f"⚠️ Failed to send emergency notification: {notif_error}")
+
+        logger.info(f"🚨 Emergency counseling scheduled for student {student.user.username} with {violation_count} violations")
+
+        return Response({
+            'success': True,
+            'message': 'Emergency counseling scheduled and urgent notification sent',
+            'counseling_log': {
+                'id': counseling_log.id,
+                'student_id': student.id,
+                'student_name': student_display_name,
+                'action_type': counseling_log.action_type,
+                'scheduled_date': counseling_log.scheduled_date.isoformat(),
+                'status': counseling_log.status,
+                'violation_count': violation_count,
+                'notification_sent': student.user is not None,
+                'urgency_level': 'emergency',
+            }
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error scheduling emergency counseling: {str(e)}")
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=500)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_counseling_logs(request):
+    """Get counseling logs with optional filtering"""
+    try:
+        if not hasattr(request.user, 'counselor'):
+            return Response({
+                'success': False,
+                'error': 'Counselor access required'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        student_id = request.GET.get('student_id')
+        school_year = request.GET.get('school_year')
+
+        logs_query = CounselingLog.objects.select_related('student__user', 'counselor__user').all()
+
+        if student_id:
+            logs_query = logs_query.filter(student_id=student_id)
+
+        if school_year and school_year != 'all':
+            logs_query = logs_query.filter(school_year=school_year)
+
+        logs = logs_query.order_by('-created_at')
+
+        logs_data = []
+        for log in logs:
+            # Get student name safely
+            if log.student and log.student.user:
+                student_name = f"{log.student.user.first_name} {log.student.user.last_name}".strip()
+                if not student_name:
+                    student_name = log.student.user.username
+            else:
+                student_name = f"Student #{log.student.id}" if log.student else "Unknown Student"
+
+            logs_data.append({
+                'id': log.id,
+                'student_id': log.student.id if log.student else None,
+                'student_name': student_name,
+                'action_type': log.action_type,
+                'description': log.description,
+                'status': log.status,
+                'priority': getattr(log, 'priority', 'medium'),
+                'scheduled_date': log.scheduled_date.isoformat() if log.scheduled_date else None,
+                'completion_date': log.completion_date.isoformat() if hasattr(log, 'completion_date') and log.completion_date else None,
+                'notes': log.notes,
+                'school_year': log.school_year,
+                'is_auto_generated': getattr(log, 'is_auto_generated', False),
+                'violation_count': getattr(log, 'violation_count', None),
+                'notification_sent': True,  # Assume sent if session exists
+                'created_at': log.created_at.isoformat(),
+            })
+
+        return Response({
+            'success': True,
+            'logs': logs_data,
+            'total': len(logs_data),
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error fetching counseling logs: {str(e)}")
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['PUT', 'PATCH'])
+@permission_classes([IsAuthenticated])
+def update_counseling_session(request, session_id):
+    """Update a counseling session (mark as completed/cancelled)"""
+    try:
+        if not hasattr(request.user, 'counselor'):
+            return Response({
+                'success': False,
+                'error': 'Counselor access required'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            session = CounselingLog.objects.get(id=session_id)
+        except CounselingLog.DoesNotExist:
+            return Response({
+                'success': False,
+                'error': 'Counseling session not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        data = request.data
+
+        # Update fields
+        if 'status' in data:
+            session.status = data['status']
+
+            # Set completion date if completed
+            if data['status'] == 'completed':
+                session.completion_date = timezone.now()
+
+        if 'completion_date' in data:
+            try:
+                session.completion_date = parse_datetime(data['completion_date'])
+            except (ValueError, TypeError):
+                pass
+
+        if 'notes' in data:
+            session.notes = data['notes']
+
+        session.save()
+
+        logger.info(f"✅ Counseling session updated: #{session.id} - Status: {session.status}")
+
+        return Response({
+            'success': True,
+            'message': 'Session updated successfully',
+            'session': {
+                'id': session.id,
+                'status': session.status,
+                'completion_date': session.completion_date.isoformat() if session.completion_date else None,
+                'notes': session.notes,
+            }
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error updating counseling session: {str(e)}")
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_high_risk_students(request):
+    """Get students with 3+ tallied violations who need counseling"""
+    try:
+        if not hasattr(request.user, 'counselor'):
+            return Response({
+                'success': False,
+                'error': 'Counselor access required'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        # Get students with 3+ violations
+        from django.db.models import Count, Q
+        from datetime import timedelta
+
+        high_violation_students = StudentViolationRecord.objects.filter(
+            school_year=get_current_school_year(),
+            status__in=['active', 'pending']
+        ).values('student').annotate(
+            violation_count=Count('id')
+        ).filter(violation_count__gte=3).values_list('student', flat=True)
+
+        # Get students who had counseling in the last 7 days
+        recent_cutoff = timezone.now() - timedelta(days=7)
+
+        try:
+            recently_counseled_students = CounselingLog.objects.filter(
+                created_at__gte=recent_cutoff,
+                status__in=['completed', 'scheduled']
+            ).values_list('student_id', flat=True).distinct()
+        except Exception as e:
+            logger.warning(f"⚠️ Could not check recent counseling: {e}")
+            recently_counseled_students = []
+
+        # Filter out recently counseled students
+        students_needing_counseling = Student.objects.filter(
+            id__in=high_violation_students,
+            school_year=get_current_school_year()
+        ).exclude(
+            id__in=recently_counseled_students
+        ).select_related('user')
+
+        students_data = []
+        for student in students_needing_counseling:
+            # Get violation count and types
+            violations = StudentViolationRecord.objects.filter(
+                student=student,
+                school_year=get_current_school_year(),
+                status__in=['active', 'pending']
+            ).select_related('violation_type')
+
+            violation_count = violations.count()
+            violation_types = list(violations.values_list('violation_type__name', flat=True))
+
+            # Determine priority based on violation count
+            if violation_count >= 5:
+                priority = 'high'
+            elif violation_count >= 4:
+                priority = 'medium'
+            else:
+                priority = 'low'
+
+            # Get student name
+            if student.user:
+                student_name = f"{student.user.first_name} {student.user.last_name}".strip()
+                if not student_name:
+                    student_name = student.user.username
+                first_name = student.user.first_name or ''
+                last_name = student.user.last_name or ''
+            else:
+                student_name = f"Student #{student.id}"
+                first_name = ''
+                last_name = ''
+
+            students_data.append({
+                'id': student.id,
+                'name': student_name,
+                'first_name': first_name,
+                'last_name': last_name,
+                'student_id': getattr(student, 'student_id', '') or f"STU{student.id:06d}",
+                'grade_level': getattr(student, 'grade_level', ''),
+                'section': getattr(student, 'section', ''),
+                'violation_count': violation_count,
+                'violation_types': violation_types,
+                'priority': priority,
+                'last_violation_date': violations.first().incident_date.isoformat() if violations.exists() else None,
+            })
+
+        # Sort by violation count (highest first)
+        students_data.sort(key=lambda x: x['violation_count'], reverse=True)
+
+        logger.info(f"📊 Found {len(students_data)} students needing counseling (3+ violations)")
+
+        return Response({
+            'success': True,
+            'students': students_data,
+            'total_count': len(students_data),
+            'criteria': {
+                'min_violations': 3,
+                'exclude_recent_counseling_days': 7,
+                'school_year': get_current_school_year()
+            }
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error getting high-risk students: {str(e)}")
+        logger.error(traceback.format_exc())
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=500)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def create_counseling_session(request):
+    """Create a real counseling session in the database"""
+    try:
+        # Verify counselor
+        if not hasattr(request.user, 'counselor'):
+            return Response({
+                'success': False,
+                'error': 'Counselor access required'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        counselor = request.user.counselor
+        data = request.data
+
+        # Get required data
+        student_id = data.get('student_id')
+        action_type = data.get('action_type', 'Counseling Session')
+        description = data.get('description', '')
+        scheduled_date = data.get('scheduled_date')
+        notes = data.get('notes', '')
+        school_year = data.get('school_year', get_current_school_year())
+        priority = data.get('priority', 'medium')
+        is_auto_generated = data.get('is_auto_generated', False)
+        violation_count = data.get('violation_count')
+
+        if not student_id:
+            return Response({
+                'success': False,
+                'error': 'Student ID is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # Get student
+        try:
+            student = Student.objects.get(id=student_id)
+        except Student.DoesNotExist:
+            return Response({
+                'success': False,
+                'error': 'Student not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        # Parse scheduled date
+        try:
+            if scheduled_date:
+                scheduled_datetime = parse_datetime(scheduled_date)
+                if scheduled_datetime is None:
+                    scheduled_datetime = datetime.fromisoformat(scheduled_date.replace('Z', '+00:00'))
+            else:
+                scheduled_datetime = timezone.now() + timedelta(days=1)  # Schedule for tomorrow
+        except (ValueError, TypeError):
+            scheduled_datetime = timezone.now() + timedelta(days=1)
+
+        # Create counseling session
+        counseling_session = CounselingLog.objects.create(
+            counselor=counselor,
+            student=student,
+            action_type=action_type,
+            description=description,
+            scheduled_date=scheduled_datetime,
+            status='scheduled',
+            notes=notes,
+            school_year=school_year,
+            priority=priority,
+            is_auto_generated=is_auto_generated,
+            violation_count=violation_count,
+        )
+
+        # ✅ Send notification to student if they have a user account
+        if student.user:
+            try:
+                notification_title = "🏫 Counseling Session Scheduled"
+                notification_message = f"""
+{action_type}
+
+{description}
+
+📅 Scheduled Date: {scheduled_datetime.strftime('%B %d, %Y at %I:%M %p')}
+📍 Location: Guidance Office (Main Building)
+
+Please ensure you arrive on time. Thank you for your cooperation.
+"""
+
+                Notification.objects.create(
+                    user=student.user,
+                    title=notification_title,
+                    message=notification_message.strip(),
+                    type='session_scheduled'
+                )
+
+                logger.info(f"✅ Notification sent to student {student.user.username}")
+                notification_sent = True
+            except Exception as notif_error:
+                logger.warning(f"⚠️ Could not send notification: {notif_error}")
+                notification_sent = False
+        else:
+            notification_sent = False
+
+        logger.info(f"✅ Counseling session created: {action_type} for {student.user.get_full_name() if student.user else student.id}")
+
+        return Response({
+            'success': True,
+            'message': 'Counseling session created successfully',
+            'counseling_log': {
+                'id': counseling_session.id,
+                'student_id': student.id,
+                'student_name': f"{student.user.first_name} {student.user.last_name}".strip() if student.user else f"Student #{student.id}",
+                'action_type': counseling_session.action_type,
+                'description': counseling_session.description,
+                'scheduled_date': counseling_session.scheduled_date.isoformat(),
+                'status': counseling_session.status,
+                'priority': counseling_session.priority,
+                'school_year': counseling_session.school_year,
+                'notification_sent': notification_sent,
+                'is_auto_generated': counseling_session.is_auto_generated,
+                'violation_count': counseling_session.violation_count,
+                'created_at': counseling_session.created_at.isoformat(),
+            }
+        }, status=status.HTTP_201_CREATED)
+
+    except Exception as e:
+        logger.error(f"❌ Error creating counseling session: {str(e)}")
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,451 @@
+"""
+Counselor dashboard and analytics.
+"""
+
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from django.db.models import Count
+import logging
+from django.db import models
+from .. import parallel
+from ..compression import cache_compressed
+from ..snapshots import get_snapshot
+from ..models import Student, Counselor, StudentReport, TeacherReport, ViolationType, StudentViolationRecord
+
+logger = logging.getLogger(__name__)
+
+
+def _compute_dashboard_analytics(counselor, school_year):
+    """Run every aggregate behind the counselor dashboard (cached as a snapshot)"""
+    # Base queries
+    students_query = Student.objects.all()
+    violations_query = StudentViolationRecord.objects.all()
+    student_reports_query = StudentReport.objects.all()
+    teacher_reports_query = TeacherReport.objects.all()
+
+    # ✅ Apply school year filter if provided
+    if school_year and school_year != 'all':
+        students_query = students_query.filter(school_year=school_year)
+        violations_query = violations_query.filter(student__school_year=school_year)
+        student_reports_query = student_reports_query.filter(school_year=school_year)
+        teacher_reports_query = teacher_reports_query.filter(school_year=school_year)
+        logger.info(f"🔍 Filtering by school year: {school_year}")
+
+    from datetime import datetime, timedelta
+    from django.db.models.functions import TruncMonth
+
+    six_months_ago = datetime.now() - timedelta(days=180)
+    seven_days_ago = datetime.now() - timedelta(days=7)
+
+    def monthly(query):
+        return lambda: list(query.filter(
+            created_at__gte=six_months_ago
+        ).annotate(
+            month=TruncMonth('created_at')
+        ).values('month').annotate(
+            count=Count('id')
+        ).order_by('month'))
+
+    # ✅ The aggregates are independent: run them concurrently (see api/parallel.py)
+    results = parallel.gather(
+        # Basic counts
+        total_students=students_query.count,
+        counselor_recorded_violations=violations_query.filter(
+            counselor=counselor,
+            related_student_report__isnull=True,
+            related_teacher_report__isnull=True
+        ).count,
+        student_reports_count=student_reports_query.count,
+        teacher_reports_count=teacher_reports_query.count,
+        total_violations=violations_query.count,
+        tallied_violations=violations_query.filter(
+            models.Q(related_student_report__isnull=False) |
+            models.Q(related_teacher_report__isnull=False) |
+            models.Q(counselor=counselor)
+        ).count,
+
+        # ✅ Report status breakdown for both types
+        pending_student_reports=student_reports_query.filter(status='pending').count,
+        pending_teacher_reports=teacher_reports_query.filter(status='pending').count,
+        under_review_student=student_reports_query.filter(status='under_review').count,
+        under_review_teacher=teacher_reports_query.filter(status='under_review').count,
+        reviewed_student=student_reports_query.filter(status='reviewed').count,
+        reviewed_teacher=teacher_reports_query.filter(status='reviewed').count,
+        resolved_student=student_reports_query.filter(status='resolved').count,
+        resolved_teacher=teacher_reports_query.filter(status='resolved').count,
+
+        # Violation analytics by type
+        violation_records=lambda: list(violations_query.select_related('violation_type')),
+
+        # Monthly trend (last 6 months) of both report types
+        student_monthly=monthly(student_reports_query),
+        teacher_monthly=monthly(teacher_reports_query),
+
+        # Recent activity (last 7 days)
+        recent_student_reports=student_reports_query.filter(created_at__gte=seven_days_ago).count,
+        recent_teacher_reports=teacher_reports_query.filter(created_at__gte=seven_days_ago).count,
+        recent_violations_count=violations_query.filter(incident_date__gte=seven_days_ago).count,
+
+        # ✅ Severity breakdown
+        severity_breakdown=lambda: list(violations_query.values('violation_type__severity_level').annotate(
+            count=Count('id')
+        ).order_by('violation_type__severity_level')),
+
+        # ✅ Grade-level breakdown
+        students_by_grade=lambda: list(students_query.values('grade_level').annotate(
+            count=Count('id')
+        ).order_by('grade_level')),
+        violations_by_grade=lambda: dict(violations_query.values_list('student__grade_level').annotate(
+            count=Count('id')
+        ).order_by()),
+
+        # ✅ Students with most violations (top 10)
+        top_violators=lambda: list(violations_query.values(
+            'student__id',
+            'student__student_id',
+            'student__user__first_name',
+            'student__user__last_name',
+            'student__grade_level',
+            'student__section'
+        ).annotate(
+            violation_count=Count('id')
+        ).order_by('-violation_count')[:10]),
+    )
+
+    total_students = results['total_students']
+    counselor_recorded_violations = results['counselor_recorded_violations']
+
+    # ✅ Count both StudentReport and TeacherReport
+    student_reports_count = results['student_reports_count']
+    teacher_reports_count = results['teacher_reports_count']
+    total_reports = student_reports_count + teacher_reports_count + counselor_recorded_violations
+
+    total_violations = results['total_violations']
+    tallied_violations = results['tallied_violations']
+
+    pending_student_reports = results['pending_student_reports']
+    pending_teacher_reports = results['pending_teacher_reports']
+    pending_reports = pending_student_reports + pending_teacher_reports
+
+    under_review_student = results['under_review_student']
+    under_review_teacher = results['under_review_teacher']
+    under_review_reports = under_review_student + under_review_teacher
+
+    reviewed_student = results['reviewed_student']
+    reviewed_teacher = results['reviewed_teacher']
+    reviewed_reports = reviewed_student + reviewed_teacher
+
+    resolved_student = results['resolved_student']
+    resolved_teacher = results['resolved_teacher']
+    resolved_reports = resolved_student + resolved_teacher
+
+    # Violation analytics by type
+    violation_type_counts = {}
+
+    for record in results['violation_records']:
+        if record.violation_type:
+            type_name = record.violation_type.name
+            if type_name not in violation_type_counts:
+                violation_type_counts[type_name] = {
+                    'count': 0,
+                    'category': record.violation_type.category,
+                    'severity': record.violation_type.severity_level
+                }
+            violation_type_counts[type_name]['count'] += 1
+
+    # Sort by count and get top 5
+    top_violations = sorted(
+        violation_type_counts.items(),
+        key=lambda x: x[1]['count'],
+        reverse=True
+    )[:5]
+
+    # Combine monthly data
+    monthly_data = {}
+    for item in results['student_monthly']:
+        month_key = item['month'].strftime('%Y-%m')
+        if month_key not in monthly_data:
+            monthly_data[month_key] = {'month': item['month'], 'student_reports': 0, 'teacher_reports': 0}
+        monthly_data[month_key]['student_reports'] = item['count']
+
+    for item in results['teacher_monthly']:
+        month_key = item['month'].strftime('%Y-%m')
+        if month_key not in monthly_data:
+            monthly_data[month_key] = {'month': item['month'], 'student_reports': 0, 'teacher_reports': 0}
+        monthly_data[month_key]['teacher_reports'] = item['count']
+
+    monthly_trends = []
+    for key in sorted(monthly_data.keys()):
+        data = monthly_data[key]
+        monthly_trends.append({
+            'month': data['month'].strftime('%B %Y'),
+            'student_reports': data['student_reports'],
+            'teacher_reports': data['teacher_reports'],
+            'total': data['student_reports'] + data['teacher_reports']
+        })
+
+    # Status distribution for charts
+    status_distribution = [
+        {'status': 'Pending', 'count': pending_reports},
+        {'status': 'Under Review', 'count': under_review_reports},
+        {'status': 'Reviewed', 'count': reviewed_reports},
+        {'status': 'Resolved', 'count': resolved_reports},
+    ]
+
+    recent_student_reports = results['recent_student_reports']
+    recent_teacher_reports = results['recent_teacher_reports']
+    recent_reports_count = recent_student_reports + recent_teacher_reports
+    recent_violations_count = results['recent_violations_count']
+
+    severity_data = {
+        'low': 0,
+        'medium': 0,
+        'high': 0,
+        'critical': 0
+    }
+    for item in results['severity_breakdown']:
+        level = (item.get('violation_type__severity_level') or 'medium').lower()
+        severity_data[level] = item['count']
+
+    # ✅ One grouped query for violations per grade instead of one count per grade
+    violations_by_grade = results['violations_by_grade']
+    grade_distribution = []
+    for item in results['students_by_grade']:
+        grade = item['grade_level'] or 'Unknown'
+        grade_distribution.append({
+            'grade_level': grade,
+            'student_count': item['count'],
+            'violation_count': violations_by_grade.get(grade, 0)
+        })
+
+    top_violators_data = []
+    for item in results['top_violators']:
+        full_name = f"{item['student__user__first_name']} {item['student__user__last_name']}".strip()
+        top_violators_data.append({
+            'student_id': item['student__student_id'],
+            'name': full_name or 'Unknown',
+            'grade_level': item['student__grade_level'],
+            'section': item['student__section'],
+            'violation_count': item['violation_count']
+        })
+
+    logger.info(f"✅ Dashboard analytics retrieved for counselor {counselor.user.username}")
+    logger.info(f"   Total Students: {total_students}")
+    logger.info(f"   Student Reports: {student_reports_count}")
+    logger.info(f"   Teacher Reports: {teacher_reports_count}")
+    logger.info(f"   Counselor-Recorded: {counselor_recorded_violations}")
+    logger.info(f"   Total Reports: {total_reports}")
+    logger.info(f"   Total Violations: {total_violations}")
+    logger.info(f"   Tallied Violations: {tallied_violations}")
+
+    return {
+        'overview': {
+            'total_students': total_students,
+            'total_reports': total_reports,
+            'student_reports': student_reports_count,
+            'teacher_reports': teacher_reports_count,
+            'counselor_recorded': counselor_recorded_violations,  # ✅ NEW
+            'total_violations': total_violations,
+            'tallied_violations': tallied_violations,  # ✅ NEW
+            'pending_reports': pending_reports,
+        },
+        'report_status': {
+            'pending': pending_reports,
+            'under_review': under_review_reports,
+            'reviewed': reviewed_reports,
+            'resolved': resolved_reports,
+        },
+        'report_breakdown': {
+            'student_reports': {
+                'total': student_reports_count,
+                'pending': pending_student_reports,
+                'under_review': under_review_student,
+                'reviewed': reviewed_student,
+                'resolved': resolved_student,
+            },
+            'teacher_reports': {
+                'total': teacher_reports_count,
+                'pending': pending_teacher_reports,
+                'under_review': under_review_teacher,
+                'reviewed': reviewed_teacher,
+                'resolved': resolved_teacher,
+            }
+        },
+        'status_distribution': status_distribution,
+        'severity_breakdown': severity_data,
+        'grade_distribution': grade_distribution,
+        'top_violations': [
+            {
+                'name': name,
+                'count': data['count'],
+                'category': data['category'],
+                'severity': data['severity']
+            }
+            for name, data in top_violations
+        ],
+        'top_violators': top_violators_data,
+        'monthly_trends': monthly_trends,
+        'recent_activity': {
+            'reports_this_week': recent_reports_count,
+            'student_reports_this_week': recent_student_reports,
+            'teacher_reports_this_week': recent_teacher_reports,
+            'violations_this_week': recent_violations_count,
+        }
+    }
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@cache_compressed
+def counselor_dashboard_analytics(request):
+    """Get comprehensive analytics for counselor dashboard"""
+    try:
+        # Verify counselor authentication
+        try:
+            counselor = Counselor.objects.get(user=request.user)
+        except Counselor.DoesNotExist:
+            return Response({
+                'success': False,
+                'error': 'Counselor profile not found'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        # ✅ Get school year filter from query params
+        school_year = request.GET.get('school_year', None)
+        logger.info(f"📊 Fetching dashboard analytics for school year: {school_year or 'all'}")
+
+        # ✅ Serve a cached snapshot per (school year, counselor); one worker recomputes
+        school_year_key = school_year if school_year and school_year != 'all' else 'all'
+        analytics, computed_at, is_stale = get_snapshot(
+            f'dashboard_analytics:{school_year_key}:{counselor.id}',
+            lambda: _compute_dashboard_analytics(counselor, school_year),
+        )
+
+        return Response({
+            'success': True,
+            'analytics': analytics,
+            'filtered_by_school_year': school_year if school_year and school_year != 'all' else None,
+            'snapshot': {
+                'computed_at': computed_at,
+                'is_stale': is_stale,
+            },
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error fetching dashboard analytics: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def counselor_dashboard(request):
+    """Get counselor dashboard data"""
+    try:
+        if not hasattr(request.user, 'counselor'):
+            return Response({
+                'success': False,
+                'error': 'Access denied. Counselor role required.'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        # Basic dashboard data
+        return Response({
+            'success': True,
+            'message': 'Counselor dashboard data retrieved',
+            'data': {
+                'total_students': Student.objects.count(),
+                'total_reports': Report.objects.count(),
+                'pending_reports': Report.objects.filter(status='pending').count(),
+                'violation_types_count': ViolationType.objects.count(),
+            }
+        })
+
+    except Exception as e:
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_counselor_dashboard_stats(request):
+    """Get dashboard statistics with optional school year filter"""
+    try:
+        counselor = Counselor.objects.filter(user=request.user).first()
+        if not counselor:
+            return Response({
+                'success': False,
+                'error': 'Counselor profile not found'
+            }, status=404)
+
+        # ✅ Get school year from query params
+        school_year = request.GET.get('school_year', None)
+
+        # Base queries
+        students_query = Student.objects.all()
+        violations_query = StudentViolationRecord.objects.all()
+        reports_query = StudentReport.objects.all()
+
+        # Filter by school year if provided
+        if school_year and school_year != 'all':
+            students_query = students_query.filter(school_year=school_year)
+            violations_query = violations_query.filter(school_year=school_year)
+            reports_query = reports_query.filter(reported_student__school_year=school_year)
+            logger.info(f"📅 Filtering dashboard stats by school year: {school_year}")
+
+        # ✅ Calculate statistics concurrently (see api/parallel.py)
+        results = parallel.gather(
+            total_students=students_query.count,
+            total_violations=violations_query.count,
+            total_reports=reports_query.count,
+            pending_reports=reports_query.filter(status='pending').count,
+            # Violations by severity
+            violations_by_severity=lambda: list(violations_query.values('severity_level').annotate(
+                count=Count('id')
+            )),
+            # Recent violations (last 10)
+            recent_violations=lambda: list(violations_query.select_related(
+                'student__user',
+                'violation_type'
+            ).order_by('-incident_date')[:10]),
+        )
+
+        recent_violations_data = []
+        for v in results['recent_violations']:
+            recent_violations_data.append({
+                'id': v.id,
+                'student_name': v.student.user.get_full_name(),
+                'student_id': v.student.student_id,
+                'violation_type': v.violation_type.name if v.violation_type else 'Unknown',
+                'severity_level': v.severity_level,
+                'incident_date': v.incident_date.isoformat(),
+                'school_year': v.school_year,
+            })
+
+        return Response({
+            'success': True,
+            'statistics': {
+                'total_students': results['total_students'],
+                'total_violations': results['total_violations'],
+                'total_reports': results['total_reports'],
+                'pending_reports': results['pending_reports'],
+                'violations_by_severity': results['violations_by_severity'],
+                'recent_violations': recent_violations_data,
+            },
+            'filtered_by_school_year': school_year if school_year and school_year != 'all' else None,
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error fetching dashboard stats: {e}")
+        import traceback
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=500)
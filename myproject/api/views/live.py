@@ -0,0 +1,165 @@
+"""
+Async views for I/O-bound endpoints.
+
+Served by an ASGI server (see myproject/asgi.py), a request waiting in one of
+these views - a notification long-poll sleeping between checks, a bootstrap
+waiting on its queries - is a suspended coroutine, not a blocked worker, so
+one process can hold many of them open. Under WSGI they still work (each
+request runs in its own event loop) but hold the worker like any sync view.
+
+DRF's ``@api_view`` is sync only, so these are plain Django views;
+``async_api_view`` gives them the same token authentication and
+``{'success': ..., 'error': ...}`` responses as the rest of the API.
+
+Django runs ORM calls from async code on a single thread per request, so
+the queries of one request still run one after another; what's saved is
+the worker, not database time.
+"""
+
+import asyncio
+import functools
+import logging
+import traceback
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import AuthenticationFailed
+
+from .. import renderers
+from ..authentication import ExpiringTokenAuthentication
+from ..models import Notification
+from .system import (
+    BOOTSTRAP_NOTIFICATION_LIMIT, _bootstrap_profile, _bootstrap_reports,
+    _bootstrap_shared, _notification_data,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_TIMEOUT = 25
+DEFAULT_POLL_INTERVAL = 2
+
+
+def _json(data, status=200):
+    return HttpResponse(renderers.dumps(data), content_type='application/json', status=status)
+
+
+def _authenticate(request):
+    """The user of an ``Authorization: Token <key>`` header"""
+    auth = request.META.get('HTTP_AUTHORIZATION', '').split()
+    if len(auth) != 2 or auth[0].lower() != 'token':
+        raise AuthenticationFailed('Authentication credentials were not provided.')
+    user, _ = ExpiringTokenAuthentication().authenticate_credentials(auth[1])
+    return user
+
+
+def async_api_view(methods):
+    """Method check, token authentication and error handling for an async view"""
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                return _json({'detail': f'Method "{request.method}" not allowed.'}, status=405)
+            try:
+                request.user = await sync_to_async(_authenticate)(request)
+            except AuthenticationFailed as e:
+                return _json({'detail': str(e.detail)}, status=401)
+            try:
+                return await view(request, *args, **kwargs)
+            except Exception as e:
+                logger.error(f"❌ Error in {view.__name__}: {str(e)}")
+                traceback.print_exc()
+                return _json({'success': False, 'error': str(e)}, status=500)
+
+        wrapper.csrf_exempt = True
+        return wrapper
+    return decorator
+
+
+async def _alist(queryset):
+    return [obj async for obj in queryset]
+
+
+@async_api_view(['GET'])
+async def notifications_poll(request):
+    """
+    Long-poll for new notifications: answers as soon as the user has
+    notifications created after ``?since=`` (ISO datetime, default now), or
+    after ``?timeout=`` seconds (at most NOTIFICATION_POLL_TIMEOUT) with an
+    empty list. Poll again with the returned ``server_time`` as ``since``.
+    """
+    max_timeout = getattr(settings, 'NOTIFICATION_POLL_TIMEOUT', DEFAULT_POLL_TIMEOUT)
+    interval = getattr(settings, 'NOTIFICATION_POLL_INTERVAL', DEFAULT_POLL_INTERVAL)
+    try:
+        timeout = max(0, min(float(request.GET.get('timeout', max_timeout)), max_timeout))
+        since = parse_datetime(request.GET.get('since', ''))
+    except ValueError:
+        return _json({
+            'success': False,
+            'error': 'Invalid timeout or since'
+        }, status=400)
+    server_time = timezone.now()
+    if since is None:
+        since = server_time
+    elif timezone.is_naive(since):
+        since = timezone.make_aware(since)
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    user_notifications = Notification.objects.filter(user=request.user)
+    while True:
+        server_time = timezone.now()
+        notifications, unread_count = await asyncio.gather(
+            _alist(user_notifications.filter(created_at__gt=since).order_by('-created_at')[:BOOTSTRAP_NOTIFICATION_LIMIT]),
+            user_notifications.filter(is_read=False).acount(),
+        )
+        remaining = deadline - loop.time()
+        if notifications or remaining <= 0:
+            break
+        await asyncio.sleep(min(interval, remaining))
+
+    return _json({
+        'success': True,
+        'notifications': [_notification_data(n) for n in notifications],
+        'unread_count': unread_count,
+        'server_time': server_time,
+    })
+
+
+@async_api_view(['GET'])
+async def async_bootstrap(request):
+    """Async version of GET /api/bootstrap/ (same response)"""
+    # ✅ Role and profile in one query (reverse one-to-ones are joined)
+    user = await User.objects.select_related('student', 'teacher', 'counselor').aget(pk=request.user.pk)
+
+    role, profile = await sync_to_async(_bootstrap_profile)(user)
+    if role is None:
+        return _json({
+            'success': False,
+            'error': 'User role not found'
+        }, status=403)
+
+    user_notifications = Notification.objects.filter(user=user)
+    notifications, unread_count, reports, shared = await asyncio.gather(
+        _alist(user_notifications.order_by('-created_at')[:BOOTSTRAP_NOTIFICATION_LIMIT]),
+        user_notifications.filter(is_read=False).acount(),
+        sync_to_async(_bootstrap_reports)(user, role),
+        sync_to_async(_bootstrap_shared)(),
+    )
+
+    data = {
+        'success': True,
+        'role': role,
+        'profile': profile,
+        'notifications': [_notification_data(n) for n in notifications],
+        'unread_count': unread_count,
+    }
+    data.update(reports)
+    data.update(shared)
+
+    logger.info(f"🚀 Bootstrap data sent to {user.username} ({role}, async)")
+
+    return _json(data)
@@ -0,0 +1,289 @@
+"""
+Notification inbox endpoints.
+"""
+
+from django.contrib.auth.models import User
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+import logging
+from .. import metrics
+from ..models import Counselor, Notification
+from .common import create_notification
+
+logger = logging.getLogger(__name__)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def teacher_notifications(request):
+    """Get notifications for the teacher"""
+    try:
+        notifications = Notification.objects.filter(
+            user=request.user
+        ).order_by('-created_at')
+
+        notifications_data = []
+        for notification in notifications:
+            notifications_data.append({
+                'id': notification.id,
+                'title': notification.title,
+                'message': notification.message,
+                'type': getattr(notification, 'type', 'info'),
+                'is_read': notification.is_read,
+                'created_at': notification.created_at.isoformat(),
+                'related_report_id': notification.related_report.id if hasattr(notification, 'related_report') and notification.related_report else None,
+            })
+
+        return Response({
+            'success': True,
+            'notifications': notifications_data,
+            'unread_count': notifications.filter(is_read=False).count(),
+            'total_count': len(notifications_data)
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error fetching teacher notifications: {str(e)}")
+        return Response({
+            'success': False,
+            'error': str(e),
+            'notifications': []
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+# Student Views
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def student_notifications(request):
+    try:
+        notifications = Notification.objects.filter(
+            user=request.user
+        ).order_by('-created_at')
+
+        notifications_data = []
+        for notification in notifications:
+            notifications_data.append({
+                'id': notification.id,
+                'title': notification.title,
+                'message': notification.message,
+                'type': getattr(notification, 'type', 'info'),
+                'is_read': notification.is_read,
+                'created_at': notification.created_at.isoformat(),
+            })
+
+        return Response({
+            'success': True,
+            'notifications': notifications_data,
+            'unread_count': notifications.filter(is_read=False).count()
+        })
+
+    except Exception as e:
+        logger.error(f"Student notifications error: {str(e)}")
+        return Response({
+            'success': False,
+            'error': 'Failed to fetch notifications'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def notifications_list(request):
+    """Get all notifications for the authenticated user"""
+    try:
+        notifications = Notification.objects.filter(
+            user=request.user
+        ).order_by('-created_at')
+
+        notifications_data = []
+        for notification in notifications:
+            notifications_data.append({
+                'id': notification.id,
+                'title': notification.title,
+                'message': notification.message,
+                'type': notification.type if hasattr(notification, 'type') else 'general',
+                'is_read': notification.is_read,
+                'created_at': notification.created_at.isoformat(),
+                'related_report_id': notification.related_report.id if hasattr(notification, 'related_report') and notification.related_report else None,
+            })
+
+        return Response({
+            'success': True,
+            'notifications': notifications_data,
+            'unread_count': notifications.filter(is_read=False).count(),
+            'total_count': len(notifications_data)
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error fetching notifications: {str(e)}")
+        return Response({
+            'success': False,
+            'error': str(e),
+            'notifications': [],
+            'unread_count': 0,
+            'total_count': 0
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['PATCH'])
+@permission_classes([IsAuthenticated])
+def notification_mark_read(request, notification_id):
+    """Mark a single notification as read"""
+    try:
+        notification = Notification.objects.get(
+            id=notification_id,
+            user=request.user
+        )
+
+        notification.is_read = True
+        notification.save()
+
+        return Response({
+            'success': True,
+            'message': 'Notification marked as read'
+        })
+
+    except Notification.DoesNotExist:
+        return Response({
+            'success': False,
+            'error': 'Notification not found'
+        }, status=status.HTTP_404_NOT_FOUND)
+    except Exception as e:
+        logger.error(f"❌ Error marking notification as read: {str(e)}")
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def notifications_mark_all_read(request):
+    """Mark all notifications as read for the authenticated user"""
+    try:
+        updated_count = Notification.objects.filter(
+            user=request.user,
+            is_read=False
+        ).update(is_read=True)
+
+        return Response({
+            'success': True,
+            'message': f'{updated_count} notification(s) marked as read',
+            'updated_count': updated_count
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error marking all notifications as read: {str(e)}")
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['DELETE'])
+@permission_classes([IsAuthenticated])
+def notification_delete(request, notification_id):
+    """Delete a notification"""
+    try:
+        notification = Notification.objects.get(
+            id=notification_id,
+            user=request.user
+        )
+
+        notification.delete()
+
+        return Response({
+            'success': True,
+            'message': 'Notification deleted'
+        }, status=status.HTTP_204_NO_CONTENT)
+
+    except Notification.DoesNotExist:
+        return Response({
+            'success': False,
+            'error': 'Notification not found'
+        }, status=status.HTTP_404_NOT_FOUND)
+    except Exception as e:
+        logger.error(f"❌ Error deleting notification: {str(e)}")
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def notifications_unread_count(request):
+    """Get unread notification count"""
+    try:
+        unread_count = Notification.objects.filter(
+            user=request.user,
+            is_read=False
+        ).count()
+
+        return Response({
+            'success': True,
+            'unread_count': unread_count
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error fetching unread count: {str(e)}")
+        return Response({
+            'success': False,
+            'error': str(e),
+            'unread_count': 0
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def send_bulk_notifications(request):
+    """Send notifications to multiple users"""
+    try:
+        # Verify counselor
+        try:
+            counselor = Counselor.objects.get(user=request.user)
+        except Counselor.DoesNotExist:
+            return Response({
+                'success': False,
+                'error': 'Only counselors can send bulk notifications'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        user_ids = request.data.get('user_ids', [])
+        title = request.data.get('title')
+        message = request.data.get('message')
+        notification_type = request.data.get('type', 'general')
+
+        if not user_ids or not title or not message:
+            return Response({
+                'success': False,
+                'error': 'user_ids, title, and message are required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        notifications_created = 0
+        users = User.objects.filter(id__in=user_ids)
+
+        for user in users:
+            notification = create_notification(
+                user=user,
+                title=title,
+                message=message,
+                notification_type=notification_type
+            )
+            if notification:
+                notifications_created += 1
+
+        logger.info(f"✅ Sent {notifications_created} bulk notifications")
+        metrics.record_notification_fanout('bulk', notifications_created)
+
+        return Response({
+            'success': True,
+            'message': f'{notifications_created} notification(s) sent successfully',
+            'count': notifications_created
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error sending bulk notifications: {str(e)}")
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
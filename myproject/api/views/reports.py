@@ -0,0 +1,1752 @@
+"""
+Student and teacher incident reports, status changes and the counselor queue.
+"""
+
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.db.models import Q
+import logging
+from django.db import models
+import traceback
+import base64
+import binascii
+from .. import metrics
+from ..fieldsets import Field, Fieldset, FieldsetError
+from ..violation_registry import violation_types as violation_registry
+from ..idempotency import idempotent
+from .. import concurrency
+from .. import triage
+from .. import jobs
+from ..models import Student, Counselor, StudentReport, TeacherReport, Notification, ViolationType
+from .common import create_notification, get_current_school_year
+
+logger = logging.getLogger(__name__)
+
+
+def _display_name(user):
+    return f"{user.first_name} {user.last_name}".strip() or user.username
+
+
+def _plain(*columns):
+    """Field that returns a single model column unchanged"""
+    return Field(columns, lambda report: getattr(report, columns[0]))
+
+
+# ✅ Every key teacher_reports can return; ?fields= picks a subset
+TEACHER_REPORT_FIELDSET = Fieldset({
+    'id': _plain('id'),
+    'title': _plain('title'),
+    'description': _plain('description'),  # ✅ This is the field that exists in TeacherReport model
+    'content': Field(('description',), lambda r: r.description),  # ✅ Also provide as 'content' for frontend compatibility
+    'status': _plain('status'),
+    'severity': _plain('severity'),
+    'verification_status': _plain('verification_status'),
+    'created_at': _plain('created_at'),
+    'updated_at': _plain('updated_at'),
+    'incident_date': _plain('incident_date'),
+    'location': _plain('location'),
+    'school_year': _plain('school_year'),
+
+    # Student info
+    'reported_student': Field(
+        ('reported_student__user__first_name', 'reported_student__user__last_name', 'reported_student__user__username',
+         'reported_student__student_id', 'reported_student__grade_level', 'reported_student__section',
+         'reported_student__strand'),
+        lambda r: {
+            'id': r.reported_student.id,
+            'name': _display_name(r.reported_student.user),
+            'student_id': r.reported_student.student_id,
+            'grade_level': r.reported_student.grade_level,
+            'section': r.reported_student.section,
+            'strand': r.reported_student.strand,
+        } if r.reported_student else None,
+    ),
+
+    # Violation type info
+    'violation_type': Field(
+        ('violation_type__name', 'violation_type__category', 'violation_type__severity_level'),
+        lambda r: {
+            'id': r.violation_type.id,
+            'name': r.violation_type.name,
+            'category': r.violation_type.category,
+            'severity_level': r.violation_type.severity_level,
+        } if r.violation_type else None,
+    ),
+
+    # Custom violation if any
+    'custom_violation': _plain('custom_violation'),
+
+    # Counselor info
+    'assigned_counselor': Field(
+        ('assigned_counselor__user__first_name', 'assigned_counselor__user__last_name',
+         'assigned_counselor__user__username'),
+        lambda r: {
+            'id': r.assigned_counselor.id,
+            'name': _display_name(r.assigned_counselor.user),
+        } if r.assigned_counselor else None,
+    ),
+
+    # Additional details
+    'counselor_notes': _plain('counselor_notes'),
+    'witnesses': _plain('witnesses'),
+    'follow_up_required': _plain('follow_up_required'),
+    'parent_notified': _plain('parent_notified'),
+    'disciplinary_action': _plain('disciplinary_action'),
+    'subject_involved': _plain('subject_involved'),
+
+    # Counseling info
+    'requires_counseling': _plain('requires_counseling'),
+    'counseling_completed': _plain('counseling_completed'),
+    'counseling_date': _plain('counseling_date'),
+    'counseling_notes': _plain('counseling_notes'),
+
+    # Summons info
+    'summons_sent_at': _plain('summons_sent_at'),
+    'summons_sent_to_student': _plain('summons_sent_to_student'),
+
+    # Verification info
+    'verified_by': Field(
+        ('verified_by__first_name', 'verified_by__last_name', 'verified_by__username'),
+        lambda r: {
+            'id': r.verified_by.id,
+            'name': _display_name(r.verified_by),
+        } if r.verified_by else None,
+    ),
+    'verified_at': _plain('verified_at'),
+    'verification_notes': _plain('verification_notes'),
+
+    # Review info
+    'is_reviewed': _plain('is_reviewed'),
+    'reviewed_at': _plain('reviewed_at'),
+    'resolved_at': _plain('resolved_at'),
+
+    # ✅ Send back as If-Match when updating the report
+    'version': _plain('version'),
+})
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+@idempotent('teacher_report')
+def teacher_reports(request):
+    """Get or create teacher reports"""
+
+    if request.method == 'GET':
+        try:
+            # Check if user is a teacher
+            if not hasattr(request.user, 'teacher'):
+                return Response({
+                    'success': False,
+                    'error': 'Only teachers can view teacher reports'
+                }, status=403)
+
+            teacher = request.user.teacher
+
+            # ✅ Only fetch and serialize the columns the client asked for (?fields=)
+            fields = TEACHER_REPORT_FIELDSET.requested(request)
+            reports = TEACHER_REPORT_FIELDSET.apply(
+                TeacherReport.objects.filter(reporter_teacher=teacher),
+                fields
+            ).order_by('-created_at')
+
+            reports_data = [TEACHER_REPORT_FIELDSET.serialize(report, fields) for report in reports]
+
+            logger.info(f"✅ Retrieved {len(reports_data)} teacher reports for {teacher.user.username}")
+
+            return Response({
+                'success': True,
+                'reports': reports_data,
+                'count': len(reports_data),
+                'message': f'Retrieved {len(reports_data)} teacher reports'
+            })
+
+        except FieldsetError as e:
+            return Response(e.as_response_data(), status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.error(f"❌ Error fetching teacher reports: {str(e)}")
+            traceback.print_exc()
+            return Response({
+                'success': False,
+                'error': str(e),
+                'reports': []
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    elif request.method == 'POST':
+        # Handle report submission - your existing POST code
+        try:
+            # Check if user is a teacher
+            if not hasattr(request.user, 'teacher'):
+                return Response({
+                    'success': False,
+                    'error': 'Only teachers can submit reports'
+                }, status=403)
+
+            teacher = request.user.teacher
+            data = request.data
+
+            logger.info(f"📝 Teacher {teacher.user.username} submitting report")
+            logger.info(f"📝 Report data received: {data}")
+
+            # Get required fields
+            title = data.get('title', '').strip()
+            description = data.get('description', '').strip()  # ✅ Use description field
+
+            if not title or not description:
+                return Response({
+                    'success': False,
+                    'error': 'Title and description are required'
+                }, status=400)
+
+            # Get student info
+            student_id = data.get('student_id')
+            student_name = data.get('student_name', '').strip()
+
+            # Handle different student scenarios
+            reported_student = None
+
+            if student_id:
+                # Student from advising section
+                try:
+                    reported_student = Student.objects.get(id=student_id)
+                    logger.info(f"✅ Found student from advising section: {reported_student.user.username}")
+                except Student.DoesNotExist:
+                    return Response({
+                        'success': False,
+                        'error': f'Student with ID {student_id} not found'
+                    }, status=404)
+            elif student_name and data.get('is_other_student', False):
+                # Other student - try to find by name or create placeholder
+                logger.info(f"🔍 Looking for other student: {student_name}")
+
+                # Try to find existing student by name
+                name_parts = student_name.split()
+                if len(name_parts) >= 2:
+                    first_name = name_parts[0]
+                    last_name = ' '.join(name_parts[1:])
+
+                    existing_students = Student.objects.filter(
+                        user__first_name__icontains=first_name,
+                        user__last_name__icontains=last_name
+                    ).select_related('user')
+
+                    if existing_students.exists():
+                        reported_student = existing_students.first()
+                        logger.info(f"✅ Found existing student: {reported_student.user.username}")
+                    else:
+                        logger.info(f"⚠️ Student '{student_name}' not found in system")
+                        # For now, we'll create the report without linking to a specific student
+                        # The counselor can link it later during review
+                else:
+                    logger.warning(f"⚠️ Invalid student name format: '{student_name}'")
+            else:
+                return Response({
+                    'success': False,
+                    'error': 'Student information is required'
+                }, status=400)
+
+            # Get violation type
+            violation_type_id = data.get('violation_type_id')
+            violation_type = None
+
+            if violation_type_id:
+                try:
+                    violation_type = violation_registry.get(violation_type_id)
+                except ViolationType.DoesNotExist:
+                    logger.warning(f"⚠️ Violation type {violation_type_id} not found")
+
+            # Get current school year
+            current_school_year = get_current_school_year()
+
+            # Create teacher report
+            teacher_report = TeacherReport.objects.create(
+                title=title,
+                description=description,  # ✅ Save to description field
+                reporter_teacher=teacher,
+                reported_student=reported_student,
+                violation_type=violation_type,
+                custom_violation=data.get('custom_violation', '').strip() if not violation_type else None,
+                severity=data.get('severity', 'medium'),
+                location=data.get('location', '').strip(),
+                incident_date=timezone.now(),  # You can parse this from frontend if needed
+                school_year=current_school_year,
+                status='pending',
+                verification_status='pending',
+                requires_counseling=True,
+            )
+
+            logger.info(f"✅ Teacher report created: ID {teacher_report.id}")
+
+            # Send notification to counselors
+            try:
+                notification_title = f"📋 New Teacher Report: {title}"
+                notification_message = f"""
+New teacher report submitted by {teacher.user.get_full_name() or teacher.user.username}
+
+Student: {student_name}
+Violation: {title}
+Status: Pending Review
+
+Please review this report in the counselor dashboard.
+                """.strip()
+
+                # Fan-out runs in the job worker when the queue is enabled
+                jobs.enqueue('notifications.notify_counselors', {
+                    'title': notification_title,
+                    'message': notification_message,
+                    'notification_type': 'report_submitted',
+                    'fanout_source': 'teacher_report',
+                    'related_teacher_report_id': teacher_report.id,
+                })
+
+            except Exception as notif_error:
+                logger.error(f"⚠️ Error sending notifications: {notif_error}")
+
+            return Response({
+                'success': True,
+                'message': 'Teacher report submitted successfully',
+                'report': {
+                    'id': teacher_report.id,
+                    'title': teacher_report.title,
+                    'description': teacher_report.description,  # ✅ Return description
+                    'status': teacher_report.status,
+                    'student_name': student_name,
+                    'created_at': teacher_report.created_at.isoformat(),
+                }
+            }, status=201)
+
+        except Exception as e:
+            logger.error(f"❌ Error creating teacher report: {str(e)}")
+            traceback.print_exc()
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=500)
+
+
+def _student_own_report_data(report, student):
+    # Determine if it's a self-report or peer-report
+    is_self_report = (report.reported_student and
+                    report.reported_student.id == student.id)
+
+    # Get reported student name
+    if report.reported_student:
+        reported_student_name = (
+            report.reported_student.user.get_full_name() or
+            report.reported_student.user.username
+        )
+    else:
+        reported_student_name = 'Unknown'
+
+    report_dict = {
+        'id': report.id,
+        'report_type': 'self_report' if is_self_report else 'peer_report',
+        'title': report.title,
+        'description': report.description,
+        'content': report.description,
+        'violation_type': (
+            report.violation_type.name
+            if report.violation_type
+            else report.custom_violation
+        ),
+        'custom_violation': report.custom_violation,
+        'severity': report.severity,
+        'status': report.status,
+        'verification_status': report.verification_status,
+        'school_year': report.school_year,
+        'location': report.location or '',
+        'category': report.violation_type.category if report.violation_type else None,
+        'role_in_report': 'reporter',
+        'reporter': student.user.get_full_name() or student.user.username,
+        'reported_student': reported_student_name,
+        'is_self_report': is_self_report,
+        'created_at': report.created_at.isoformat(),
+        'incident_date': report.incident_date.isoformat() if report.incident_date else None,
+
+        # ✅ CRITICAL: Add reporter info for frontend filtering
+        'reported_by_id': student.user.id,
+        'reported_by_student_id': student.id,
+        'reported_by_name': student.user.get_full_name() or student.user.username,
+    }
+    return report_dict
+
+
+@csrf_exempt
+@api_view(['POST', 'GET'])
+@permission_classes([IsAuthenticated])
+@idempotent('student_report')
+def student_reports(request):
+    """Handle student report submissions and retrieval"""
+
+    if request.method == 'POST':
+        # Handle report submission
+        try:
+            # Get the student instance
+            try:
+                student = Student.objects.get(user=request.user)
+            except Student.DoesNotExist:
+                logger.error(f"❌ Student profile not found for user: {request.user.username}")
+                return Response({
+                    'success': False,
+                    'error': 'Student profile not found. Please contact administration.'
+                }, status=400)
+
+            # Extract data from request
+            title = request.data.get('title', 'Incident Report')
+            content = request.data.get('content', '')
+            description = request.data.get('description', content)  # Use content as description if not provided
+            violation_type_id = request.data.get('violation_type_id')
+            custom_violation = request.data.get('custom_violation')
+            incident_date = request.data.get('incident_date')
+            reported_student_name = request.data.get('reported_student_name', '')
+            severity = request.data.get('severity', 'medium')
+            location = request.data.get('location', '')
+            witnesses = request.data.get('witnesses', '')
+
+            logger.info(f"📝 Report submission by: {student.user.username}")
+            logger.info(f"📝 Student being reported: {reported_student_name}")
+            logger.info(f"📝 Violation type ID: {violation_type_id}")
+
+            # Validate required fields
+            if not title or not description:
+                return Response({
+                    'success': False,
+                    'error': 'Title and description are required'
+                }, status=400)
+
+            # Get violation type if provided
+            violation_type = None
+            if violation_type_id:
+                try:
+                    violation_type = violation_registry.get(violation_type_id)
+                    logger.info(f"📝 Found violation type: {violation_type.name}")
+                except ViolationType.DoesNotExist:
+                    logger.warning(f"📝 Violation type ID {violation_type_id} not found")
+
+            # Parse incident date
+            parsed_incident_date = None
+            if incident_date:
+                try:
+                    from datetime import datetime
+                    parsed_incident_date = datetime.fromisoformat(incident_date.replace('Z', '+00:00'))
+                except Exception as e:
+                    logger.warning(f"📝 Could not parse incident date: {e}")
+                    parsed_incident_date = timezone.now()
+            else:
+                parsed_incident_date = timezone.now()
+
+            # Find reported student (if reporting another student)
+            reported_student = None
+            if reported_student_name:
+                try:
+                    reported_student_name_clean = reported_student_name.strip()
+                    logger.info(f"🔍 Searching for student: '{reported_student_name_clean}'")
+
+                    # ✅ ENHANCED FIX: Try multiple search strategies
+                    from django.db.models import Q, Value
+                    from django.db.models.functions import Concat
+
+                    # Strategy 1: Search by concatenated full name (handles all name order variations)
+                    students = Student.objects.annotate(
+                        full_name=Concat('user__first_name', Value(' '), 'user__last_name')
+                    ).filter(
+                        Q(full_name__iexact=reported_student_name_clean) |
+                        Q(full_name__icontains=reported_student_name_clean)
+                    ).select_related('user')
+
+                    reported_student = students.first()
+
+                    if reported_student:
+                        logger.info(f"✅ Found student (full name match): {reported_student.user.first_name} {reported_student.user.last_name} (ID: {reported_student.id})")
+                    else:
+                        # Strategy 2: Try component matching (first name OR last name)
+                        name_parts = reported_student_name_clean.split()
+                        if len(name_parts) >= 2:
+                            # Try different combinations
+                            first_name = name_parts[0]
+                            last_name = ' '.join(name_parts[1:])
+
+                            # Exact match on both parts
+                            reported_student = Student.objects.filter(
+                                user__first_name__iexact=first_name,
+                                user__last_name__iexact=last_name
+                            ).select_related('user').first()
+
+                            if reported_student:
+                                logger.info(f"✅ Found student (exact parts match): {reported_student.user.first_name} {reported_student.user.last_name} (ID: {reported_student.id})")
+                            else:
+                                # Try reversed (last name first)
+                                first_name_alt = name_parts[-1]
+                                last_name_alt = ' '.join(name_parts[:-1])
+
+                                reported_student = Student.objects.filter(
+                                    user__first_name__iexact=first_name_alt,
+                                    user__last_name__iexact=last_name_alt
+                                ).select_related('user').first()
+
+                                if reported_student:
+                                    logger.info(f"✅ Found student (reversed match): {reported_student.user.first_name} {reported_student.user.last_name} (ID: {reported_student.id})")
+
+                    # Strategy 3: Fuzzy match on any part of the name
+                    if not reported_student:
+                        for part in name_parts:
+                            if len(part) >= 3:  # Only search parts with 3+ characters
+                                reported_student = Student.objects.filter(
+                                    Q(user__first_name__icontains=part) |
+                                    Q(user__last_name__icontains=part)
+                                ).select_related('user').first()
+
+                                if reported_student:
+                                    logger.info(f"✅ Found student (fuzzy match on '{part}'): {reported_student.user.first_name} {reported_student.user.last_name} (ID: {reported_student.id})")
+                                    break
+
+                    # ✅ CRITICAL: If still not found, REJECT with helpful error
+                    if not reported_student:
+                        logger.error(f"❌ Could not find student: '{reported_student_name_clean}'")
+
+                        # ✅ Get suggestions (students with similar names)
+                        suggestions = []
+                        for part in name_parts:
+                            if len(part) >= 3:
+                                similar_students = Student.objects.filter(
+                                    Q(user__first_name__icontains=part) |
+                                    Q(user__last_name__icontains=part)
+                                ).select_related('user')[:5]
+
+                                for s in similar_students:
+                                    full_name = f"{s.user.first_name} {s.user.last_name}"
+                                    if full_name not in suggestions:
+                                        suggestions.append(full_name)
+
+                        error_message = f"Student '{reported_student_name_clean}' not found in the system."
+                        if suggestions:
+                            error_message += f"\n\nDid you mean one of these?\n" + "\n".join(f"• {name}" for name in suggestions[:5])
+                        else:
+                            error_message += "\n\nPlease verify the student's name and try again."
+
+                        return Response({
+                            'success': False,
+                            'error': error_message,
+                            'suggestions': suggestions if suggestions else None
+                        }, status=400)
+
+                except Exception as e:
+                    logger.error(f"❌ Error finding reported student: {e}")
+                    import traceback
+                    traceback.print_exc()
+                    return Response({
+                        'success': False,
+                        'error': f"Error searching for student: {str(e)}"
+                    }, status=500)
+            else:
+                # ✅ Self-report (student reporting themselves)
+                reported_student = student
+                logger.info(f"📝 Self-report: {student.user.get_full_name()}")
+
+            # ✅ CREATE STUDENTREPORT (not Report)
+            report = StudentReport.objects.create(
+                title=title,
+                description=description,
+                reporter_student=student,  # ✅ Who is submitting the report
+                reported_student=reported_student,  # ✅ Who is being reported (can be same for self-report)
+                violation_type=violation_type,
+                custom_violation=custom_violation,
+                severity=severity,
+                status='pending',
+                verification_status='pending',
+                incident_date=parsed_incident_date,
+                school_year=student.school_year,  # ✅ Auto-set from student
+                location=location,
+                witnesses=witnesses,
+                requires_counseling=True,
+            )
+
+            logger.info(f"✅ StudentReport created: #{report.id}")
+            logger.info(f"   Reporter: {student.student_id}")
+            logger.info(f"   Reported: {reported_student.student_id if reported_student else 'N/A'}")
+            logger.info(f"   School Year: {student.school_year}")
+
+            # Create notification for counselors (in the job worker when the queue is enabled)
+            jobs.enqueue('notifications.notify_counselors', {
+                'title': 'New Student Report Submitted',
+                'message': f'Student {student.user.get_full_name() or student.user.username} submitted a report: {title}',
+                'notification_type': 'report_submitted',
+                'fanout_source': 'student_report',
+                'related_student_report_id': report.id,  # ✅ Use related_student_report
+            })
+
+            # Prepare response data
+            report_data = {
+                'id': report.id,
+                'title': report.title,
+                'description': report.description,
+                'status': report.status,
+                'verification_status': report.verification_status,
+                'school_year': report.school_year,
+                'created_at': report.created_at.isoformat(),
+                'incident_date': report.incident_date.isoformat() if report.incident_date else None,
+                'reporter': {
+                    'id': request.user.id,
+                    'name': f"{student.user.first_name} {student.user.last_name}".strip(),
+                    'username': request.user.username,
+                },
+                'reported_student': {
+                    'id': reported_student.id,
+                    'name': f"{reported_student.user.first_name} {reported_student.user.last_name}".strip(),
+                    'student_id': reported_student.student_id,
+                } if reported_student else None,
+                'violation_type': violation_type.name if violation_type else custom_violation,
+                'is_self_report': report.is_self_report(),
+            }
+
+            return Response({
+                'success': True,
+                'message': 'Report submitted successfully.',
+                'report': report_data
+            }, status=201)
+
+        except Exception as e:
+            logger.error(f"❌ Error submitting report: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return Response({
+                'success': False,
+                'error': f'Failed to submit report: {str(e)}'
+            }, status=500)
+
+    elif request.method == 'GET':
+        # Handle fetching student's reports - ONLY REPORTS THEY SUBMITTED
+        try:
+            if not hasattr(request.user, 'student'):
+                logger.error(f"❌ User {request.user.username} is not a student")
+                return Response({
+                    'success': False,
+                    'error': 'Only students can view reports'
+                }, status=status.HTTP_403_FORBIDDEN)
+
+            student = request.user.student
+
+            logger.info(f"📋 Fetching reports for student ID: {student.id}, User: {request.user.username}")
+
+            # ✅ Get ONLY reports where this student is the REPORTER
+            student_reports_as_reporter = StudentReport.objects.filter(
+                reporter_student=student  # Only reports submitted BY this student
+            ).select_related('violation_type', 'assigned_counselor', 'reported_student__user').order_by('-created_at')
+
+            logger.info(f"📊 Found {student_reports_as_reporter.count()} reports submitted by student {student.id}")
+
+            reports_data = []
+
+            # Add reports where this student is the reporter
+            for report in student_reports_as_reporter:
+                report_dict = _student_own_report_data(report, student)
+                reports_data.append(report_dict)
+
+                # ✅ DEBUG: Print each report being added
+                logger.info(f"   📄 Report ID {report.id}: Type={report_dict['report_type']}, Title={report.title}, Reporter ID={student.id}")
+
+            logger.info(f"✅ Returning {len(reports_data)} reports for student {student.id}")
+
+            return Response({
+                'success': True,
+                'reports': reports_data,
+                'total': len(reports_data),
+                'student_id': student.id,
+                'student_name': f"{request.user.first_name} {request.user.last_name}",
+                'note': 'Only showing reports you submitted (self-reports and peer-reports)'
+            })
+
+        except Exception as e:
+            logger.error(f"❌ Error fetching reports: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return Response({
+                'success': False,
+                'error': str(e),
+                'reports': []
+            }, status=500)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def mark_report_reviewed(request):
+    """Mark a report as reviewed"""
+    try:
+        if not hasattr(request.user, 'counselor'):
+            return Response({
+                'success': False,
+                'error': 'Access denied. Counselor role required.'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        report_id = request.data.get('report_id')
+        new_status = request.data.get('status', 'reviewed')
+
+        if not report_id:
+            return Response({
+                'success': False,
+                'error': 'Report ID is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            report = Report.objects.get(id=report_id)
+            report.status = new_status
+            report.save()
+
+            return Response({
+                'success': True,
+                'message': f'Report marked as {new_status}',
+                'report_id': report_id
+            })
+
+        except Report.DoesNotExist:
+            return Response({
+                'success': False,
+                'error': 'Report not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+    except Exception as e:
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def counselor_teacher_reports(request):
+    """Get all teacher-submitted reports for counselor review"""
+    try:
+        # ✅ FIX: Use TeacherReport instead of Report
+        reports = TeacherReport.objects.select_related(
+            'reported_student__user',
+            'reporter_teacher__user',
+            'violation_type',
+            'assigned_counselor__user'
+        ).order_by('-created_at')
+
+        reports_data = []
+        for report in reports:
+            # Get student name
+            student_name = 'Unknown Student'
+            student_info = None
+            if report.reported_student:
+                student_name = f"{report.reported_student.user.first_name} {report.reported_student.user.last_name}".strip()
+                if not student_name:
+                    student_name = report.reported_student.user.username
+
+                student_info = {
+                    'id': report.reported_student.id,
+                    'name': student_name,
+                    'student_id': report.reported_student.student_id,
+                    'grade_level': report.reported_student.grade_level,
+                    'section': report.reported_student.section,
+                }
+
+            # Get reporter info
+            reporter_info = None
+            if report.reporter_teacher:
+                reporter_info = {
+                    'id': report.reporter_teacher.user.id,
+                    'username': report.reporter_teacher.user.username,
+                    'first_name': report.reporter_teacher.user.first_name,
+                    'last_name': report.reporter_teacher.user.last_name,
+                    'full_name': report.reporter_teacher.user.get_full_name(),
+                }
+
+            reports_data.append({
+                'id': report.id,
+                'title': report.title,
+                'content': report.description,
+                'description': report.description,
+                'status': report.status,
+                'verification_status': report.verification_status,
+                'report_type': 'teacher_report',
+                'incident_date': report.incident_date.isoformat() if report.incident_date else None,
+                'created_at': report.created_at.isoformat(),
+                'updated_at': report.updated_at.isoformat(),
+                'student_id': report.reported_student.id if report.reported_student else None,
+                'student_name': student_name,
+                'student': student_info,
+                'reported_student': student_info,
+                'reported_by': reporter_info,
+                'reporter': reporter_info,
+                'reporter_type': 'teacher',
+                'violation_type': report.violation_type.name if report.violation_type else report.custom_violation,
+                'violation_type_id': report.violation_type.id if report.violation_type else None,
+                'custom_violation': report.custom_violation,
+                'severity_assessment': report.severity,
+                'severity_level': report.severity,
+                'is_reviewed': report.is_reviewed,
+                'reviewed_at': report.reviewed_at.isoformat() if report.reviewed_at else None,
+                'location': report.location,
+                'witnesses': report.witnesses,
+                'counselor_notes': report.counselor_notes,
+                'school_year': report.school_year,
+                'subject_involved': report.subject_involved if hasattr(report, 'subject_involved') else None,
+            })
+
+        logger.info(f"✅ Successfully fetched {len(reports_data)} teacher reports")
+
+        return Response({
+            'success': True,
+            'reports': reports_data,
+            'count': len(reports_data)
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error fetching teacher reports: {e}")
+        import traceback
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'message': f'Error fetching teacher reports: {str(e)}',
+            'reports': []
+        }, status=500)
+
+
+@api_view(['PATCH'])
+@permission_classes([IsAuthenticated])
+def counselor_update_teacher_report_status(request, report_id):
+    """Update teacher report status - dedicated function for teacher reports"""
+    try:
+        # Verify counselor
+        if not hasattr(request.user, 'counselor'):
+            return Response({
+                'success': False,
+                'error': 'Only counselors can update report status'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        counselor = request.user.counselor
+
+        # Get the teacher report
+        try:
+            report = TeacherReport.objects.select_related(
+                'reporter_teacher__user',
+                'reported_student__user',
+                'violation_type'
+            ).get(id=report_id)
+        except TeacherReport.DoesNotExist:
+            return Response({
+                'success': False,
+                'error': 'Teacher report not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        # ✅ Optimistic locking: the version the client last saw (If-Match or body)
+        try:
+            expected = concurrency.expected_version(request)
+        except concurrency.VersionError as e:
+            return concurrency.version_error_response(e)
+
+        # Get new status and notes
+        new_status = request.data.get('status')
+        notes = request.data.get('notes', '')
+
+        if not new_status:
+            return Response({
+                'success': False,
+                'error': 'Status is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        old_status = report.status
+
+        # Validate status
+        valid_statuses = [
+            'pending', 'under_review', 'under_investigation',
+            'summoned', 'verified', 'reviewed', 'dismissed',
+            'resolved', 'escalated', 'invalid'
+        ]
+
+        if new_status not in valid_statuses:
+            return Response({
+                'success': False,
+                'error': f'Invalid status. Must be one of: {", ".join(valid_statuses)}'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # Update report
+        report.status = new_status
+        report.assigned_counselor = counselor
+        changed_fields = ['status', 'assigned_counselor']
+
+        # Add notes if provided
+        if notes:
+            timestamp = timezone.now().strftime('%Y-%m-%d %H:%M')
+            counselor_name = request.user.get_full_name() or request.user.username
+            note_entry = f"[{timestamp}] {counselor_name}: {notes}"
+
+            if report.counselor_notes:
+                report.counselor_notes += f"\n\n{note_entry}"
+            else:
+                report.counselor_notes = note_entry
+            changed_fields.append('counselor_notes')
+
+        # Update timestamps based on status
+        if new_status == 'verified' or new_status == 'reviewed':
+            report.verified_by = request.user
+            report.verified_at = timezone.now()
+            report.is_reviewed = True
+            report.reviewed_at = timezone.now()
+            changed_fields += ['verified_by', 'verified_at', 'is_reviewed', 'reviewed_at']
+        elif new_status == 'resolved':
+            report.resolved_at = timezone.now()
+            changed_fields.append('resolved_at')
+
+        # ✅ Write only the changed columns, and only if nobody updated the report meanwhile
+        if not concurrency.save_versioned(report, changed_fields, expected):
+            logger.warning(f"⚠️ Version conflict updating TeacherReport #{report_id}")
+            return concurrency.conflict_response(report)
+
+        logger.info(f"✅ TeacherReport #{report_id} status updated: {old_status} → {new_status}")
+
+        # Send notifications
+        try:
+            # Get users
+            reporter_user = report.reporter_teacher.user if report.reporter_teacher else None
+            student_user = report.reported_student.user if report.reported_student else None
+
+            # Notify reported student
+            if student_user:
+                if new_status == 'verified' or new_status == 'reviewed':
+                    message = f'The report "{report.title}" has been validated after counseling. It will be tallied as a violation.'
+                elif new_status == 'dismissed' or new_status == 'invalid':
+                    message = f'The report "{report.title}" has been dismissed after investigation. No violation will be recorded.'
+                elif new_status == 'resolved':
+                    message = f'The report "{report.title}" has been resolved and closed.'
+                elif new_status == 'summoned':
+                    message = f'You have been summoned to the guidance office regarding "{report.title}". Please report as soon as possible.'
+                else:
+                    message = f'Report "{report.title}" status updated to: {new_status}'
+
+                Notification.objects.create(
+                    user=student_user,
+                    title='Report Status Update',
+                    message=message,
+                    type='report_update',
+                    related_teacher_report=report,
+                )
+                logger.info(f"📧 Notification sent to student: {student_user.get_full_name()}")
+
+            # Notify teacher reporter
+            if reporter_user and reporter_user != student_user:
+                Notification.objects.create(
+                    user=reporter_user,
+                    title='Report Status Update',
+                    message=f'Your report "{report.title}" has been updated to: {new_status}',
+                    type='report_update',
+                    related_teacher_report=report,
+                )
+                logger.info(f"📧 Notification sent to teacher: {reporter_user.get_full_name()}")
+
+        except Exception as e:
+            logger.warning(f"⚠️ Error sending notifications: {e}")
+            # Don't fail the whole operation if notifications fail
+
+        response = Response({
+            'success': True,
+            'message': f'Teacher report status updated to {new_status}',
+            'report': {
+                'id': report.id,
+                'status': report.status,
+                'old_status': old_status,
+                'counselor_notes': report.counselor_notes,
+                'report_type': 'teacher_report',
+                'version': report.version,
+            }
+        }, status=status.HTTP_200_OK)
+        response['ETag'] = concurrency.etag(report)
+        return response
+
+    except Exception as e:
+        logger.error(f"❌ Error updating teacher report status: {e}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return Response({
+            'success': False,
+            'error': f'Failed to update teacher report status: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def mark_report_invalid(request, report_id):
+    """Mark a report as invalid after counseling session"""
+    try:
+        # Verify counselor
+        try:
+            counselor = Counselor.objects.get(user=request.user)
+        except Counselor.DoesNotExist:
+            return Response({
+                'success': False,
+                'error': 'Only counselors can mark reports as invalid'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        report_type = request.data.get('report_type', 'student_report')
+
+        if report_type == 'teacher_report':
+            try:
+                report = TeacherReport.objects.select_related(
+                    'reported_student',
+                    'reported_student__user',
+                    'reporter_teacher',
+                    'reporter_teacher__user'
+                ).get(id=report_id)
+            except TeacherReport.DoesNotExist:
+                return Response({
+                    'success': False,
+                    'error': 'Teacher report not found'
+                }, status=status.HTTP_404_NOT_FOUND)
+            reporter_user = report.reporter_teacher.user if report.reporter_teacher else None
+            student_user = report.reported_student.user if report.reported_student else None
+        else:
+            try:
+                report = StudentReport.objects.select_related(
+                    'reported_student',
+                    'reported_student__user',
+                    'reporter_student',
+                    'reporter_student__user'
+                ).get(id=report_id)
+            except StudentReport.DoesNotExist:
+                return Response({
+                    'success': False,
+                    'error': 'Student report not found'
+                }, status=status.HTTP_404_NOT_FOUND)
+            reporter_user = report.reporter_student.user if report.reporter_student else None
+            student_user = report.reported_student.user if report.reported_student else None
+
+        # ✅ Optimistic locking: the version the client last saw (If-Match or body)
+        try:
+            expected = concurrency.expected_version(request)
+        except concurrency.VersionError as e:
+            return concurrency.version_error_response(e)
+
+        reason = request.data.get('reason', 'No violation found after investigation')
+
+        old_status = report.status
+        report.status = 'invalid'
+        report.is_reviewed = True
+        report.reviewed_at = timezone.now()
+
+        timestamp = timezone.now().strftime('%Y-%m-%d %H:%M')
+        invalid_note = f"\n\n[{timestamp}] Report marked as INVALID\nReason: {reason}"
+        report.disciplinary_action = (report.disciplinary_action or '') + invalid_note
+        report.counselor_notes = (report.counselor_notes or '') + invalid_note
+
+        if not concurrency.save_versioned(
+            report,
+            ['status', 'is_reviewed', 'reviewed_at', 'disciplinary_action', 'counselor_notes'],
+            expected
+        ):
+            logger.warning(f"⚠️ Version conflict marking {report_type} #{report_id} invalid")
+            return concurrency.conflict_response(report)
+
+        if reporter_user:
+            reporter_notification = (
+                f"Your report '{report.title}' has been marked as INVALID after investigation.\n\n"
+                f"Reason: {reason}\n\n"
+                f"The reported incident was investigated and found to be unsubstantiated. "
+                f"No violation will be tallied."
+            )
+            create_notification(
+                user=reporter_user,
+                title=f"Report Invalid: {report.title}",
+                message=reporter_notification,
+                notification_type='report_invalid',
+                related_report=report
+            )
+
+        if student_user:
+            student_notification = (
+                f"Good news! After investigation, the report concerning you has been marked as INVALID.\n\n"
+                f"Report: {report.title}\n"
+                f"Reason: {reason}\n\n"
+                f"No violation has been recorded in your file."
+            )
+            create_notification(
+                user=student_user,
+                title="Report Cleared - No Violation",
+                message=student_notification,
+                notification_type='report_cleared',
+                related_report=report
+            )
+
+        logger.info(f"✅ Report {report_id} marked as invalid. Notifications sent.")
+
+        return Response({
+            'success': True,
+            'message': 'Report marked as invalid and notifications sent',
+            'report': {
+                'id': report.id,
+                'status': report.status,
+                'old_status': old_status,
+                'version': report.version,
+            }
+        }, headers={'ETag': concurrency.etag(report)})
+
+    except Exception as e:
+        logger.error(f"❌ Error marking report as invalid: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@csrf_exempt
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def update_report_status(request, report_id):
+    """Update report status with notifications"""
+    try:
+        # Get report type from request
+        report_type = request.data.get('report_type', 'student_report')
+
+        logger.info(f"🔄 Updating {report_type} #{report_id} status")
+
+        # Get the correct report based on type
+        if report_type == 'teacher_report':
+            try:
+                report = TeacherReport.objects.select_related(
+                    'reporter_teacher__user',
+                    'reported_student__user',
+                ).get(id=report_id)
+            except TeacherReport.DoesNotExist:
+                return Response({
+                    'success': False,
+                    'error': 'Teacher report not found'
+                }, status=status.HTTP_404_NOT_FOUND)
+        else:
+            # student_report, peer_report, or self_report
+            try:
+                report = StudentReport.objects.select_related(
+                    'reporter_student',
+                    'reported_student',
+                    'assigned_counselor',
+                    'verified_by',
+                ).get(id=report_id)
+            except StudentReport.DoesNotExist:
+                return Response({
+                    'success': False,
+                    'error': 'Student report not found'
+                }, status=status.HTTP_404_NOT_FOUND)
+
+        # Verify user is a counselor
+        if not hasattr(request.user, 'counselor'):
+            return Response({
+                'success': False,
+                'error': 'Only counselors can update report status'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        counselor = request.user.counselor
+        # ✅ Optimistic locking: the version the client last saw (If-Match or body)
+        try:
+            expected = concurrency.expected_version(request)
+        except concurrency.VersionError as e:
+            return concurrency.version_error_response(e)
+
+
+        # Get new status and notes
+        new_status = request.data.get('status')
+        notes = request.data.get('notes', '')
+
+        if not new_status:
+            return Response({
+                'success': False,
+                'error': 'Status is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        old_status = report.status
+
+        # Validate status transition based on model choices
+        valid_statuses = [
+            'pending', 'under_review', 'under_investigation',
+            'summons_sent', 'verified', 'dismissed',
+            'resolved', 'escalated'
+        ]
+
+        if new_status not in valid_statuses:
+            return Response({
+                'success': False,
+                'error': f'Invalid status. Must be one of: {", ".join(valid_statuses)}'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # Update report
+        report.status = new_status
+        report.assigned_counselor = counselor
+        changed_fields = ['status', 'assigned_counselor']
+
+        # Add notes if provided
+        if notes:
+            timestamp = timezone.now().strftime('%Y-%m-%d %H:%M')
+            counselor_name = request.user.get_full_name() or request.user.username
+            note_entry = f"[{timestamp}] {counselor_name}: {notes}"
+
+            if report.counselor_notes:
+                report.counselor_notes += f"\n\n{note_entry}"
+            else:
+                report.counselor_notes = note_entry
+            changed_fields.append('counselor_notes')
+
+        # Update timestamps based on status
+        if new_status == 'verified':
+            report.verified_by = request.user
+            report.verified_at = timezone.now()
+            changed_fields += ['verified_by', 'verified_at']
+        elif new_status == 'resolved':
+            report.resolved_at = timezone.now()
+            changed_fields.append('resolved_at')
+
+        # ✅ Write only the changed columns, and only if nobody updated the report meanwhile
+        if not concurrency.save_versioned(report, changed_fields, expected):
+            logger.warning(f"⚠️ Version conflict updating {report_type} #{report_id}")
+            return concurrency.conflict_response(report)
+
+        logger.info(f"✅ {report_type} #{report_id} status updated: {old_status} → {new_status}")
+
+        # Send notifications
+        if report_type == 'teacher_report':
+            reported_student = report.reported_student
+            reporter = report.reporter_teacher
+        else:
+            reported_student = report.reported_student
+            reporter = report.reporter_student
+
+        # ✅ FIX: Use correct Notification field names (user instead of recipient)
+        # Notify reported student
+        if reported_student and hasattr(reported_student, 'user') and reported_student.user:
+            if new_status == 'verified':
+                message = f'The report "{report.title}" has been validated after counseling. It will be tallied as a violation.'
+            elif new_status == 'dismissed':
+                message = f'The report "{report.title}" has been dismissed after investigation. No violation will be recorded.'
+            elif new_status == 'resolved':
+                message = f'The report "{report.title}" has been resolved and closed.'
+            elif new_status == 'summons_sent':
+                message = f'You have been summoned to the guidance office regarding "{report.title}". Please report as soon as possible.'
+            else:
+                message = f'Report "{report.title}" status updated to: {new_status}'
+
+            # ✅ FIX: Use correct field names for your Notification model
+            Notification.objects.create(
+                user=reported_student.user,  # ✅ Changed from 'recipient' to 'user'
+                title='Report Status Update',
+                message=message,
+                type='report_update',  # ✅ Changed from 'notification_type' to 'type'
+                # related_report_id removed - not a field in your model
+            )
+
+            logger.info(f"📧 Notification sent to {reported_student.user.get_full_name()}")
+
+        # Notify reporter
+        if reporter and hasattr(reporter, 'user') and reporter.user:
+            Notification.objects.create(
+                user=reporter.user,  # ✅ Changed from 'recipient' to 'user'
+                title='Report Status Update',
+                message=f'Report "{report.title}" has been updated to: {new_status}',
+                type='report_update',  # ✅ Changed from 'notification_type' to 'type'
+                # related_report_id removed - not a field in your model
+            )
+
+            logger.info(f"📧 Notification sent to reporter {reporter.user.get_full_name()}")
+
+        response = Response({
+            'success': True,
+            'message': f'Report status updated to {new_status}',
+            'report': {
+                'id': report.id,
+                'status': report.status,
+                'old_status': old_status,
+                'counselor_notes': report.counselor_notes,
+                'version': report.version,
+            }
+        }, status=status.HTTP_200_OK)
+        response['ETag'] = concurrency.etag(report)
+        return response
+
+    except Exception as e:
+        logger.error(f"❌ Error updating report status: {e}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return Response({
+            'success': False,
+            'error': f'Failed to update report status: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+# ✅ Statuses a report may move to from its current status (bulk transitions)
+REPORT_STATUS_TRANSITIONS = {
+    'pending': {'under_review', 'under_investigation', 'summons_sent', 'verified', 'dismissed', 'invalid', 'escalated'},
+    'under_review': {'under_investigation', 'summons_sent', 'verified', 'dismissed', 'invalid', 'resolved', 'escalated'},
+    'under_investigation': {'summons_sent', 'verified', 'dismissed', 'invalid', 'resolved', 'escalated'},
+    'summons_sent': {'under_investigation', 'verified', 'dismissed', 'invalid', 'resolved', 'escalated'},
+    'escalated': {'under_investigation', 'summons_sent', 'verified', 'dismissed', 'resolved'},
+    'verified': {'resolved', 'escalated'},
+    'dismissed': set(),
+    'invalid': set(),
+    'resolved': set(),
+}
+
+
+BULK_STATUS_MAX_REPORTS = 500
+
+
+REPORT_MODELS = {
+    'student_report': (StudentReport, 'reporter_student__user_id', 'related_student_report_id'),
+    'teacher_report': (TeacherReport, 'reporter_teacher__user_id', 'related_teacher_report_id'),
+}
+
+
+def _allowed_from(new_status):
+    return [old for old, targets in REPORT_STATUS_TRANSITIONS.items() if new_status in targets]
+
+
+def _status_message(title, new_status):
+    """Notification text for the reported student (same wording as the single-report endpoints)"""
+    if new_status == 'verified':
+        return f'The report "{title}" has been validated after counseling. It will be tallied as a violation.'
+    if new_status in ('dismissed', 'invalid'):
+        return f'The report "{title}" has been dismissed after investigation. No violation will be recorded.'
+    if new_status == 'resolved':
+        return f'The report "{title}" has been resolved and closed.'
+    if new_status == 'summons_sent':
+        return f'You have been summoned to the guidance office regarding "{title}". Please report as soon as possible.'
+    return f'Report "{title}" status updated to: {new_status}'
+
+
+def _append_note(field, note_entry):
+    """Expression appending a note to a text column inside an UPDATE"""
+    from django.db.models.functions import Concat
+    return models.Case(
+        models.When(
+            models.Q(**{f'{field}__isnull': True}) | models.Q(**{field: ''}),
+            then=models.Value(note_entry)
+        ),
+        default=Concat(models.F(field), models.Value(f"\n\n{note_entry}"), output_field=models.TextField()),
+        output_field=models.TextField()
+    )
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_update_report_status(request):
+    """
+    Move many student and teacher reports to one status.
+
+    Body: {"reports": [{"id": 1, "report_type": "student_report"}, ...],
+           "status": "resolved", "notes": "..."}
+    Reports whose current status can't move to the target are skipped and
+    listed in the results; the rest are changed with one UPDATE per report
+    type and their notifications are bulk created.
+    """
+    try:
+        if not hasattr(request.user, 'counselor'):
+            return Response({
+                'success': False,
+                'error': 'Only counselors can update report status'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        counselor = request.user.counselor
+        new_status = request.data.get('status')
+        notes = request.data.get('notes', '')
+        reports = request.data.get('reports')
+
+        if new_status not in REPORT_STATUS_TRANSITIONS:
+            return Response({
+                'success': False,
+                'error': f'Invalid status. Must be one of: {", ".join(REPORT_STATUS_TRANSITIONS)}'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        if not isinstance(reports, list) or not reports:
+            return Response({
+                'success': False,
+                'error': 'reports must be a non-empty list of {id, report_type}'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        if len(reports) > BULK_STATUS_MAX_REPORTS:
+            return Response({
+                'success': False,
+                'error': f'At most {BULK_STATUS_MAX_REPORTS} reports can be updated at once'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        requested = {report_type: [] for report_type in REPORT_MODELS}
+        try:
+            for item in reports:
+                report_type = item.get('report_type', 'student_report')
+                if report_type not in REPORT_MODELS:
+                    raise ValueError(f'Unknown report_type: {report_type}')
+                requested[report_type].append(int(item['id']))
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            return Response({
+                'success': False,
+                'error': f'Invalid reports list: {e}'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        now = timezone.now()
+        allowed_from = _allowed_from(new_status)
+
+        changes = {
+            'status': new_status, 'assigned_counselor': counselor, 'updated_at': now,
+            'version': models.F('version') + 1,
+        }
+        if new_status == 'verified':
+            changes.update(verified_by=request.user, verified_at=now, is_reviewed=True, reviewed_at=now)
+        elif new_status in ('dismissed', 'invalid'):
+            changes.update(is_reviewed=True, reviewed_at=now)
+        elif new_status == 'resolved':
+            changes['resolved_at'] = now
+
+        if notes:
+            counselor_name = request.user.get_full_name() or request.user.username
+            note_entry = f"[{now.strftime('%Y-%m-%d %H:%M')}] {counselor_name}: {notes}"
+            changes['counselor_notes'] = _append_note('counselor_notes', note_entry)
+            if new_status == 'invalid':
+                changes['disciplinary_action'] = _append_note('disciplinary_action', note_entry)
+
+        results = []
+        notifications = []
+
+        with transaction.atomic():
+            for report_type, ids in requested.items():
+                if not ids:
+                    continue
+                model, reporter_user_field, notification_field = REPORT_MODELS[report_type]
+
+                rows = {
+                    row['id']: row for row in model.objects.select_for_update(of=('self',)).filter(
+                        id__in=ids
+                    ).values('id', 'status', 'title', 'reported_student__user_id', reporter_user_field)
+                }
+
+                updated_ids = [report_id for report_id, row in rows.items() if row['status'] in allowed_from]
+                if updated_ids:
+                    model.objects.filter(id__in=updated_ids).update(**changes)
+
+                for report_id in dict.fromkeys(ids):
+                    row = rows.get(report_id)
+                    if row is None:
+                        results.append({'id': report_id, 'report_type': report_type, 'result': 'not_found'})
+                        continue
+                    if row['status'] not in allowed_from:
+                        results.append({
+                            'id': report_id, 'report_type': report_type,
+                            'result': 'invalid_transition', 'old_status': row['status'],
+                        })
+                        continue
+
+                    results.append({
+                        'id': report_id, 'report_type': report_type,
+                        'result': 'updated', 'old_status': row['status'], 'status': new_status,
+                    })
+
+                    student_user_id = row['reported_student__user_id']
+                    reporter_user_id = row[reporter_user_field]
+                    if student_user_id:
+                        notifications.append(Notification(
+                            user_id=student_user_id,
+                            title='Report Status Update',
+                            message=_status_message(row['title'], new_status),
+                            type='report_update',
+                            **{notification_field: report_id}
+                        ))
+                    if reporter_user_id and reporter_user_id != student_user_id:
+                        notifications.append(Notification(
+                            user_id=reporter_user_id,
+                            title='Report Status Update',
+                            message=f'Your report "{row["title"]}" has been updated to: {new_status}',
+                            type='report_update',
+                            **{notification_field: report_id}
+                        ))
+
+            Notification.objects.bulk_create(notifications)
+
+        updated_count = sum(1 for result in results if result['result'] == 'updated')
+        metrics.record_notification_fanout('bulk_report_status', len(notifications))
+        logger.info(f"✅ Bulk status update by {request.user.username}: {updated_count}/{len(results)} reports → {new_status}")
+
+        return Response({
+            'success': True,
+            'message': f'{updated_count} reports updated to {new_status}',
+            'updated_count': updated_count,
+            'skipped_count': len(results) - updated_count,
+            'notifications_sent': len(notifications),
+            'results': results,
+        }, status=status.HTTP_200_OK)
+
+    except Exception as e:
+        logger.error(f"❌ Error bulk updating report status: {e}")
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': f'Failed to update report status: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+QUEUE_DEFAULT_LIMIT = 25
+
+
+QUEUE_MAX_LIMIT = 100
+
+
+# report type -> (model, rank used to break ties between the two tables)
+QUEUE_SOURCES = {
+    'student_report': (StudentReport, 0),
+    'teacher_report': (TeacherReport, 1),
+}
+
+
+def _encode_queue_cursor(triage_at, report_type, report_id):
+    raw = f"{triage_at.isoformat()}|{report_type}|{report_id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def _decode_queue_cursor(cursor):
+    raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+    triage_at, report_type, report_id = raw.split('|')
+    triage_at = parse_datetime(triage_at)
+    if triage_at is None or report_type not in QUEUE_SOURCES:
+        raise ValueError('Malformed cursor')
+    return triage_at, report_type, int(report_id)
+
+
+def _queue_after(cursor, rank):
+    """Keyset condition for rows after the cursor in (triage_at, type, id) order"""
+    triage_at, cursor_type, cursor_id = cursor
+    cursor_rank = QUEUE_SOURCES[cursor_type][1]
+    if rank > cursor_rank:
+        return Q(triage_at__gte=triage_at)
+    if rank < cursor_rank:
+        return Q(triage_at__gt=triage_at)
+    return Q(triage_at__gt=triage_at) | Q(triage_at=triage_at, id__gt=cursor_id)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def counselor_queue(request):
+    """
+    Pending and under-review student and teacher reports in one list, most
+    urgent first (see api/triage.py for the priority). Paginate with
+    ?limit= and the returned next_cursor (?cursor=).
+    """
+    try:
+        if not hasattr(request.user, 'counselor'):
+            return Response({
+                'success': False,
+                'error': 'Access denied. Counselor role required.'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            limit = min(max(int(request.GET.get('limit', QUEUE_DEFAULT_LIMIT)), 1), QUEUE_MAX_LIMIT)
+            cursor = request.GET.get('cursor')
+            cursor = _decode_queue_cursor(cursor) if cursor else None
+        except (TypeError, ValueError, UnicodeDecodeError, binascii.Error) as e:
+            return Response({
+                'success': False,
+                'error': f'Invalid limit or cursor: {e}'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # Top `limit` rows of each table straight off the partial index, merged here
+        candidates = []
+        for report_type, (model, rank) in QUEUE_SOURCES.items():
+            queryset = model.objects.filter(
+                status__in=triage.QUEUE_STATUSES,
+                is_archived=False,
+                triage_at__isnull=False,
+            )
+            if cursor:
+                queryset = queryset.filter(_queue_after(cursor, rank))
+            queryset = queryset.select_related('reported_student__user').order_by('triage_at', 'id')[:limit + 1]
+            candidates.extend((report.triage_at, rank, report.id, report_type, report) for report in queryset)
+
+        candidates.sort(key=lambda item: item[:3])
+        page = candidates[:limit]
+        has_more = len(candidates) > limit
+
+        counts = triage.violation_counts({item[4].reported_student_id for item in page})
+        now = timezone.now()
+
+        items = []
+        for triage_at, _, report_id, report_type, report in page:
+            student = report.reported_student
+            violation_count = counts.get(report.reported_student_id, 0)
+            items.append({
+                'id': report_id,
+                'report_type': report_type,
+                'title': report.title,
+                'status': report.status,
+                'severity': report.severity,
+                'created_at': report.created_at,
+                'reported_student': {
+                    'id': student.id,
+                    'name': student.user.get_full_name() or student.user.username,
+                    'student_id': student.student_id,
+                } if student else None,
+                'violation_count': violation_count,
+                'repeat_offender': triage.is_repeat_offender(violation_count),
+                'priority_score': triage.priority_score(report, now),
+                'version': report.version,
+            })
+
+        next_cursor = None
+        if has_more and page:
+            last = page[-1]
+            next_cursor = _encode_queue_cursor(last[0], last[3], last[2])
+
+        return Response({
+            'success': True,
+            'queue': items,
+            'count': len(items),
+            'next_cursor': next_cursor,
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error fetching counselor queue: {str(e)}")
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+REPORTER_COLUMNS = (
+    'reporter_student__user__first_name', 'reporter_student__user__last_name', 'reporter_student__user__username',
+    'reporter_student__student_id', 'reporter_student__grade_level', 'reporter_student__section',
+)
+
+
+REPORTED_STUDENT_COLUMNS = (
+    'reported_student__user__first_name', 'reported_student__user__last_name',
+    'reported_student__student_id', 'reported_student__grade_level', 'reported_student__section',
+    'reported_student__strand',
+)
+
+
+def _reporter_info(report):
+    """Get reporter information"""
+    if not report.reporter_student:
+        return None
+    return {
+        'id': report.reporter_student.id,
+        'name': f"{report.reporter_student.user.first_name} {report.reporter_student.user.last_name}".strip(),
+        'username': report.reporter_student.user.username,
+        'student_id': report.reporter_student.student_id,
+        'grade_level': report.reporter_student.grade_level,
+        'section': report.reporter_student.section,
+    }
+
+
+def _reported_student_info(report):
+    """Get student being reported"""
+    if not report.reported_student:
+        return None
+    return {
+        'id': report.reported_student.id,
+        'name': f"{report.reported_student.user.first_name} {report.reported_student.user.last_name}".strip(),
+        'student_id': report.reported_student.student_id,
+        'grade_level': report.reported_student.grade_level,
+        'section': report.reported_student.section,
+        'strand': getattr(report.reported_student, 'strand', 'N/A'),
+    }
+
+
+# ✅ Every key counselor_student_reports can return; ?fields= picks a subset
+COUNSELOR_STUDENT_REPORT_FIELDSET = Fieldset({
+    'id': _plain('id'),
+    'title': _plain('title'),
+    'description': _plain('description'),
+    'content': Field(('description',), lambda r: r.description),
+    'status': _plain('status'),
+    'verification_status': _plain('verification_status'),
+    'incident_date': _plain('incident_date'),
+    'incident_location': Field(('location',), lambda r: r.location),
+    'created_at': _plain('created_at'),
+    'reporter_type': Field((), lambda r: 'Student'),
+    'report_type': Field((), lambda r: 'student_report'),
+
+    # Student info
+    'reported_student_id': Field(('reported_student',), lambda r: r.reported_student_id),
+    'reported_student': Field(REPORTED_STUDENT_COLUMNS, _reported_student_info),
+    'student': Field(REPORTED_STUDENT_COLUMNS, _reported_student_info),
+    'student_name': Field(
+        ('reported_student__user__first_name', 'reported_student__user__last_name'),
+        lambda r: f"{r.reported_student.user.first_name} {r.reported_student.user.last_name}".strip() if r.reported_student else 'Unknown',
+    ),
+
+    # Reporter info
+    'reporter': Field(REPORTER_COLUMNS, _reporter_info),
+    'reported_by': Field(REPORTER_COLUMNS, _reporter_info),
+
+    # Violation details
+    'violation_type': Field(
+        ('violation_type__name', 'custom_violation'),
+        lambda r: r.violation_type.name if r.violation_type else r.custom_violation or 'Other',
+    ),
+    'custom_violation': _plain('custom_violation'),
+    'severity_level': Field(('severity',), lambda r: r.severity),
+    'severity_assessment': Field(('severity',), lambda r: r.severity),
+    'witnesses': _plain('witnesses'),
+    'counselor_notes': _plain('counselor_notes'),
+    'school_year': _plain('school_year'),
+
+    # Counseling info
+    'requires_counseling': _plain('requires_counseling'),
+    'counseling_completed': _plain('counseling_completed'),
+    'summons_sent': Field(('summons_sent_at',), lambda r: r.summons_sent_at is not None),
+
+    # ✅ Send back as If-Match when updating the report
+    'version': _plain('version'),
+})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def counselor_student_reports(request):
+    """Get student reports for counselor review"""
+    try:
+        # Check if user has counselor permissions
+        try:
+            counselor = Counselor.objects.get(user=request.user)
+        except Counselor.DoesNotExist:
+            return Response({
+                'success': False,
+                'error': 'Access denied. Counselor role required.'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        # ✅ FIX: Use StudentReport instead of Report
+        # ✅ Only fetch and serialize the columns the client asked for (?fields=)
+        fields = COUNSELOR_STUDENT_REPORT_FIELDSET.requested(request)
+        reports = COUNSELOR_STUDENT_REPORT_FIELDSET.apply(
+            StudentReport.objects.all(),
+            fields
+        ).order_by('-created_at')
+
+        reports_data = []
+        for report in reports:
+            try:
+                reports_data.append(COUNSELOR_STUDENT_REPORT_FIELDSET.serialize(report, fields))
+            except Exception as e:
+                logger.warning(f"⚠️ Error processing report {report.id}: {e}")
+                continue
+
+        logger.info(f"📋 Found {len(reports_data)} student reports")
+
+        return Response({
+            'success': True,
+            'reports': reports_data,
+            'count': len(reports_data),
+        })
+
+    except FieldsetError as e:
+        return Response(e.as_response_data(), status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        logger.error(f"❌ Error fetching counselor student reports: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': str(e),
+            'reports': [],
+            'count': 0
+        }, status=500)
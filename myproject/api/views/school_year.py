@@ -0,0 +1,672 @@
+"""
+School year rollover, promotion and their background jobs.
+"""
+
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from django.db import transaction
+import logging
+from django.db import models
+from datetime import datetime
+from ..conditional import versioned
+from .. import jobs
+from .. import rollover as rollover_ops
+from ..models import Student, Teacher, StudentViolationRecord, StudentSchoolYearHistory, ResourceVersion, Job
+
+logger = logging.getLogger(__name__)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def update_students_school_year(request):
+    """Bulk update students' school year - ADMIN/COUNSELOR ONLY"""
+    try:
+        # Verify counselor or admin
+        if not (request.user.is_staff or hasattr(request.user, 'counselor')):
+            return Response({
+                'success': False,
+                'error': 'Access denied. Admin or counselor role required.'
+            }, status=403)
+
+        default_school_year = request.data.get('school_year')
+
+        # Calculate current school year if not provided
+        if not default_school_year:
+            current_year = datetime.now().year
+            current_month = datetime.now().month
+            default_school_year = f"{current_year}-{current_year + 1}" if current_month >= 6 else f"{current_year - 1}-{current_year}"
+
+        # Update all students without school_year
+        students_without_sy = Student.objects.filter(
+            models.Q(school_year__isnull=True) | models.Q(school_year='')
+        )
+
+        count = students_without_sy.count()
+        students_without_sy.update(school_year=default_school_year)
+        ResourceVersion.bump('student')  # ✅ update() skips post_save signals
+        ResourceVersion.bump('profiles')
+
+        logger.info(f"✅ Updated {count} students to school year: {default_school_year}")
+
+        return Response({
+            'success': True,
+            'message': f'Updated {count} students to school year {default_school_year}',
+            'count': count,
+            'school_year': default_school_year
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error updating students school year: {e}")
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=500)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def rollover_school_year(request):
+    """
+    Roll over students to new school year (Admin/Counselor only)
+    - Archives current school year data
+    - Preserves ALL violation records
+    - Updates students to new school year
+    - Promotes grade levels
+    Runs as a background job; poll GET /api/jobs/<job_id>/ for progress.
+    """
+    try:
+        # Verify admin or counselor
+        if not (request.user.is_staff or hasattr(request.user, 'counselor')):
+            return Response({
+                'success': False,
+                'error': 'Access denied. Admin or counselor role required.'
+            }, status=403)
+
+        new_school_year = request.data.get('new_school_year') or rollover_ops.default_school_year()
+        dry_run = bool(request.data.get('dry_run', False))
+
+        job = jobs.enqueue('school_year.rollover', {
+            'new_school_year': new_school_year,
+            'dry_run': dry_run,
+        }, force_queue=True, created_by=request.user)
+        jobs.spawn(job)
+
+        logger.info(f"{'🔍 DRY RUN' if dry_run else '🚀 QUEUED'}: School Year Rollover to {new_school_year} (job #{job.id})")
+
+        return Response({
+            'success': True,
+            'message': f"{'DRY RUN: ' if dry_run else ''}School year rollover started",
+            'new_school_year': new_school_year,
+            'job': _job_data(job),
+            'note': 'Advisers should update student sections for their advisory classes once the job succeeds' if not dry_run else 'This is a dry run - no changes will be made'
+        }, status=status.HTTP_202_ACCEPTED)
+
+    except Exception as e:
+        logger.error(f"❌ Error in school year rollover: {e}")
+        import traceback
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=500)
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def adviser_manage_section(request):
+    """
+    GET: View current advisory section with violation history
+    POST: Update students in advisory section
+    """
+    try:
+        # Get teacher
+        teacher = Teacher.objects.filter(user=request.user).first()
+        if not teacher:
+            return Response({
+                'success': False,
+                'error': 'Only teachers can manage advisory sections'
+            }, status=403)
+
+        # Get current school year
+        current_year = datetime.now().year
+        current_month = datetime.now().month
+        current_sy = f"{current_year}-{current_year + 1}" if current_month >= 6 else f"{current_year - 1}-{current_year}"
+
+        if request.method == 'GET':
+            # Get current advisory students
+            advisory_students = Student.objects.filter(
+                school_year=current_sy,
+                section=teacher.advising_section
+            ).select_related('user').order_by('user__last_name', 'user__first_name')
+
+            students_data = []
+            for student in advisory_students:
+                # Get violation counts
+                current_year_violations = StudentViolationRecord.objects.filter(
+                    student=student,
+                    student__school_year=current_sy
+                ).count()
+
+                all_time_violations = StudentViolationRecord.objects.filter(
+                    student=student
+                ).count()
+
+                # Get violations grouped by year
+                from api.models import StudentSchoolYearHistory
+                violations_by_year = []
+
+                # Get all school years this student was enrolled
+                history = StudentSchoolYearHistory.objects.filter(
+                    student=student
+                ).order_by('-school_year')
+
+                for h in history:
+                    year_violations = StudentViolationRecord.objects.filter(
+                        student=student,
+                        incident_date__year=int(h.school_year.split('-')[0])
+                    ).count()
+
+                    violations_by_year.append({
+                        'school_year': h.school_year,
+                        'count': year_violations,
+                        'grade_level': h.grade_level,
+                        'section': h.section,
+                    })
+
+                students_data.append({
+                    'id': student.id,
+                    'student_id': student.student_id,
+                    'name': student.user.get_full_name(),
+                    'grade_level': student.grade_level,
+                    'section': student.section,
+                    'strand': student.strand,
+                    'school_year': student.school_year,
+                    'violations_current_year': current_year_violations,
+                    'violations_all_time': all_time_violations,
+                    'violations_by_year': violations_by_year,
+                    'contact_number': student.contact_number,
+                    'guardian_name': student.guardian_name,
+                    'guardian_contact': student.guardian_contact,
+                })
+
+            return Response({
+                'success': True,
+                'school_year': current_sy,
+                'advisory_section': teacher.advising_section,
+                'advising_grade': teacher.advising_grade,
+                'advising_strand': teacher.advising_strand,
+                'students': students_data,
+                'total_students': len(students_data),
+            })
+
+        elif request.method == 'POST':
+            # Update section assignments
+            updates = request.data.get('updates', [])
+            # Expected format: [{'student_id': 1, 'section': 'Amber', 'grade_level': '12', 'strand': 'ICT'}, ...]
+
+            updated_count = 0
+            errors = []
+
+            from api.models import StudentSchoolYearHistory
+
+            with transaction.atomic():
+                for update in updates:
+                    try:
+                        student = Student.objects.get(id=update['student_id'])
+
+                        # Update student info
+                        if 'section' in update:
+                            student.section = update['section']
+                        if 'grade_level' in update:
+                            student.grade_level = update['grade_level']
+                        if 'strand' in update:
+                            student.strand = update['strand']
+
+                        student.save()
+
+                        # Update active history record
+                        history = StudentSchoolYearHistory.objects.filter(
+                            student=student,
+                            school_year=current_sy,
+                            is_active=True
+                        ).first()
+
+                        if history:
+                            history.section = student.section
+                            history.grade_level = student.grade_level
+                            history.strand = student.strand
+                            history.adviser = teacher
+                            history.save()
+                        else:
+                            # Create new history if missing
+                            StudentSchoolYearHistory.objects.create(
+                                student=student,
+                                school_year=current_sy,
+                                grade_level=student.grade_level,
+                                section=student.section,
+                                strand=student.strand,
+                                adviser=teacher,
+                                is_active=True,
+                            )
+
+                        updated_count += 1
+                        logger.info(f"✅ Updated: {student.user.get_full_name()} - {student.grade_level} {student.section}")
+
+                    except Student.DoesNotExist:
+                        errors.append(f"Student ID {update['student_id']} not found")
+                    except Exception as e:
+                        errors.append(f"Error updating student {update.get('student_id')}: {str(e)}")
+
+            return Response({
+                'success': True,
+                'message': f'Updated {updated_count} students',
+                'updated_count': updated_count,
+                'errors': errors if errors else None,
+            })
+
+    except Exception as e:
+        logger.error(f"❌ Error in adviser_manage_section: {e}")
+        import traceback
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=500)
+
+
+def _available_school_years():
+    """Return (school years with student data, newest first; calendar school year)"""
+    # ✅ One UNION query over Student and StudentSchoolYearHistory
+    school_years = Student.objects.order_by().values_list('school_year', flat=True).union(
+        StudentSchoolYearHistory.objects.order_by().values_list('school_year', flat=True)
+    )
+    all_years = sorted({y for y in school_years if y}, reverse=True)  # Remove None values and sort
+
+    # Calculate current school year
+    current_year = datetime.now().year
+    current_month = datetime.now().month
+    current_sy = f"{current_year}-{current_year + 1}" if current_month >= 6 else f"{current_year - 1}-{current_year}"
+
+    # Ensure current year is in the list
+    if current_sy not in all_years:
+        all_years.insert(0, current_sy)
+
+    return all_years, current_sy
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@versioned('student', 'school_year_history', extra=lambda request: (datetime.now().year, datetime.now().month >= 6))
+def get_available_school_years(request):
+    """
+    Get list of all school years that have student data
+    Returns both historical and current school years
+    """
+    try:
+        all_years, current_sy = _available_school_years()
+
+        logger.info(f"📅 Available school years: {all_years}")
+
+        return Response({
+            'success': True,
+            'school_years': all_years,
+            'current_school_year': current_sy,
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error getting school years: {e}")
+        import traceback
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=500)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def promote_students(request):
+    """
+    Promote students to next grade level and school year
+    Counselor can choose which students to promote or retain
+    """
+    try:
+        if not hasattr(request.user, 'counselor'):
+            return Response({
+                'success': False,
+                'error': 'Only counselors can promote students'
+            }, status=403)
+
+        # Get promotion data
+        student_promotions = request.data.get('promotions', [])
+        new_school_year = request.data.get('new_school_year')
+
+        if not new_school_year:
+            return Response({
+                'success': False,
+                'error': 'New school year is required'
+            }, status=400)
+
+        promoted_students = []
+        retained_students = []
+        graduated_students = []
+        errors = []
+
+        for promotion in student_promotions:
+            student_id = promotion.get('student_id')
+            action = promotion.get('action')  # 'promote', 'retain', 'graduate'
+            new_grade = promotion.get('new_grade')
+            new_section = promotion.get('new_section')
+
+            try:
+                student = Student.objects.get(id=student_id)
+
+                # Archive current data to history
+                StudentSchoolYearHistory.objects.create(
+                    student=student,
+                    school_year=student.school_year,
+                    grade_level=student.grade_level,
+                    section=student.section,
+                )
+
+                if action == 'promote':
+                    # Promote to next grade
+                    old_grade = student.grade_level
+                    student.grade_level = new_grade
+                    student.section = new_section
+                    student.school_year = new_school_year
+                    student.save()
+
+                    promoted_students.append({
+                        'id': student.id,
+                        'name': student.user.get_full_name(),
+                        'old_grade': old_grade,
+                        'new_grade': new_grade,
+                        'new_section': new_section,
+                    })
+
+                    logger.info(f"✅ Promoted: {student.user.get_full_name()} from Grade {old_grade} to Grade {new_grade}")
+
+                elif action == 'retain':
+                    # Keep same grade, update school year
+                    student.school_year = new_school_year
+                    if new_section:
+                        student.section = new_section
+                    student.save()
+
+                    retained_students.append({
+                        'id': student.id,
+                        'name': student.user.get_full_name(),
+                        'grade_level': student.grade_level,
+                        'new_section': new_section,
+                    })
+
+                    logger.info(f"🔄 Retained: {student.user.get_full_name()} in Grade {student.grade_level}")
+
+                elif action == 'graduate':
+                    # Mark as graduated
+                    student.school_year = f"{new_school_year} - GRADUATED"
+                    student.is_active = False
+                    student.save()
+
+                    graduated_students.append({
+                        'id': student.id,
+                        'name': student.user.get_full_name(),
+                    })
+
+                    logger.info(f"🎓 Graduated: {student.user.get_full_name()}")
+
+            except Student.DoesNotExist:
+                errors.append(f"Student with ID {student_id} not found")
+            except Exception as e:
+                errors.append(f"Error processing student {student_id}: {str(e)}")
+
+        return Response({
+            'success': True,
+            'promoted': promoted_students,
+            'retained': retained_students,
+            'graduated': graduated_students,
+            'errors': errors,
+            'total_processed': len(promoted_students) + len(retained_students) + len(graduated_students),
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error promoting students: {e}")
+        import traceback
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=500)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_promote_grade(request):
+    """
+    Bulk promote all students in a specific grade level
+    Runs as a background job; poll GET /api/jobs/<job_id>/ for progress.
+    """
+    try:
+        if not hasattr(request.user, 'counselor'):
+            return Response({
+                'success': False,
+                'error': 'Only counselors can promote students'
+            }, status=403)
+
+        current_grade = str(request.data.get('current_grade') or '')
+        current_school_year = request.data.get('current_school_year')
+        new_school_year = request.data.get('new_school_year')
+        exclude_student_ids = request.data.get('exclude_students', [])  # Students to retain
+
+        if not current_grade.isdigit() or not current_school_year or not new_school_year:
+            return Response({
+                'success': False,
+                'error': 'current_grade, current_school_year and new_school_year are required'
+            }, status=400)
+
+        job = jobs.enqueue('school_year.bulk_promote', {
+            'current_grade': current_grade,
+            'current_school_year': current_school_year,
+            'new_school_year': new_school_year,
+            'exclude_student_ids': exclude_student_ids,
+        }, force_queue=True, created_by=request.user)
+        jobs.spawn(job)
+
+        return Response({
+            'success': True,
+            'message': f'Promotion of Grade {current_grade} started',
+            'job': _job_data(job),
+        }, status=status.HTTP_202_ACCEPTED)
+
+    except Exception as e:
+        logger.error(f"❌ Error in bulk promotion: {e}")
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=500)
+
+
+def _job_data(job):
+    progress = job.progress or {}
+    return {
+        'id': job.id,
+        'task': job.task,
+        'status': job.status,
+        'attempts': job.attempts,
+        'processed': progress.get('processed', 0),
+        'total': progress.get('total'),
+        'errors': progress.get('error_count', 0),
+        'error_messages': progress.get('errors', []),
+        'counts': progress.get('counts', {}),
+        'last_error': job.last_error or None,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+def _get_visible_job(request, job_id):
+    """The job if this user started it (or is staff), else None"""
+    jobs_qs = Job.objects.all()
+    if not request.user.is_staff:
+        jobs_qs = jobs_qs.filter(created_by=request.user)
+    return jobs_qs.filter(id=job_id).first()
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def job_status(request, job_id):
+    """Progress of a background job (processed / total / errors)"""
+    job = _get_visible_job(request, job_id)
+    if not job:
+        return Response({
+            'success': False,
+            'error': 'Job not found'
+        }, status=404)
+
+    return Response({
+        'success': True,
+        'job': _job_data(job),
+    })
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def resume_job(request, job_id):
+    """Re-run a failed or stranded job; rollover and promotion continue after the last completed chunk"""
+    job = _get_visible_job(request, job_id)
+    if not job:
+        return Response({
+            'success': False,
+            'error': 'Job not found'
+        }, status=404)
+
+    if not jobs.resume(job):
+        return Response({
+            'success': False,
+            'error': f'Only failed, pending or abandoned jobs can be resumed (job is {job.status})'
+        }, status=409)
+
+    job.refresh_from_db()
+    jobs.spawn(job)
+    logger.info(f"🔁 Job #{job.id} ({job.task}) resumed by {request.user.username}")
+
+    return Response({
+        'success': True,
+        'job': _job_data(job),
+    }, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_promotion_preview(request):
+    """
+    Get preview of students eligible for promotion
+    Shows current grade distribution and suggested promotions
+    """
+    try:
+        if not hasattr(request.user, 'counselor'):
+            return Response({
+                'success': False,
+                'error': 'Only counselors can view promotion preview'
+            }, status=403)
+
+        current_school_year = request.GET.get('school_year')
+
+        if not current_school_year:
+            return Response({
+                'success': False,
+                'error': 'School year is required'
+            }, status=400)
+
+        # Get students by grade level
+        students_by_grade = {}
+
+        for grade in range(7, 13):  # Grades 7-12
+            grade_str = str(grade)
+            students = Student.objects.filter(
+                grade_level=grade_str,
+                school_year=current_school_year,
+                is_active=True
+            ).select_related('user')
+
+            students_data = []
+            for student in students:
+                # Get violation count for this year
+                violation_count = StudentViolationRecord.objects.filter(
+                    student=student,
+                    school_year=current_school_year
+                ).count()
+
+                # Suggest action based on violations
+                suggested_action = 'promote'
+                if violation_count >= 10:  # High violations
+                    suggested_action = 'review'  # Needs manual review
+                elif grade == 12:
+                    suggested_action = 'graduate'
+
+                students_data.append({
+                    'id': student.id,
+                    'student_id': student.student_id,
+                    'name': student.user.get_full_name(),
+                    'current_grade': grade_str,
+                    'current_section': student.section,
+                    'violation_count': violation_count,
+                    'suggested_action': suggested_action,
+                    'next_grade': str(grade + 1) if grade < 12 else 'Graduate',
+                })
+
+            students_by_grade[grade_str] = students_data
+
+        return Response({
+            'success': True,
+            'current_school_year': current_school_year,
+            'students_by_grade': students_by_grade,
+            'total_students': sum(len(s) for s in students_by_grade.values()),
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error getting promotion preview: {e}")
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=500)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def counselor_available_school_years(request):
+    """
+    Get list of available school years from student records
+    Used by counselors to filter data by school year
+    """
+    try:
+        # Verify user is a counselor
+        if not hasattr(request.user, 'counselor'):
+            return Response({
+                'success': False,
+                'error': 'Only counselors can access this endpoint'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        # Get distinct school years from students
+        school_years = Student.objects.values_list('school_year', flat=True).distinct().order_by('-school_year')
+
+        # Convert to list and filter out None values
+        school_years_list = [sy for sy in school_years if sy]
+
+        logger.info(f"📅 Available school years: {school_years_list}")
+
+        return Response({
+            'success': True,
+            'school_years': school_years_list,
+            'count': len(school_years_list)
+        }, status=status.HTTP_200_OK)
+
+    except Exception as e:
+        logger.error(f"❌ Error fetching school years: {str(e)}")
+        return Response({
+            'success': False,
+            'error': f'Failed to fetch school years: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,816 @@
+"""
+Student records: listing, search, CRUD, archiving, bulk import and privacy settings.
+"""
+
+from django.contrib.auth.models import User
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from django.db import transaction
+import json
+import logging
+import traceback
+from .. import tokens
+from ..models import Student, StudentViolationRecord
+from .common import get_current_school_year
+
+logger = logging.getLogger(__name__)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def teacher_advising_students(request):
+    """Get students in teacher's advising section"""
+    try:
+        if not hasattr(request.user, 'teacher'):
+            return Response({
+                'success': False,
+                'error': 'Teacher profile not found',
+                'students': []
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        teacher = request.user.teacher
+
+        # Check if teacher has an advising section
+        if not teacher.advising_section:
+            return Response({
+                'success': True,
+                'students': [],
+                'message': 'No advising section assigned'
+            })
+
+        # Filter students ONLY by section (since that's what exists in your Student table)
+        students_query = Student.objects.select_related('user').filter(
+            section=teacher.advising_section
+        )
+
+        logger.info(f"🔍 Teacher: {teacher.user.username}")
+        logger.info(f"🔍 Advising Section: {teacher.advising_section}")
+        logger.info(f"🔍 Found {students_query.count()} students in section {teacher.advising_section}")
+
+        students_data = []
+        for student in students_query:
+            students_data.append({
+                'id': student.id,
+                'user_id': student.user.id,
+                'first_name': student.user.first_name or '',
+                'last_name': student.user.last_name or '',
+                'username': student.user.username,
+                'email': student.user.email or '',
+                'student_id': getattr(student, 'student_id', '') or f"STU-{student.id:04d}",
+                'lrn': getattr(student, 'lrn', '') or '',  # ✅ NEW: Add LRN field
+                'grade_level': getattr(student, 'grade_level', '') or '',
+                'strand': getattr(student, 'strand', '') or '',
+                'section': student.section or '',
+                'contact_number': getattr(student, 'contact_number', '') or '',
+                'guardian_name': getattr(student, 'guardian_name', '') or '',
+                'guardian_contact': getattr(student, 'guardian_contact', '') or '',
+                'created_at': student.created_at.isoformat() if hasattr(student, 'created_at') and student.created_at else None,
+            })
+
+        return Response({
+            'success': True,
+            'students': students_data,
+            'total_count': len(students_data),
+            'advising_info': {
+                'section': teacher.advising_section or '',
+                'grade': getattr(teacher, 'advising_grade', '') or '',
+                'strand': getattr(teacher, 'advising_strand', '') or '',
+            },
+            'filter_applied': f"section = {teacher.advising_section}"
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error fetching advising students: {str(e)}")
+        return Response({
+            'success': False,
+            'error': str(e),
+            'students': []
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+# General utility views (existing ones)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_students_list(request):
+    """Get students list with optional school year filter"""
+    try:
+        # ✅ Get school year from query params
+        school_year = request.GET.get('school_year', None)
+
+        # Base query
+        students_query = Student.objects.select_related('user').filter(is_archived=False)
+
+        # ✅ Filter by school year if provided
+        if school_year and school_year != 'all':
+            students_query = students_query.filter(school_year=school_year)
+            logger.info(f"📅 Filtering students by school year: {school_year}")
+
+        students = students_query.order_by('user__last_name', 'user__first_name')
+
+        students_data = []
+        for student in students:
+            students_data.append({
+                'id': student.id,
+                'student_id': student.student_id,
+                'lrn': getattr(student, 'lrn', '') or '',  # ✅ NEW: Add LRN
+                'username': student.user.username,
+                'first_name': student.user.first_name,
+                'last_name': student.user.last_name,
+                'email': student.user.email,
+                'grade_level': student.grade_level,
+                'section': student.section,
+                'strand': student.strand,
+                'school_year': student.school_year,
+                'contact_number': student.contact_number,
+                'guardian_name': student.guardian_name,
+                'guardian_contact': student.guardian_contact,
+            })
+
+        return Response({
+            'success': True,
+            'students': students_data,
+            'total': len(students_data),
+            'filtered_by_school_year': school_year if school_year and school_year != 'all' else None,
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error fetching students: {e}")
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=500)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def add_student(request):
+    """Add a single student"""
+    try:
+        # Check if user is a counselor
+        if not hasattr(request.user, 'counselor'):
+            return Response({
+                'success': False,
+                'error': 'Access denied. Counselor role required.'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        data = json.loads(request.body)
+
+        # Create username from name
+        first_name = data.get('first_name', '').strip()
+        last_name = data.get('last_name', '').strip()
+
+        if not first_name or not last_name:
+            return Response({
+                'success': False,
+                'error': 'First name and last name are required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # Generate username
+        base_username = f"{first_name.lower()}.{last_name.lower()}".replace(' ', '')
+        username = base_username
+        counter = 1
+        while User.objects.filter(username=username).exists():
+            username = f"{base_username}{counter}"
+            counter += 1
+
+        with transaction.atomic():
+            # Create user
+            user = User.objects.create_user(
+                username=username,
+                first_name=first_name,
+                last_name=last_name,
+                email=data.get('email', ''),
+                password='student123'  # Default password
+            )
+
+            # Generate student ID
+            student_id = data.get('student_id') or f"STU-{user.id:04d}"
+
+            # Create student
+            student = Student.objects.create(
+                user=user,
+                student_id=student_id,
+                grade_level=data.get('grade_level'),
+                section=data.get('section'),
+                strand=data.get('strand', ''),
+                contact_number=data.get('contact_number', ''),
+                guardian_name=data.get('guardian_name', ''),
+                guardian_contact=data.get('guardian_contact', '')
+            )
+
+        return Response({
+            'success': True,
+            'message': 'Student added successfully',
+            'student': {
+                'id': student.id,
+                'username': username,
+                'student_id': student_id,
+                'name': f"{first_name} {last_name}"
+            }
+        }, status=status.HTTP_201_CREATED)
+
+    except json.JSONDecodeError:
+        return Response({
+            'success': False,
+            'error': 'Invalid JSON data'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        logger.error(f"Add student error: {str(e)}")
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['PUT'])
+@permission_classes([IsAuthenticated])
+def update_student(request, student_id):
+    """Update a student"""
+    try:
+        # Check if user is a counselor
+        if not hasattr(request.user, 'counselor'):
+            return Response({
+                'success': False,
+                'error': 'Access denied. Counselor role required.'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            student = Student.objects.get(id=student_id)
+        except Student.DoesNotExist:
+            return Response({
+                'success': False,
+                'error': 'Student not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        data = json.loads(request.body)
+
+        # Update user fields
+        user = student.user
+        if 'first_name' in data:
+            user.first_name = data['first_name']
+        if 'last_name' in data:
+            user.last_name = data['last_name']
+        if 'email' in data:
+            user.email = data['email']
+        user.save()
+
+        # Update student fields
+        if 'grade_level' in data:
+            student.grade_level = data['grade_level']
+        if 'section' in data:
+            student.section = data['section']
+        if 'strand' in data:
+            student.strand = data['strand']
+        if 'contact_number' in data:
+            student.contact_number = data['contact_number']
+        if 'guardian_name' in data:
+            student.guardian_name = data['guardian_name']
+        if 'guardian_contact' in data:
+            student.guardian_contact = data['guardian_contact']
+
+        student.save()
+
+        return Response({
+            'success': True,
+            'message': 'Student updated successfully'
+        })
+
+    except json.JSONDecodeError:
+        return Response({
+            'success': False,
+            'error': 'Invalid JSON data'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        logger.error(f"Update student error: {str(e)}")
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['DELETE'])
+@permission_classes([IsAuthenticated])
+def delete_student(request, student_id):
+    """Delete a student (archive first if not archived)"""
+    try:
+        # Check if user is a counselor
+        if not hasattr(request.user, 'counselor'):
+            return Response({
+                'success': False,
+                'error': 'Access denied. Counselor role required.'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            student = Student.objects.get(id=student_id)
+        except Student.DoesNotExist:
+            return Response({
+                'success': False,
+                'error': 'Student not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        if not student.is_archived:
+            student.is_archived = True
+            student.save()
+            tokens.revoke_user_tokens([student.user_id])
+            return Response({
+                'success': True,
+                'message': 'Student archived. You must archive before deletion.'
+            }, status=status.HTTP_200_OK)
+
+        # Delete the user (this will cascade delete the student)
+        user = student.user
+        user.delete()
+
+        return Response({
+            'success': True,
+            'message': 'Student deleted successfully'
+        })
+
+    except Exception as e:
+        logger.error(f"Delete student error: {str(e)}")
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def counselor_students_list(request):
+    """
+    Get list of all students with optional filtering
+    Used by counselors to view student records
+    """
+    try:
+        # Verify user is a counselor
+        if not hasattr(request.user, 'counselor'):
+            return Response({
+                'success': False,
+                'error': 'Only counselors can access this endpoint'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        # Get school year parameter (optional)
+        school_year = request.GET.get('school_year', None)
+
+        logger.info(f"📊 Fetching students list, school_year parameter: {school_year}")
+
+        # Base query - get all students with their user data
+        students_query = Student.objects.select_related('user').order_by(
+            'grade_level', 'section', 'user__last_name', 'user__first_name'
+        )
+
+        # Filter by school year if provided
+        if school_year:
+            students_query = students_query.filter(school_year=school_year)
+            logger.info(f"🔍 Filtering by school year: {school_year}")
+
+        # Serialize student data
+        students_data = []
+        for student in students_query:
+            # Get violation count for this student
+            violation_count = StudentViolationRecord.objects.filter(
+                student=student,
+                school_year=student.school_year
+            ).count()
+
+            student_data = {
+                'id': student.id,
+                'student_id': student.student_id,
+                'user_id': student.user.id,
+                'username': student.user.username,
+                'email': student.user.email,
+                'first_name': student.user.first_name,
+                'last_name': student.user.last_name,
+                'full_name': f"{student.user.first_name} {student.user.last_name}".strip(),
+                'grade_level': student.grade_level,
+                'strand': student.strand or '',
+                'section': student.section,
+                'school_year': student.school_year,
+                'guardian_name': student.guardian_name or '',
+                'guardian_contact': student.guardian_contact or '',
+                'contact_number': student.contact_number or '',
+                'violation_count': violation_count,
+                'created_at': student.created_at.isoformat() if student.created_at else None,
+            }
+            students_data.append(student_data)
+
+        logger.info(f"✅ Successfully fetched {len(students_data)} students")
+
+        return Response({
+            'success': True,
+            'students': students_data,
+            'total_count': len(students_data),
+            'filtered_by_school_year': school_year
+        }, status=status.HTTP_200_OK)
+
+    except Exception as e:
+        logger.error(f"❌ Error fetching students: {str(e)}")
+        logger.error(traceback.format_exc())
+        return Response({
+            'success': False,
+            'error': f'Failed to fetch students: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def search_students(request):
+    """Search for students by name - for report submission"""
+    try:
+        query = request.GET.get('q', '').strip()
+
+        if not query or len(query) < 2:
+            return Response({
+                'success': False,
+                'error': 'Search query must be at least 2 characters'
+            }, status=400)
+
+        # Search students
+        from django.db.models import Q
+        students = Student.objects.filter(
+            Q(user__first_name__icontains=query) |
+            Q(user__last_name__icontains=query) |
+            Q(student_id__icontains=query)
+        ).select_related('user')[:10]  # Limit to 10 results
+
+        results = []
+        for student in students:
+            results.append({
+                'id': student.id,
+                'name': f"{student.user.first_name} {student.user.last_name}",
+                'student_id': student.student_id,
+                'grade_level': student.grade_level,
+                'section': student.section,
+            })
+
+        return Response({
+            'success': True,
+            'students': results,
+            'count': len(results)
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error searching students: {e}")
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=500)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def archived_students_list(request):
+    """
+    Get list of archived students for admin/counselor.
+    """
+    try:
+        # Only allow staff or counselor
+        if not (request.user.is_staff or hasattr(request.user, 'counselor')):
+            return Response({
+                'success': False,
+                'error': 'Access denied. Admin or counselor role required.'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        students_query = Student.objects.select_related('user').filter(is_archived=True)
+        students_data = []
+        for student in students_query:
+            students_data.append({
+                'id': student.id,
+                'student_id': student.student_id,
+                'username': student.user.username,
+                'first_name': student.user.first_name,
+                'last_name': student.user.last_name,
+                'email': student.user.email,
+                'grade_level': student.grade_level,
+                'section': student.section,
+                'strand': student.strand,
+                'school_year': student.school_year,
+                'contact_number': student.contact_number,
+                'guardian_name': student.guardian_name,
+                'guardian_contact': student.guardian_contact,
+            })
+        return Response({
+            'success': True,
+            'archived_students': students_data,
+            'total': len(students_data),
+        })
+    except Exception as e:
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def restore_student(request, student_id):
+    """
+    Restore an archived student (set is_archived=False)
+    """
+    try:
+        if not (request.user.is_staff or hasattr(request.user, 'counselor')):
+            return Response({'success': False, 'error': 'Access denied.'}, status=403)
+        student = Student.objects.get(id=student_id)
+        if not student.is_archived:
+            return Response({'success': False, 'error': 'Student is not archived.'}, status=400)
+        student.is_archived = False
+        student.save()
+        return Response({'success': True, 'message': 'Student restored.'})
+    except Student.DoesNotExist:
+        return Response({'success': False, 'error': 'Student not found.'}, status=404)
+    except Exception as e:
+        return Response({'success': False, 'error': str(e)}, status=500)
+
+
+@api_view(['DELETE'])
+@permission_classes([IsAuthenticated])
+def delete_student_permanent(request, student_id):
+    """
+    Permanently delete an archived student.
+    """
+    try:
+        if not (request.user.is_staff or hasattr(request.user, 'counselor')):
+            return Response({'success': False, 'error': 'Access denied.'}, status=403)
+        student = Student.objects.get(id=student_id)
+        if not student.is_archived:
+            return Response({'success': False, 'error': 'Student must be archived before permanent deletion.'}, status=400)
+        user = student.user
+        student.delete()
+        user.delete()
+        return Response({'success': True, 'message': 'Student permanently deleted.'})
+    except Student.DoesNotExist:
+        return Response({'success': False, 'error': 'Student not found.'}, status=404)
+    except Exception as e:
+        return Response({'success': False, 'error': str(e)}, status=500)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_add_students(request):
+    """Bulk add multiple students at once"""
+    try:
+        # Check if user is a counselor
+        if not hasattr(request.user, 'counselor'):
+            return Response({
+                'success': False,
+                'error': 'Access denied. Counselor role required.'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        students_data = request.data.get('students', [])
+
+        if not students_data:
+            return Response({
+                'success': False,
+                'error': 'No students data provided'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        added_students = []
+        errors = []
+
+        # Get current school year
+        current_school_year = get_current_school_year()
+
+        with transaction.atomic():
+            for idx, student_data in enumerate(students_data):
+                try:
+                    first_name = student_data.get('first_name', '').strip()
+                    last_name = student_data.get('last_name', '').strip()
+                    email = student_data.get('email', '').strip()
+                    grade_level = student_data.get('grade_level')
+                    section = student_data.get('section')
+
+                    if not first_name or not last_name:
+                        errors.append(f"Row {idx + 1}: First name and last name are required")
+                        continue
+
+                    if not grade_level or not section:
+                        errors.append(f"Row {idx + 1}: Grade level and section are required")
+                        continue
+
+                    # Generate username
+                    base_username = f"{first_name.lower()}.{last_name.lower()}".replace(' ', '')
+                    username = base_username
+                    counter = 1
+                    while User.objects.filter(username=username).exists():
+                        username = f"{base_username}{counter}"
+                        counter += 1
+
+                    # Create user
+                    user = User.objects.create_user(
+                        username=username,
+                        first_name=first_name,
+                        last_name=last_name,
+                        email=email if email else f"{username}@school.edu",
+                        password='student123'  # Default password
+                    )
+
+                    # Generate student ID
+                    student_id = f"STU-{user.id:04d}"
+
+                    # Create student
+                    student = Student.objects.create(
+                        user=user,
+                        student_id=student_id,
+                        grade_level=grade_level,
+                        section=section,
+                        strand=student_data.get('strand', ''),
+                        school_year=current_school_year,
+                        contact_number=student_data.get('contact_number', ''),
+                        guardian_name=student_data.get('guardian_name', ''),
+                        guardian_contact=student_data.get('guardian_contact', '')
+                    )
+
+                    added_students.append({
+                        'id': student.id,
+                        'student_id': student_id,
+                        'username': username,
+                        'name': f"{first_name} {last_name}"
+                    })
+
+                    logger.info(f"✅ Bulk add: Created student {username} (ID: {student_id})")
+
+                except Exception as e:
+                    logger.error(f"❌ Error adding student at row {idx + 1}: {str(e)}")
+                    errors.append(f"Row {idx + 1}: {str(e)}")
+                    continue
+
+        return Response({
+            'success': True,
+            'message': f'Successfully added {len(added_students)} students',
+            'added_students': added_students,
+            'total_attempted': len(students_data),
+            'errors': errors if errors else None,
+            'school_year': current_school_year
+        }, status=status.HTTP_201_CREATED)
+
+    except Exception as e:
+        logger.error(f"❌ Bulk add students error: {str(e)}")
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+# ✅ NEW: Update Student Profile
+@api_view(['PUT', 'PATCH'])
+@permission_classes([IsAuthenticated])
+def update_student_profile(request):
+    """Update student profile information"""
+    try:
+        if not hasattr(request.user, 'student'):
+            return Response({
+                'success': False,
+                'error': 'Student profile not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        student = request.user.student
+        user = request.user
+        data = request.data
+
+        logger.info(f"📝 Updating profile for student: {user.username}")
+
+        with transaction.atomic():
+            # Update User fields
+            if 'first_name' in data:
+                user.first_name = data['first_name'].strip()
+
+            if 'last_name' in data:
+                user.last_name = data['last_name'].strip()
+
+            if 'email' in data:
+                email = data['email'].strip()
+                # Check if email is already taken by another user
+                if email and User.objects.filter(email=email).exclude(id=user.id).exists():
+                    return Response({
+                        'success': False,
+                        'error': 'Email already in use by another account'
+                    }, status=status.HTTP_400_BAD_REQUEST)
+                user.email = email
+
+            user.save()
+
+            # Update Student fields
+            if 'contact_number' in data:
+                student.contact_number = data['contact_number'].strip()
+
+            if 'guardian_name' in data:
+                student.guardian_name = data['guardian_name'].strip()
+
+            if 'guardian_contact' in data:
+                student.guardian_contact = data['guardian_contact'].strip()
+
+            student.save()
+
+        logger.info(f"✅ Profile updated successfully for {user.username}")
+
+        # Return updated profile
+        return Response({
+            'success': True,
+            'message': 'Profile updated successfully',
+            'student': {
+                'id': student.id,
+                'username': user.username,
+                'first_name': user.first_name,
+                'last_name': user.last_name,
+                'full_name': f"{user.first_name} {user.last_name}".strip(),
+                'email': user.email,
+                'contact_number': student.contact_number,
+                'guardian_name': student.guardian_name,
+                'guardian_contact': student.guardian_contact,
+            }
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error updating student profile: {str(e)}")
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': f'Failed to update profile: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+# ✅ NEW: Get Student Privacy Settings
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_student_privacy_settings(request):
+    """Get student privacy settings"""
+    try:
+        if not hasattr(request.user, 'student'):
+            return Response({
+                'success': False,
+                'error': 'Student profile not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        student = request.user.student
+
+        # Get or create privacy settings (you may need to add these fields to Student model)
+        privacy_settings = {
+            'show_reports_to_others': getattr(student, 'show_reports_to_others', True),
+            'allow_peer_reports': getattr(student, 'allow_peer_reports', True),
+            'share_contact_info': getattr(student, 'share_contact_info', False),
+        }
+
+        return Response({
+            'success': True,
+            'privacy_settings': privacy_settings
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error getting privacy settings: {str(e)}")
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+# ✅ NEW: Update Student Privacy Settings
+@api_view(['PUT', 'PATCH'])
+@permission_classes([IsAuthenticated])
+def update_student_privacy_settings(request):
+    """Update student privacy settings"""
+    try:
+        if not hasattr(request.user, 'student'):
+            return Response({
+                'success': False,
+                'error': 'Student profile not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        student = request.user.student
+        data = request.data
+
+        logger.info(f"🔒 Updating privacy settings for student: {request.user.username}")
+
+        # Update privacy settings (add these fields to Student model if they don't exist)
+        if 'show_reports_to_others' in data:
+            student.show_reports_to_others = data['show_reports_to_others']
+
+        if 'allow_peer_reports' in data:
+            student.allow_peer_reports = data['allow_peer_reports']
+
+        if 'share_contact_info' in data:
+            student.share_contact_info = data['share_contact_info']
+
+        student.save()
+
+        logger.info(f"✅ Privacy settings updated for {request.user.username}")
+
+        return Response({
+            'success': True,
+            'message': 'Privacy settings updated successfully',
+            'privacy_settings': {
+                'show_reports_to_others': student.show_reports_to_others,
+                'allow_peer_reports': student.allow_peer_reports,
+                'share_contact_info': student.share_contact_info,
+            }
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error updating privacy settings: {str(e)}")
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': f'Failed to update privacy settings: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
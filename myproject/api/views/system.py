@@ -0,0 +1,390 @@
+"""
+System settings, system reports, app bootstrap, metrics and the batch API.
+"""
+
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
+from rest_framework.response import Response
+from rest_framework import status
+from django.utils import timezone
+import logging
+import traceback
+from .. import metrics
+from .. import batch as batch_ops
+from ..conditional import versioned
+from ..violation_registry import violation_types as violation_registry
+from ..models import Student, StudentReport, TeacherReport, Notification, ViolationType, StudentViolationRecord, SystemSettings
+from .common import get_current_school_year
+from .auth import _counselor_profile_data, _student_profile_data, _teacher_profile_data
+from .reports import COUNSELOR_STUDENT_REPORT_FIELDSET, TEACHER_REPORT_FIELDSET, _student_own_report_data
+from .violations import _violation_type_data
+from .school_year import _available_school_years
+
+logger = logging.getLogger(__name__)
+
+
+def _system_settings_data(settings):
+    return {
+        'current_school_year': settings.current_school_year,
+        'school_year_start_date': settings.school_year_start_date.isoformat() if settings.school_year_start_date else None,
+        'school_year_end_date': settings.school_year_end_date.isoformat() if settings.school_year_end_date else None,
+        'is_system_active': settings.is_system_active,
+        'system_message': settings.system_message,
+        'last_updated': settings.last_updated.isoformat(),
+    }
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])  # Available to all users
+@versioned('system_settings')
+def get_system_settings(request):
+    """Get current system settings including active school year"""
+    try:
+        settings = SystemSettings.get_current_settings()
+
+        return Response({
+            'success': True,
+            'settings': _system_settings_data(settings)
+        })
+    except Exception as e:
+        logger.error(f"❌ Error fetching system settings: {e}")
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def update_system_settings(request):
+    """Update system settings (Admin only)"""
+    try:
+        # Check if user is admin
+        if not request.user.is_staff and not request.user.is_superuser:
+            return Response({
+                'success': False,
+                'error': 'Only administrators can update system settings'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        settings = SystemSettings.get_current_settings()
+
+        # Update fields
+        if 'current_school_year' in request.data:
+            settings.current_school_year = request.data['current_school_year']
+
+        if 'school_year_start_date' in request.data:
+            settings.school_year_start_date = request.data['school_year_start_date']
+
+        if 'school_year_end_date' in request.data:
+            settings.school_year_end_date = request.data['school_year_end_date']
+
+        if 'is_system_active' in request.data:
+            settings.is_system_active = request.data['is_system_active']
+
+        if 'system_message' in request.data:
+            settings.system_message = request.data['system_message']
+
+        settings.updated_by = request.user
+        settings.save()
+
+        logger.info(f"✅ System settings updated by {request.user.username}")
+        logger.info(f"   Current S.Y.: {settings.current_school_year}")
+        logger.info(f"   System Active: {settings.is_system_active}")
+
+        return Response({
+            'success': True,
+            'message': 'System settings updated successfully',
+            'settings': {
+                'current_school_year': settings.current_school_year,
+                'is_system_active': settings.is_system_active,
+                'system_message': settings.system_message,
+            }
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error updating system settings: {e}")
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def create_system_report(request):
+    """Create a counselor-recorded violation (no report needed)"""
+    try:
+        if not hasattr(request.user, 'counselor'):
+            return Response({
+                'success': False,
+                'error': 'Only counselors can record violations'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        counselor = request.user.counselor
+        data = request.data
+
+        # Get ViolationType instance
+        violation_type_name = data.get('violation_type', '')
+        violation_type_instance = None
+
+        if violation_type_name:
+            try:
+                violation_type_instance = ViolationType.objects.get(name=violation_type_name)
+                logger.info(f"✅ Found violation type: {violation_type_instance.name} (ID: {violation_type_instance.id})")
+            except ViolationType.DoesNotExist:
+                logger.warning(f"⚠️ Violation type '{violation_type_name}' not found")
+                return Response({
+                    'success': False,
+                    'error': f'Violation type "{violation_type_name}" not found'
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+        # Get student
+        reported_student_id = data.get('reported_student_id')
+        if not reported_student_id:
+            return Response({
+                'success': False,
+                'error': 'Student ID is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            student = Student.objects.get(id=reported_student_id)
+        except Student.DoesNotExist:
+            return Response({
+                'success': False,
+                'error': 'Student not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        # ✅ Create violation record (removed severity, location fields)
+        violation = StudentViolationRecord.objects.create(
+            student=student,
+            violation_type=violation_type_instance,
+            counselor=counselor,
+            incident_date=timezone.now(),
+            description=data.get('description', ''),
+            status='active',
+            school_year=get_current_school_year(),
+            counselor_notes=f"Recorded by {counselor.user.get_full_name()} via Add Violation",
+        )
+
+        logger.info(f"✅ Counselor violation recorded: #{violation.id} by {request.user.username}")
+        logger.info(f"   Student: {student.user.get_full_name()} ({student.student_id})")
+        logger.info(f"   Violation: {violation_type_instance.name}")
+        logger.info(f"   School Year: {violation.school_year}")
+
+        return Response({
+            'success': True,
+            'id': violation.id,
+            'violation_id': violation.id,
+            'message': 'Violation recorded successfully',
+            'violation': {
+                'id': violation.id,
+                'student_id': student.id,
+                'student_name': student.user.get_full_name(),
+                'violation_type': violation_type_instance.name,
+                'school_year': violation.school_year,
+                'recorded_at': violation.recorded_at.isoformat(),
+            }
+        }, status=status.HTTP_201_CREATED)
+
+    except KeyError as e:
+        logger.error(f"❌ Missing required field: {str(e)}")
+        return Response({
+            'success': False,
+            'error': f'Missing required field: {str(e)}'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        logger.error(f"❌ Error recording counselor violation: {str(e)}")
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+# Startup data is capped so the bootstrap response stays small
+BOOTSTRAP_NOTIFICATION_LIMIT = 50
+
+
+BOOTSTRAP_REPORT_LIMIT = 100
+
+
+def _notification_data(notification):
+    return {
+        'id': notification.id,
+        'title': notification.title,
+        'message': notification.message,
+        'type': notification.type,
+        'is_read': notification.is_read,
+        'created_at': notification.created_at,
+        'related_report_id': notification.related_student_report_id or notification.related_teacher_report_id,
+    }
+
+
+def _bootstrap_profile(user):
+    """(role, profile) of a user fetched with select_related('student', 'teacher', 'counselor')"""
+    if hasattr(user, 'student'):
+        return 'student', _student_profile_data(user.student, user)
+    if hasattr(user, 'teacher'):
+        return 'teacher', _teacher_profile_data(user.teacher, user)
+    if hasattr(user, 'counselor'):
+        return 'counselor', _counselor_profile_data(user.counselor, user)
+    return None, None
+
+
+def _bootstrap_reports(user, role):
+    """The reports a role starts from, keyed as in the bootstrap response"""
+    if role == 'student':
+        reports = StudentReport.objects.filter(
+            reporter_student=user.student
+        ).select_related('violation_type', 'reported_student__user').order_by('-created_at')[:BOOTSTRAP_REPORT_LIMIT]
+        return {'reports': [_student_own_report_data(report, user.student) for report in reports]}
+
+    if role == 'teacher':
+        fields = list(TEACHER_REPORT_FIELDSET.fields)
+        reports = TEACHER_REPORT_FIELDSET.apply(
+            TeacherReport.objects.filter(reporter_teacher=user.teacher),
+            fields
+        ).order_by('-created_at')[:BOOTSTRAP_REPORT_LIMIT]
+        return {'reports': [TEACHER_REPORT_FIELDSET.serialize(report, fields) for report in reports]}
+
+    # ✅ Counselors start from the reports that still need action
+    open_statuses = ['pending', 'under_review']
+    student_fields = list(COUNSELOR_STUDENT_REPORT_FIELDSET.fields)
+    student_reports = COUNSELOR_STUDENT_REPORT_FIELDSET.apply(
+        StudentReport.objects.filter(status__in=open_statuses),
+        student_fields
+    ).order_by('-created_at')[:BOOTSTRAP_REPORT_LIMIT]
+    teacher_fields = list(TEACHER_REPORT_FIELDSET.fields)
+    teacher_reports = TEACHER_REPORT_FIELDSET.apply(
+        TeacherReport.objects.filter(status__in=open_statuses),
+        teacher_fields
+    ).order_by('-created_at')[:BOOTSTRAP_REPORT_LIMIT]
+    return {
+        'student_reports': [COUNSELOR_STUDENT_REPORT_FIELDSET.serialize(r, student_fields) for r in student_reports],
+        'teacher_reports': [TEACHER_REPORT_FIELDSET.serialize(r, teacher_fields) for r in teacher_reports],
+    }
+
+
+def _bootstrap_shared():
+    """Catalog data that is the same for every user"""
+    school_years, current_school_year = _available_school_years()
+    return {
+        'violation_types': [_violation_type_data(vt) for vt in violation_registry.all()],
+        'school_years': school_years,
+        'current_school_year': current_school_year,
+        'system_settings': _system_settings_data(SystemSettings.get_current_settings()),
+    }
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def bootstrap(request):
+    """
+    Everything a role needs on app start in one response: profile,
+    notifications, reports, violation types, school years and system settings.
+    Uses a fixed number of queries no matter how much data the user has.
+    (GET /api/async/bootstrap/ returns the same data from an async view.)
+    """
+    try:
+        # ✅ Role and profile in one query (reverse one-to-ones are joined)
+        user = User.objects.select_related('student', 'teacher', 'counselor').get(pk=request.user.pk)
+
+        role, profile = _bootstrap_profile(user)
+        if role is None:
+            return Response({
+                'success': False,
+                'error': 'User role not found'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        notifications = Notification.objects.filter(user=user).order_by('-created_at')[:BOOTSTRAP_NOTIFICATION_LIMIT]
+        unread_count = Notification.objects.filter(user=user, is_read=False).count()
+
+        data = {
+            'success': True,
+            'role': role,
+            'profile': profile,
+            'notifications': [_notification_data(n) for n in notifications],
+            'unread_count': unread_count,
+        }
+        data.update(_bootstrap_reports(user, role))
+        data.update(_bootstrap_shared())
+
+        logger.info(f"🚀 Bootstrap data sent to {user.username} ({role})")
+
+        return Response(data)
+
+    except Exception as e:
+        logger.error(f"❌ Error building bootstrap data: {str(e)}")
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def metrics_view(request):
+    """Expose API metrics in Prometheus text format (staff only)"""
+    try:
+        return HttpResponse(
+            metrics.render_prometheus(),
+            content_type='text/plain; version=0.0.4; charset=utf-8'
+        )
+    except Exception as e:
+        logger.error(f"❌ Error rendering metrics: {str(e)}")
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def batch(request):
+    """
+    Run several API calls in one request and one transaction.
+
+    Body: {"mode": "atomic" | "best_effort", "operations": [{"method", "path", "body"}]}
+    In atomic mode the first failing operation rolls back the whole batch and
+    the remaining operations are skipped; in best_effort mode only the failing
+    operation is rolled back.
+    """
+    try:
+        mode = request.data.get('mode', 'atomic')
+        if mode not in batch_ops.MODES:
+            return Response({
+                'success': False,
+                'error': f"mode must be one of: {', '.join(batch_ops.MODES)}"
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            operations = batch_ops.validate_operations(request.data.get('operations'))
+        except batch_ops.BatchError as e:
+            return Response({'success': False, 'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        succeeded, results = batch_ops.run_batch(request, operations, mode)
+        committed = succeeded or mode == 'best_effort'
+
+        logger.info(
+            f"📦 Batch by {request.user.username}: {len(operations)} operations, "
+            f"mode={mode}, succeeded={succeeded}, committed={committed}"
+        )
+
+        return Response({
+            'success': succeeded,
+            'mode': mode,
+            'committed': committed,
+            'results': results,
+        }, status=status.HTTP_200_OK if committed else status.HTTP_400_BAD_REQUEST)
+
+    except Exception as e:
+        logger.error(f"❌ Error running batch: {str(e)}")
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
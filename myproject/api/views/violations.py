@@ -0,0 +1,784 @@
+"""
+Violation types, violation records and tallies.
+"""
+
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from django.db import models, transaction
+from django.utils import timezone
+import logging
+import traceback
+from .. import metrics
+from ..streaming import streaming_json_response
+from ..compression import cache_compressed
+from ..conditional import versioned
+from ..violation_registry import violation_types as violation_registry
+from ..idempotency import idempotent
+from .. import jobs
+from ..models import Student, Counselor, StudentReport, TeacherReport, Notification, ViolationType, StudentViolationRecord, StudentViolationTally
+from .common import get_current_school_year
+
+logger = logging.getLogger(__name__)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_student_violations(request):
+    """Get student violations with optional school year filter"""
+    try:
+        # ✅ NEW: Get school year from query params
+        school_year = request.GET.get('school_year', None)
+
+        # Base query
+        violations_query = StudentViolationRecord.objects.select_related(
+            'student__user',
+            'violation_type',
+            'counselor__user'
+        )
+
+        # ✅ NEW: Filter by school year if provided
+        if school_year and school_year != 'all':
+            violations_query = violations_query.filter(
+                student__school_year=school_year
+            )
+            logger.info(f"📅 Filtering violations by school year: {school_year}")
+
+        violations = violations_query.order_by('-incident_date')
+
+        violations_data = []
+        for v in violations:
+            violations_data.append({
+                'id': v.id,
+                'student': {
+                    'id': v.student.id,
+                    'name': v.student.user.get_full_name(),
+                    'student_id': v.student.student_id,
+                    'grade_level': v.student.grade_level,
+                    'section': v.student.section,
+                    'school_year': v.student.school_year,  # ✅ Include school year
+                },
+                'violation_type': {
+                    'id': v.violation_type.id if v.violation_type else None,
+                    'name': v.violation_type.name if v.violation_type else 'Unknown',
+                    'category': v.violation_type.category if v.violation_type else 'Unknown',
+                },
+                'severity_level': v.severity_level,
+                'incident_date': v.incident_date,
+                'description': v.description,
+                'disciplinary_action': v.disciplinary_action,
+                'status': v.status,
+                'counselor': v.counselor.user.get_full_name() if v.counselor else None,
+                'created_at': v.created_at,
+            })
+
+        return Response({
+            'success': True,
+            'violations': violations_data,
+            'total': len(violations_data),
+            'filtered_by_school_year': school_year if school_year and school_year != 'all' else None,
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Error fetching violations: {e}")
+        import traceback
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=500)
+
+
+def _violation_type_data(vt):
+    return {
+        'id': vt.id,
+        'name': vt.name,
+        'description': vt.description or '',
+        'category': vt.category,
+        'severity_level': vt.severity_level,
+        'points': getattr(vt, 'points', 0) or 0,
+        'is_active': getattr(vt, 'is_active', True),
+        'created_at': vt.created_at.isoformat() if hasattr(vt, 'created_at') else None,
+    }
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@cache_compressed
+@versioned('violation_type')
+def violation_types(request):
+    """Get all violation types"""
+    try:
+        # ✅ Served from the versioned registry (ordered by category, name)
+        violation_types = violation_registry.all()
+
+        violation_types_data = [_violation_type_data(vt) for vt in violation_types]
+
+        return Response({
+            'success': True,
+            'violation_types': violation_types_data,
+            'count': len(violation_types_data)
+        })
+
+    except Exception as e:
+        logger.error(f"Violation types error: {str(e)}")
+        return Response({
+            'success': False,
+            'error': str(e),
+            'violation_types': [],
+            'count': 0
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_violation_types(request):
+    """Get violation types - alias for violation_types"""
+    # ✅ Pass the underlying HttpRequest; the wrapped view builds its own DRF Request
+    return violation_types(request._request)
+
+
+def _parse_incident_date(value):
+    """Parse an ISO incident date from the client, defaulting to now"""
+    if not value:
+        return timezone.now()
+    try:
+        if isinstance(value, str):
+            value = timezone.datetime.fromisoformat(value.replace('Z', '+00:00'))
+            if timezone.is_naive(value):
+                value = timezone.make_aware(value)
+        return value
+    except Exception as e:
+        logger.warning(f"⚠️  Could not parse incident_date: {e}")
+        return timezone.now()
+
+
+def _get_related_report(report_id, report_type):
+    """Return (student_report, teacher_report) for a violation's source report; either may be None"""
+    if report_type == 'student_report':
+        report = StudentReport.objects.filter(id=report_id).first()
+        if report is None:
+            logger.warning(f"⚠️  StudentReport {report_id} not found")
+        return report, None
+    if report_type == 'teacher_report':
+        report = TeacherReport.objects.filter(id=report_id).first()
+        if report is None:
+            logger.warning(f"⚠️  TeacherReport {report_id} not found")
+        return None, report
+    return None, None
+
+
+@csrf_exempt
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@idempotent('violation')
+def record_violation(request):
+    """Record a student violation - used when tallying from reports"""
+    try:
+        # Verify counselor authentication
+        try:
+            counselor = Counselor.objects.get(user=request.user)
+        except Counselor.DoesNotExist:
+            return JsonResponse({
+                'success': False,
+                'message': 'Counselor profile not found'
+            }, status=403)
+
+        data = request.data
+        student_id = data.get('student_id')
+        violation_type_id = data.get('violation_type_id')
+
+        # ✅ CRITICAL: Get related report info
+        related_report_id = data.get('related_report_id')
+        report_type = data.get('report_type', 'student_report')
+
+        logger.info(f"🎯 Recording violation for student {student_id}, violation type {violation_type_id}")
+        logger.info(f"🔗 Related report: ID={related_report_id}, type={report_type}")
+
+        if not student_id or not violation_type_id:
+            return JsonResponse({
+                'success': False,
+                'message': 'Missing required fields'
+            }, status=400)
+
+        try:
+            student = Student.objects.select_related('user').get(id=student_id)
+        except Student.DoesNotExist:
+            return JsonResponse({
+                'success': False,
+                'message': f'Student with ID {student_id} not found'
+            }, status=404)
+
+        try:
+            violation_type = violation_registry.get(violation_type_id)
+        except ViolationType.DoesNotExist:
+            return JsonResponse({
+                'success': False,
+                'message': f'Violation type with ID {violation_type_id} not found'
+            }, status=404)
+
+        # ✅ Get school year from system settings or student
+        try:
+            school_year = get_current_school_year() or student.school_year
+        except Exception as e:
+            logger.warning(f"⚠️  Error getting school year: {e}")
+            school_year = student.school_year
+
+        logger.info(f"📅 Using school year: {school_year} for violation")
+
+        incident_date = _parse_incident_date(data.get('incident_date'))
+
+        # ✅ Fetch the related report once; it is linked in the same INSERT
+        related_student_report = related_teacher_report = None
+        if related_report_id:
+            related_student_report, related_teacher_report = _get_related_report(related_report_id, report_type)
+
+        # ✅ Create violation record with all fields
+        with transaction.atomic():
+            violation = StudentViolationRecord.objects.create(
+                student=student,
+                violation_type=violation_type,
+                incident_date=incident_date,
+                description=data.get('description', ''),
+                status=data.get('status', 'active'),
+                school_year=school_year,
+                counselor=counselor,
+                location=data.get('location', ''),
+                counselor_notes=data.get('counselor_notes', ''),
+                related_student_report=related_student_report,
+                related_teacher_report=related_teacher_report,
+            )
+
+            # ✅ Keep the tally in step the same way the bulk endpoint does
+            StudentViolationTally.record_violations([student], violation_type, incident_date, violation.status)
+
+        logger.info(f"✅ Violation recorded: {violation_type.name} for student {student.user.get_full_name()}")
+        logger.info(f"   Violation ID: {violation.id}, School Year: {violation.school_year}")
+        logger.info(f"   Related report: {related_report_id} ({report_type})")
+
+        # Mark the related report as resolved
+        if related_student_report:
+            StudentReport.objects.filter(id=related_student_report.id).update(
+                status='resolved', updated_at=timezone.now()
+            )
+            logger.info(f"✅ Report #{related_report_id} marked as resolved")
+
+            # Notify student
+            Notification.objects.create(
+                user=student.user,
+                title="Violation Recorded",
+                message=f"A violation has been recorded on your account: {violation_type.name}",
+                type="violation_recorded",
+            )
+            logger.info(f"📧 Notification sent to {student.user.get_full_name()}")
+
+        return JsonResponse({
+            'success': True,
+            'message': 'Violation recorded successfully',
+            'violation': {
+                'id': violation.id,
+                'student_id': student.id,
+                'violation_type': violation.violation_type.name,
+                'school_year': violation.school_year,
+                'related_report_id': related_report_id,
+                'related_report_type': report_type if related_report_id else None,
+            }
+        }, status=201)
+
+    except Exception as e:
+        logger.error(f"❌ Error recording violation: {str(e)}")
+        logger.error(traceback.format_exc())
+        return JsonResponse({
+            'success': False,
+            'message': f'Error recording violation: {str(e)}'
+        }, status=500)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@idempotent('bulk_violation')
+def bulk_record_violation(request):
+    """
+    Record one violation type for many students at once (e.g. a uniform sweep).
+
+    All records, tally updates and notifications are written in one
+    transaction with a fixed number of queries regardless of group size.
+    """
+    try:
+        try:
+            counselor = Counselor.objects.get(user=request.user)
+        except Counselor.DoesNotExist:
+            return Response({
+                'success': False,
+                'error': 'Counselor profile not found'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        data = request.data
+        student_ids = data.get('student_ids')
+        violation_type_id = data.get('violation_type_id')
+        related_report_id = data.get('related_report_id')
+        report_type = data.get('report_type', 'student_report')
+        violation_status = data.get('status', 'active')
+
+        if not violation_type_id or not isinstance(student_ids, list) or not student_ids:
+            return Response({
+                'success': False,
+                'error': 'violation_type_id and a non-empty student_ids list are required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            student_ids = list(dict.fromkeys(int(student_id) for student_id in student_ids))
+        except (TypeError, ValueError):
+            return Response({
+                'success': False,
+                'error': 'student_ids must be a list of student IDs'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        students = list(Student.objects.select_related('user').filter(id__in=student_ids))
+        missing = sorted(set(student_ids) - {student.id for student in students})
+        if missing:
+            return Response({
+                'success': False,
+                'error': f'Students not found: {missing}'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            violation_type = violation_registry.get(violation_type_id)
+        except ViolationType.DoesNotExist:
+            return Response({
+                'success': False,
+                'error': f'Violation type with ID {violation_type_id} not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            school_year = get_current_school_year()
+        except Exception as e:
+            logger.warning(f"⚠️  Error getting school year: {e}")
+            school_year = None
+
+        incident_date = _parse_incident_date(data.get('incident_date'))
+
+        related_student_report = related_teacher_report = None
+        if related_report_id:
+            related_student_report, related_teacher_report = _get_related_report(related_report_id, report_type)
+
+        with transaction.atomic():
+            # ✅ bulk_create skips save(), so default school_year the way save() does
+            violations = StudentViolationRecord.objects.bulk_create([
+                StudentViolationRecord(
+                    student=student,
+                    violation_type=violation_type,
+                    incident_date=incident_date,
+                    description=data.get('description', ''),
+                    status=violation_status,
+                    school_year=school_year or student.school_year or StudentViolationRecord.default_school_year(),
+                    counselor=counselor,
+                    location=data.get('location', ''),
+                    counselor_notes=data.get('counselor_notes', ''),
+                    related_student_report=related_student_report,
+                    related_teacher_report=related_teacher_report,
+                )
+                for student in students
+            ])
+
+            StudentViolationTally.record_violations(students, violation_type, incident_date, violation_status)
+
+            if related_student_report:
+                StudentReport.objects.filter(id=related_student_report.id).update(
+                    status='resolved', updated_at=timezone.now(), version=models.F('version') + 1
+                )
+
+            # ✅ bulk_create skips the post_save triage refresh the single endpoint gets
+            jobs.enqueue('triage.refresh_for_students', {'student_ids': [student.id for student in students]})
+
+            Notification.objects.bulk_create([
+                Notification(
+                    user=student.user,
+                    title="Violation Recorded",
+                    message=f"A violation has been recorded on your account: {violation_type.name}",
+                    type="violation_recorded",
+                    related_student_report=related_student_report,
+                    related_teacher_report=related_teacher_report,
+                )
+                for student in students
+            ])
+
+        metrics.record_notification_fanout('bulk_violation', len(students))
+        logger.info(f"✅ Recorded {violation_type.name} for {len(students)} students by {request.user.username}")
+
+        return Response({
+            'success': True,
+            'message': f'Violation recorded for {len(students)} students',
+            'violation_type': violation_type.name,
+            'school_year': school_year,
+            'related_report_id': related_report_id,
+            'related_report_type': report_type if related_report_id else None,
+            'violations': [
+                {'id': violation.id, 'student_id': violation.student_id}
+                for violation in violations
+            ],
+        }, status=status.HTTP_201_CREATED)
+
+    except Exception as e:
+        logger.error(f"❌ Error recording bulk violations: {str(e)}")
+        traceback.print_exc()
+        return Response({
+            'success': False,
+            'error': f'Error recording violations: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def tally_records(request):
+    """Get or create tally records"""
+    try:
+        # Verify counselor
+        try:
+            counselor = Counselor.objects.get(user=request.user)
+        except Counselor.DoesNotExist:
+            return Response({
+                'success': False,
+                'error': 'Counselor profile not found'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        if request.method == 'GET':
+            # Get all tally records
+            tallies = StudentViolationTally.objects.select_related(
+                'student',
+                'student__user',
+                'violation_type'
+            ).all().order_by('-last_incident_date')
+
+            tallies_data = []
+            for tally in tallies:
+                tallies_data.append({
+                    'id': tally.id,
+                    'student': {
+                        'id': tally.student.id,
+                        'name': f"{tally.student.user.first_name} {tally.student.user.last_name}",
+                        'student_id': tally.student.student_id,
+                    },
+                    'violation_type': {
+                        'id': tally.violation_type.id,
+                        'name': tally.violation_type.name,
+                        'category': tally.violation_type.category,
+                        'severity': tally.violation_type.severity_level,
+                    },
+                    'count': tally.count,
+                    'last_incident_date': tally.last_incident_date.isoformat() if tally.last_incident_date else None,
+                    'created_at': tally.created_at.isoformat() if hasattr(tally, 'created_at') else None,
+                })
+
+            return Response({
+                'success': True,
+                'tallies': tallies_data,
+                'count': len(tallies_data)
+            })
+
+        elif request.method == 'POST':
+            # Create or update tally record
+            student_id = request.data.get('student_id')
+            violation_type_id = request.data.get('violation_type_id')
+
+            if not student_id or not violation_type_id:
+                return Response({
+                    'success': False,
+                    'error': 'student_id and violation_type_id are required'
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            try:
+                student = Student.objects.get(id=student_id)
+                violation_type = violation_registry.get(violation_type_id)
+            except (Student.DoesNotExist, ViolationType.DoesNotExist):
+                return Response({
+                    'success': False,
+                    'error': 'Invalid student or violation type'
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            # Get or create tally
+            tally, created = StudentViolationTally.objects.get_or_create(
+                student=student,
+                violation_type=violation_type,
+                defaults={'count': 1, 'last_incident_date': timezone.now()}
+            )
+
+            if not created:
+                tally.count += 1
+                tally.last_incident_date = timezone.now()
+                tally.save()
+
+            return Response({
+                'success': True,
+                'message': 'Tally record updated',
+                'tally': {
+                    'id': tally.id,
+                    'count': tally.count,
+                    'last_incident_date': tally.last_incident_date.isoformat()
+                }
+            }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+    except Exception as e:
+        logger.error(f"❌ Error with tally records: {str(e)}")
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@csrf_exempt
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def counselor_student_violations(request):
+    """Get all student violations for counselor dashboard"""
+    try:
+        # Verify counselor authentication
+        try:
+            counselor = Counselor.objects.get(user=request.user)
+        except Counselor.DoesNotExist:
+            return JsonResponse({
+                'success': False,
+                'message': 'Counselor profile not found'
+            }, status=403)
+
+        # ✅ Get school year filter from query params
+        school_year = request.GET.get('school_year', None)
+
+        logger.info(f"📊 Fetching violations for school year: {school_year or 'all'}")
+
+        # Base query
+        violations_query = StudentViolationRecord.objects.select_related(
+            'student',
+            'student__user',
+            'violation_type',
+            'counselor',
+            'counselor__user',
+            'related_student_report',
+            'related_teacher_report'
+        )
+
+        # ✅ Filter by school year if provided
+        if school_year and school_year != 'all':
+            violations_query = violations_query.filter(school_year=school_year)
+            logger.info(f"🔍 Filtering violations by school year: {school_year}")
+
+        violations = violations_query.all().order_by('-incident_date')
+
+        def serialize_violation(violation):
+            # ✅ FIX: Always include school_year in response
+            student_school_year = violation.school_year or violation.student.school_year
+
+            return {
+                'id': violation.id,
+                'student_id': violation.student.id,
+                'student': {
+                    'id': violation.student.id,
+                    'name': violation.student.user.get_full_name(),
+                    'student_id': violation.student.student_id,
+                    'user_id': violation.student.user.id,
+                    'grade_level': violation.student.grade_level,
+                    'section': violation.student.section,
+                    'school_year': violation.student.school_year,
+                },
+                'violation_type': {
+                    'id': violation.violation_type.id if violation.violation_type else None,
+                    'name': violation.violation_type.name if violation.violation_type else 'Unknown',
+                    'category': violation.violation_type.category if violation.violation_type else 'Unknown',
+                    'severity_level': violation.violation_type.severity_level if violation.violation_type else 'Medium',
+                } if violation.violation_type else None,
+                'incident_date': violation.incident_date,
+                'description': violation.description,
+                'location': getattr(violation, 'location', ''),
+                'status': violation.status,
+                'school_year': student_school_year,  # ✅ CRITICAL: Always include school_year
+                'severity_level': getattr(violation, 'severity_level', 'Medium'),
+                'counselor': {
+                    'id': violation.counselor.id,
+                    'name': violation.counselor.user.get_full_name(),
+                } if violation.counselor else None,
+                'counselor_notes': getattr(violation, 'counselor_notes', ''),
+                'created_at': violation.incident_date,  # ✅ FIX: Use incident_date as created_at
+
+                # ✅ Include related report info
+                'related_report_id': violation.related_student_report.id if violation.related_student_report else (
+                    violation.related_teacher_report.id if violation.related_teacher_report else None
+                ),
+                'related_report': {
+                    'id': violation.related_student_report.id if violation.related_student_report else (
+                        violation.related_teacher_report.id if violation.related_teacher_report else None
+                    ),
+                    'type': 'student_report' if violation.related_student_report else (
+                        'teacher_report' if violation.related_teacher_report else None
+                    ),
+                    'title': violation.related_student_report.title if violation.related_student_report else (
+                        violation.related_teacher_report.title if violation.related_teacher_report else None
+                    ),
+                } if (violation.related_student_report or violation.related_teacher_report) else None,
+            }
+
+        # ✅ Stream rows straight from the cursor so memory stays bounded
+        return streaming_json_response(
+            violations,
+            serialize_violation,
+            'violations',
+            counters={'tallied_count': lambda v: bool(v.get('related_report_id'))},
+            extra={
+                'filtered_by_school_year': school_year if school_year and school_year != 'all' else None,
+            },
+        )
+
+    except Exception as e:
+        logger.error(f"❌ Error fetching counselor student violations: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return JsonResponse({
+            'success': False,
+            'message': f'Error fetching student violations: {str(e)}'
+        }, status=500)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def counselor_violation_types(request):
+    """Get violation types for counselor"""
+    return violation_types(request._request)  # Reuse existing function
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def counselor_violation_analytics(request):
+    """Get violation analytics for counselor dashboard"""
+    try:
+        if not hasattr(request.user, 'counselor'):
+            return Response({
+                'success': False,
+                'error': 'Access denied. Counselor role required.'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        # Basic analytics - you can expand this later
+        violation_analytics = {}
+        status_distribution = []
+        monthly_trends = []
+
+        # Get violation type counts
+        violation_records = StudentViolationRecord.objects.select_related('violation_type').all()
+        for record in violation_records:
+            violation_name = record.violation_type.name if record.violation_type else 'Unknown'
+            if violation_name not in violation_analytics:
+                violation_analytics[violation_name] = {'count': 0}
+            violation_analytics[violation_name]['count'] += 1
+
+        # Get status distribution
+        status_counts = {}
+        for record in violation_records:
+            status = record.status or 'active'
+            status_counts[status] = status_counts.get(status, 0) + 1
+
+        for status, count in status_counts.items():
+            status_distribution.append({'status': status, 'count': count})
+
+        return Response({
+            'success': True,
+            'violation_analytics': violation_analytics,
+            'status_distribution': status_distribution,
+            'monthly_trends': monthly_trends,
+            'message': 'Violation analytics retrieved successfully'
+        })
+
+    except Exception as e:
+        return Response({
+            'success': False,
+            'error': str(e),
+            'violation_analytics': {},
+            'status_distribution': [],
+            'monthly_trends': []
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_student_violation_history(request, student_id):
+    """Get complete violation history across ALL school years"""
+    try:
+        student = Student.objects.select_related('user').get(id=student_id)
+
+        # Get all violations for this student (across all years)
+        all_violations = StudentViolationRecord.objects.filter(
+            student_id=student_id
+        ).select_related(
+            'violation_type',
+            'counselor__user',
+            'related_report'
+        ).order_by('-incident_date')
+
+        # Group by school year
+        violations_by_year = {}
+        for v in all_violations:
+            # Determine school year from incident date
+            incident_year = v.incident_date.year
+            incident_month = v.incident_date.month
+            sy = f"{incident_year}-{incident_year + 1}" if incident_month >= 6 else f"{incident_year - 1}-{incident_year}"
+
+            if sy not in violations_by_year:
+                violations_by_year[sy] = []
+
+            violations_by_year[sy].append({
+                'id': v.id,
+                'violation_type': v.violation_type.name if v.violation_type else 'Unknown',
+                'category': v.violation_type.category if v.violation_type else 'Unknown',
+                'severity': v.severity_level,
+                'incident_date': v.incident_date.isoformat(),
+                'description': v.description,
+                'counselor': v.counselor.user.get_full_name() if v.counselor else None,
+                'status': v.status,
+                'related_report_id': v.related_report.id if v.related_report else None,
+            })
+
+        # Get school year history
+        from api.models import StudentSchoolYearHistory
+        school_history = StudentSchoolYearHistory.objects.filter(
+            student=student
+        ).order_by('-school_year')
+
+        history_data = []
+        for h in school_history:
+            year_violations = violations_by_year.get(h.school_year, [])
+            history_data.append({
+                'school_year': h.school_year,
+                'grade_level': h.grade_level,
+                'section': h.section,
+                'strand': h.strand,
+                'adviser': h.adviser.user.get_full_name() if h.adviser else None,
+                'is_active': h.is_active,
+                'violations_count': len(year_violations),
+                'violations': year_violations,
+            })
+
+        return Response({
+            'success': True,
+            'student': {
+                'id': student.id,
+                'name': student.user.get_full_name(),
+                'student_id': student.student_id,
+                'current_grade': student.grade_level,
+                'current_section': student.section,
+                'current_school_year': student.school_year,
+            },
+            'total_violations_all_time': all_violations.count(),
+            'violations_by_school_year': history_data,
+        })
+
+    except Student.DoesNotExist:
+        return Response({
+            'success': False,
+            'error': 'Student not found'
+        }, status=404)
+    except Exception as e:
+        logger.error(f"❌ Error getting violation history: {e}")
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=500)
@@ -0,0 +1,133 @@
+"""
+Versioned, cached registry of violation types.
+
+Violation types are read on nearly every report form and every tally but
+change only when an admin edits them. Each process keeps a snapshot of the
+whole catalog in memory, tagged with the ``ResourceVersion`` of the model.
+The version row is re-checked at most every ``VIOLATION_REGISTRY_CHECK_INTERVAL``
+seconds, so other workers pick up admin edits within that window. The rows
+of a version are also kept in the shared cache so a new process doesn't have
+to hit the table. Saves in this process invalidate the snapshot immediately.
+"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import metrics
+from .models import ResourceVersion, ViolationType
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECK_INTERVAL = 5
+# Bounded so rows written without signals (raw SQL, fixtures) eventually show up
+DEFAULT_CACHE_TIMEOUT = 3600
+
+# resource name -> registry, so signal handlers can invalidate by resource
+_registries = {}
+
+
+def invalidate(resource):
+    registry = _registries.get(resource)
+    if registry is not None:
+        registry.invalidate()
+
+
+def bump(resource):
+    """Publish a new version after a bulk change that skipped model signals"""
+    ResourceVersion.bump(resource)
+    invalidate(resource)
+
+
+class _Snapshot:
+    def __init__(self, version, rows):
+        self.version = version
+        self.rows = rows
+        self.by_id = {row.id: row for row in rows}
+        self.active = [row for row in rows if getattr(row, 'is_active', True)]
+        self.by_category = {}
+        for row in self.active:
+            category = getattr(row, 'category', None)
+            self.by_category.setdefault(category, []).append(row)
+
+
+class ViolationTypeRegistry:
+    """
+    Lookups over one violation type model.
+
+    ``get()`` searches every row (existing reports may point at a type that
+    has since been deactivated); ``active()``, ``by_category()`` and
+    ``for_grade()`` only return active rows.
+    """
+
+    def __init__(self, model, resource):
+        self.model = model
+        self.resource = resource
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._checked_at = 0.0
+        _registries[resource] = self
+
+    def _check_interval(self):
+        return getattr(settings, 'VIOLATION_REGISTRY_CHECK_INTERVAL', DEFAULT_CHECK_INTERVAL)
+
+    def _current_version(self):
+        return ResourceVersion.get_stamps([self.resource]).get(self.resource, (0, None))[0]
+
+    def _load(self, version):
+        cache_key = f'violation_registry:{self.resource}:v{version}'
+        rows = cache.get(cache_key)
+        if rows is None:
+            rows = list(self.model.objects.all())
+            cache.set(cache_key, rows, getattr(settings, 'VIOLATION_REGISTRY_CACHE_TIMEOUT', DEFAULT_CACHE_TIMEOUT))
+            logger.info(f"📚 Loaded {len(rows)} {self.resource} rows (v{version})")
+        return _Snapshot(version, rows)
+
+    def snapshot(self):
+        now = time.monotonic()
+        snapshot = self._snapshot
+        if snapshot is not None and now - self._checked_at < self._check_interval():
+            metrics.record_cache(self.resource, True)
+            return snapshot
+
+        with self._lock:
+            version = self._current_version()
+            hit = self._snapshot is not None and self._snapshot.version == version
+            if not hit:
+                self._snapshot = self._load(version)
+            self._checked_at = time.monotonic()
+            metrics.record_cache(self.resource, hit)
+            return self._snapshot
+
+    def invalidate(self):
+        """Drop the in-process snapshot (called when a row is saved here)"""
+        self._snapshot = None
+
+    @property
+    def version(self):
+        return self.snapshot().version
+
+    def all(self):
+        return list(self.snapshot().rows)
+
+    def active(self):
+        return list(self.snapshot().active)
+
+    def get(self, pk):
+        """Return the row with this id or raise ``model.DoesNotExist``"""
+        try:
+            return self.snapshot().by_id[int(pk)]
+        except (KeyError, TypeError, ValueError):
+            raise self.model.DoesNotExist(f'{self.model.__name__} with id {pk} does not exist')
+
+    def by_category(self, category):
+        return list(self.snapshot().by_category.get(category, []))
+
+    def for_grade(self, grade_level):
+        return [row for row in self.snapshot().active if row.is_applicable_for_grade(grade_level)]
+
+
+violation_types = ViolationTypeRegistry(ViolationType, 'violation_type')
@@ -3,6 +3,18 @@ ASGI config for myproject project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serving with ASGI lets the async views in api/views/live.py (notification
+long-polling, async bootstrap) wait without holding a worker; every other
+view is sync and runs in Django's thread pool as before:
+
+    gunicorn myproject.asgi:application -k uvicorn.workers.UvicornWorker --workers 2
+
+(or ``uvicorn myproject.asgi:application --workers 2``). Set
+DB_CONN_MAX_AGE=0 under ASGI: persistent connections belong to the thread
+that opened them and aren't reused reliably across the thread pool. The
+WSGI entry point (myproject.wsgi) keeps working; async views then simply
+hold their worker while they wait.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -3,6 +3,7 @@ Django settings for myproject project.
 """
 
 import os
+import tempfile
 import dj_database_url
 from pathlib import Path
 
@@ -50,26 +51,38 @@ ADMIN_INDEX_TITLE = "Welcome to Guidance Tracker Administration"
 # =============================================================================
 
 REST_FRAMEWORK = {
+    # DRF tokens with expiry and cached validation (see api/tokens.py)
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'api.authentication.ExpiringTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
+    # orjson-backed when installed, stdlib json otherwise (see api/renderers.py)
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'api.renderers.FastJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
-        'rest_framework.parsers.JSONParser',
+        'api.renderers.FastJSONParser',
     ],
 }
 
+# Set to False to force the stdlib json fallback even if orjson is installed
+FAST_JSON_ENABLED = os.getenv("FAST_JSON_ENABLED", "True").lower() == "true"
+
 # =============================================================================
 # MIDDLEWARE
 # =============================================================================
 
 MIDDLEWARE = [
+    # per-URL latency and query counts for /api/metrics/ (outermost so it times everything)
+    'api.middleware.MetricsMiddleware',
+
     'corsheaders.middleware.CorsMiddleware',
+
+    # gzip/brotli for API JSON (before anything else touches the body)
+    'api.middleware.CompressionMiddleware',
+
     'django.middleware.security.SecurityMiddleware',
 
     # whitenoise for static files (Render)
@@ -113,7 +126,8 @@ if DATABASE_URL:
     # Render Deployment (Use PostgreSQL)
     DATABASES["default"] = dj_database_url.config(
         default=DATABASE_URL,
-        conn_max_age=600,
+        # set DB_CONN_MAX_AGE=0 when serving with ASGI (see asgi.py)
+        conn_max_age=int(os.getenv("DB_CONN_MAX_AGE", "600")),
         ssl_require=True
     )
 else:
@@ -134,6 +148,38 @@ AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator'},
 ]
 
+# =============================================================================
+# PASSWORD HASHING
+# =============================================================================
+
+# The first hasher is used for new hashes; logins re-hash passwords stored
+# with any other entry (or other cost parameters) automatically.
+# PASSWORD_HASHER=argon2 (default, needs argon2-cffi) or pbkdf2.
+try:
+    import argon2  # noqa: F401
+    ARGON2_AVAILABLE = True
+except ImportError:
+    ARGON2_AVAILABLE = False
+
+PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "argon2").lower()
+
+PASSWORD_HASHERS = [
+    'api.hashers.TunedPBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+if ARGON2_AVAILABLE:
+    if PASSWORD_HASHER == 'argon2':
+        PASSWORD_HASHERS.insert(0, 'api.hashers.TunedArgon2PasswordHasher')
+    else:
+        PASSWORD_HASHERS.insert(1, 'api.hashers.TunedArgon2PasswordHasher')
+
+# Argon2id cost (memory in KiB): ~19 MiB / 2 passes / 1 lane per OWASP guidance
+PASSWORD_ARGON2_TIME_COST = int(os.getenv("PASSWORD_ARGON2_TIME_COST", "2"))
+PASSWORD_ARGON2_MEMORY_COST = int(os.getenv("PASSWORD_ARGON2_MEMORY_COST", "19456"))
+PASSWORD_ARGON2_PARALLELISM = int(os.getenv("PASSWORD_ARGON2_PARALLELISM", "1"))
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv("PASSWORD_PBKDF2_ITERATIONS", "1000000"))
+
 # =============================================================================
 # INTERNATIONALIZATION
 # =============================================================================
@@ -164,6 +210,8 @@ CORS_ALLOWED_HEADERS = [
     'content-type',
     'x-csrftoken',
     'x-requested-with',
+    'idempotency-key',
+    'if-match',
 ]
 
 # =============================================================================
@@ -182,6 +230,154 @@ LOGGING = {
     },
 }
 
+# =============================================================================
+# CACHE
+# =============================================================================
+
+# File cache shared by every gunicorn worker on the host by default: login
+# lockouts and token revocations must apply in all workers. With several hosts
+# point CACHE_BACKEND/CACHE_LOCATION at a backend they share (e.g.
+# DatabaseCache after `manage.py createcachetable`). A per-process backend
+# (LocMemCache) outside DEBUG triggers the api.W001 system check warning.
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.filebased.FileBasedCache"),
+        "LOCATION": os.getenv(
+            "CACHE_LOCATION",
+            os.path.join(tempfile.gettempdir(), "guidance_tracker_cache")
+        ),
+        # Culling deletes entries at random, lockout keys included
+        "OPTIONS": {"MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", "10000"))},
+    }
+}
+
+# Dashboard analytics snapshots: fresh for SNAPSHOT_TTL seconds, then served
+# stale for up to SNAPSHOT_STALE_TTL more while one worker recomputes them
+SNAPSHOT_TTL = int(os.getenv("SNAPSHOT_TTL", "60"))
+SNAPSHOT_STALE_TTL = int(os.getenv("SNAPSHOT_STALE_TTL", "300"))
+SNAPSHOT_LOCK_TIMEOUT = 30
+
+# Threads per process running a composite endpoint's independent queries
+# concurrently (see api/parallel.py); each holds its own DB connection, 1 disables
+PARALLEL_QUERY_WORKERS = int(os.getenv("PARALLEL_QUERY_WORKERS", "4"))
+
+# =============================================================================
+# RESPONSE COMPRESSION
+# =============================================================================
+
+# Only JSON bodies at least this large are compressed (bytes)
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_CONTENT_TYPES = ['application/json']
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5  # brotli is used only if the package is installed
+
+# =============================================================================
+# METRICS
+# =============================================================================
+
+# Each gunicorn worker flushes its metrics here; /api/metrics/ merges them.
+# Must be a directory shared by all workers on the same host.
+METRICS_DIR = os.getenv(
+    "METRICS_DIR",
+    os.path.join(tempfile.gettempdir(), "guidance_tracker_metrics")
+)
+METRICS_FLUSH_INTERVAL = int(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+
+# =============================================================================
+# BATCH API
+# =============================================================================
+
+# Upper bound on operations per /api/batch/ request
+BATCH_MAX_OPERATIONS = int(os.getenv("BATCH_MAX_OPERATIONS", "20"))
+
+# =============================================================================
+# IDEMPOTENCY KEYS
+# =============================================================================
+
+# Stored responses for Idempotency-Key retries are kept this long (seconds);
+# run `manage.py purge_idempotency_keys` periodically to delete expired rows
+IDEMPOTENCY_KEY_TTL = int(os.getenv("IDEMPOTENCY_KEY_TTL", str(24 * 60 * 60)))
+# A key still in progress after this long (seconds) belongs to a request whose
+# worker died; the next retry takes it over. Keep it above the gunicorn timeout
+IDEMPOTENCY_IN_PROGRESS_TIMEOUT = int(os.getenv("IDEMPOTENCY_IN_PROGRESS_TIMEOUT", str(5 * 60)))
+
+# =============================================================================
+# LOGIN RATE LIMITING & AUDIT
+# =============================================================================
+
+# Failed logins are counted in the default cache (see api/ratelimit.py and CACHE)
+LOGIN_LOCKOUT_WINDOW = 30 * 60       # seconds over which failures are counted
+LOGIN_MAX_FAILURES = 5               # per username, then locked for LOGIN_LOCKOUT_SECONDS
+LOGIN_IP_MAX_FAILURES = 200          # per client IP: soft throttle only (schools share NAT addresses)
+LOGIN_LOCKOUT_SECONDS = 30 * 60
+
+# Proxies in front of the app that append to X-Forwarded-For (1 on Render);
+# the client IP is the entry the outermost of them added
+TRUSTED_PROXY_COUNT = int(os.getenv("TRUSTED_PROXY_COUNT", "1"))
+
+# login_attempts is an audit log written in batches; purge it with
+# `manage.py purge_login_attempts`
+LOGIN_AUDIT_FLUSH_INTERVAL = 5
+LOGIN_AUDIT_BATCH_SIZE = 100
+LOGIN_AUDIT_RETENTION_DAYS = int(os.getenv("LOGIN_AUDIT_RETENTION_DAYS", "90"))
+
+# =============================================================================
+# API TOKENS
+# =============================================================================
+
+# Tokens expire TOKEN_TTL seconds after creation and are replaced on login
+# once older than TOKEN_ROTATE_AFTER; validated tokens are cached for
+# TOKEN_CACHE_TIMEOUT seconds. Purge old rows with `manage.py purge_expired_tokens`.
+TOKEN_TTL = int(os.getenv("TOKEN_TTL", str(30 * 24 * 60 * 60)))
+TOKEN_ROTATE_AFTER = int(os.getenv("TOKEN_ROTATE_AFTER", str(7 * 24 * 60 * 60)))
+TOKEN_CACHE_TIMEOUT = int(os.getenv("TOKEN_CACHE_TIMEOUT", "60"))
+
+# =============================================================================
+# FIREBASE ADMIN
+# =============================================================================
+
+# firebase (default) or stub; the stub is also used by `manage.py test`, when
+# no credentials are configured and whenever firebase_admin can't be
+# initialized (see api/firebase.py)
+FIREBASE_BACKEND = os.getenv("FIREBASE_BACKEND", "firebase").lower()
+# Service account JSON; falls back to GOOGLE_APPLICATION_CREDENTIALS when unset
+FIREBASE_CREDENTIALS = os.getenv("FIREBASE_CREDENTIALS") or None
+FIREBASE_REVOKE_MAX_RETRIES = 5
+FIREBASE_REVOKE_RETRY_DELAY = 2      # seconds, doubled after each failure
+
+# =============================================================================
+# BACKGROUND JOBS
+# =============================================================================
+
+# When enabled, slow side effects are stored as jobs for `manage.py run_worker`
+# (run it as a separate process); when disabled they run inline in the request
+JOB_QUEUE_ENABLED = os.getenv("JOB_QUEUE_ENABLED", "False").lower() == "true"
+JOB_VISIBILITY_TIMEOUT = 300         # seconds a claimed job stays locked to its worker
+JOB_MAX_ATTEMPTS = 5
+JOB_RETRY_BACKOFF = 10               # seconds, doubled after each failed attempt
+JOB_POLL_INTERVAL = 2                # seconds between polls of an empty queue
+JOB_RETENTION_DAYS = 7               # finished jobs are purged by the worker after this
+
+# Students per transaction in rollover / bulk promotion jobs (see api/rollover.py)
+ROLLOVER_CHUNK_SIZE = 200
+
+# =============================================================================
+# COUNSELING REMINDERS
+# =============================================================================
+
+# `manage.py send_counseling_reminders` (cron, or --loop) reminds sessions
+# scheduled within the next COUNSELING_REMINDER_WINDOW_HOURS
+COUNSELING_REMINDER_WINDOW_HOURS = int(os.getenv("COUNSELING_REMINDER_WINDOW_HOURS", "24"))
+COUNSELING_REMINDER_BATCH_SIZE = 1000
+
+# =============================================================================
+# LIVE NOTIFICATIONS
+# =============================================================================
+
+# GET /api/notifications/poll/ (async, see api/views/live.py)
+NOTIFICATION_POLL_TIMEOUT = 25       # seconds a poll waits at most (keep under the proxy timeout)
+NOTIFICATION_POLL_INTERVAL = 2       # seconds between checks while waiting
+
 # =============================================================================
 # DEFAULT AUTO FIELD
 # =============================================================================
@@ -14,3 +14,10 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
 
 application = get_wsgi_application()
+
+# API view modules are imported on first request. Under `gunicorn --preload`
+# set PRELOAD_VIEWS=True to import them once in the master, where forked
+# workers share the memory, instead of once per worker.
+if os.getenv('PRELOAD_VIEWS', 'False').lower() == 'true':
+    from api.views import preload
+    preload()
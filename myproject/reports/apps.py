@@ -5,5 +5,8 @@ class ReportsConfig(AppConfig):
     name = 'reports'
 
     def ready(self):
-        pass  # ✅ Remove or comment out the signals import
         # import reports.signals  # ❌ Comment this out
+        # ✅ Keep the cached violation type registry in sync with admin edits
+        from api.signals import connect_versioned_model
+        from .models import ViolationType
+        connect_versioned_model(ViolationType, 'reports_violation_type')
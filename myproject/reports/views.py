@@ -1,7 +1,14 @@
 from rest_framework import generics
+from api.violation_registry import ViolationTypeRegistry
 from .models import ViolationType
 from .serializers import ViolationTypeSerializer
 
+# ✅ Served from the versioned in-memory registry instead of a query per request
+registry = ViolationTypeRegistry(ViolationType, 'reports_violation_type')
+
 class ViolationTypeListView(generics.ListAPIView):
     queryset = ViolationType.objects.all()
     serializer_class = ViolationTypeSerializer
+
+    def get_queryset(self):
+        return registry.all()